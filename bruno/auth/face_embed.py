@@ -6,7 +6,8 @@ from typing import List, Dict, Optional, Tuple
 
 import numpy as np
 import cv2
-from insightface.app import FaceAnalysis
+
+from bruno.utils.model_registry import insightface_handle
 
 def _cosine_distance(a: np.ndarray, b: np.ndarray) -> float:
     a = a / (np.linalg.norm(a) + 1e-9)
@@ -20,9 +21,13 @@ class FaceEmbedID:
     """
     def __init__(self, users_root: str):
         self.users_root = users_root
-        self.app = FaceAnalysis(name="buffalo_l")
-        # ctx_id=0 uses GPU if available, otherwise CPU
-        self.app.prepare(ctx_id=0, det_size=(640, 640))
+        # loaded once per process (bruno.utils.model_registry); FaceID pins its own CPU-only instance
+        self._app = insightface_handle("buffalo_l", det_size=(640, 640))
+        self._app.get()
+
+    @property
+    def app(self):
+        return self._app.get()
 
     def _user_dir(self, user_id: str) -> Path:
         return Path(self.users_root) / user_id
@@ -0,0 +1,282 @@
+"""
+Hedged LLM backends for the speaker.
+
+The same prompt can go to the local Ollama model and to the online (OpenAI-compatible)
+model. The first backend to return valid JSON wins and the others are cancelled
+(their HTTP streams are aborted). Per-backend latency and error stats pick which one
+to prefer.
+
+Modes (BRUNO_BRAIN_BACKEND):
+  local     Ollama only (default; the speaker keeps streaming sentences to TTS)
+  online    online only
+  hedge     race every backend on each request
+  adaptive  ask the preferred backend; start the others if it has not answered within
+            its usual latency (hedge_after), errors, or times out. A backend with no
+            sample for probe_s seconds is started alongside it, so a slow-then-recovered
+            backend gets measured again.
+A loser cancelled after t seconds still tells us its latency was at least t (a censored
+sample); a backend still running at the deadline counts as a timeout.
+For offline testing run scripts/fake_llm_servers.py and point OLLAMA_HOST /
+OPENAI_BASE_URL at it.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+
+from bruno.brain.ollama_client import CancelToken, OllamaCancelled, OllamaError, OllamaTimeout, ollama_stream
+
+ONLINE_MODEL = os.environ.get("BRUNO_ONLINE_MODEL", "gpt-4.1-mini")
+UNKNOWN_LATENCY_S = 5.0
+
+
+class BackendStats:
+    """EWMA latency + error rate for one backend."""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.latency_s: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.wins = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.sampled_at: Optional[float] = None  # monotonic time of the last sample
+
+    def _latency(self, latency_s: float):
+        self.latency_s = latency_s if self.latency_s is None else (1 - self.alpha) * self.latency_s + self.alpha * latency_s
+
+    def ok(self, latency_s: float):
+        self.calls += 1
+        self._latency(latency_s)
+        self.error_rate *= 1 - self.alpha
+        self.sampled_at = time.monotonic()
+
+    def censored(self, elapsed_s: float):
+        """Cancelled after elapsed_s without an answer: its latency is at least elapsed_s."""
+        self.cancelled += 1
+        if self.latency_s is None:
+            self.latency_s = max(elapsed_s, UNKNOWN_LATENCY_S)
+        elif elapsed_s > self.latency_s:
+            self._latency(elapsed_s)
+        self.sampled_at = time.monotonic()
+
+    def failed(self, timeout: bool = False):
+        self.calls += 1
+        self.errors += 1
+        self.timeouts += int(timeout)
+        self.error_rate = (1 - self.alpha) * self.error_rate + self.alpha
+        self.sampled_at = time.monotonic()
+
+    def stale(self, max_age_s: float) -> bool:
+        return self.sampled_at is None or time.monotonic() - self.sampled_at > max_age_s
+
+    def score(self) -> float:
+        """Lower is better. Unknown backends score as if they took UNKNOWN_LATENCY_S."""
+        latency = UNKNOWN_LATENCY_S if self.latency_s is None else self.latency_s
+        return latency * (1.0 + 4.0 * self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_s": None if self.latency_s is None else round(self.latency_s, 3),
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "wins": self.wins,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+        }
+
+
+class Backend:
+    """
+    name + stream(prompt, deadline_s, cancel, **kwargs) -> text chunks. kwargs are the
+    Ollama request fields (system, format, options, task); backends use what they support.
+    """
+
+    def __init__(self, name: str, stream: Callable[..., Iterator[str]]):
+        self.name = name
+        self.stream = stream
+        self.stats = BackendStats()
+
+
+def ollama_backend(model: str) -> Backend:
+    return Backend("local", lambda prompt, deadline_s, cancel, **kw: ollama_stream(model, prompt, deadline_s=deadline_s, cancel=cancel, **kw))
+
+
+def online_backend(model: str = ONLINE_MODEL) -> Backend:
+    from bruno.brain.online_llm import OnlineBrain
+
+    brain = OnlineBrain(model=model)
+
+    def stream(prompt, deadline_s, cancel, system=None, **_ollama_only):
+        # system goes in as a system message; format/options/task are Ollama fields
+        return brain.stream_generate(prompt, system=system, deadline_s=deadline_s, cancel=cancel)
+
+    return Backend("online", stream)
+
+
+def parse_json_reply(text: str) -> dict:
+    """Strip ``` fences and parse; raises ValueError unless it is a JSON object."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.lower().startswith("json"):
+            text = text[4:]
+    out = json.loads(text)
+    if not isinstance(out, dict):
+        raise ValueError("reply is not a JSON object")
+    return out
+
+
+class HedgedBrain:
+    """
+    generate_json(prompt, validate=None, deadline_s=None, cancel=None, **kwargs) -> (dict, backend name)
+    kwargs (system, format, options, task) are passed to every backend's stream.
+    Raises OllamaTimeout / OllamaCancelled / OllamaError when no backend produced valid JSON.
+    """
+
+    def __init__(
+        self,
+        backends: List[Backend],
+        mode: str = "hedge",
+        deadline_s: float = 30.0,
+        hedge_factor: float = 1.5,
+        probe_s: float = 60.0,
+    ):
+        self.backends = backends
+        self.mode = mode
+        self.deadline_s = deadline_s
+        self.hedge_factor = hedge_factor
+        self.probe_s = probe_s
+        self._lock = threading.Lock()
+
+    def ranked(self) -> List[Backend]:
+        with self._lock:
+            return sorted(self.backends, key=lambda b: b.stats.score())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "backends": {b.name: b.stats.as_dict() for b in self.backends}}
+
+    def _run(self, backend: Backend, prompt: str, deadline: float, cancel: CancelToken, validate, results: "queue.Queue", kwargs):
+        t0 = time.monotonic()
+        try:
+            text = "".join(backend.stream(prompt, max(0.05, deadline - t0), cancel, **kwargs))
+            out = parse_json_reply(text)
+            if validate is not None and not validate(out):
+                raise ValueError("reply failed validation")
+        except OllamaCancelled as e:
+            now = time.monotonic()
+            with self._lock:
+                if now >= deadline:
+                    backend.stats.failed(timeout=True)  # still running when the request gave up
+                else:
+                    backend.stats.censored(now - t0)
+            results.put((backend, None, e))
+            return
+        except Exception as e:
+            with self._lock:
+                backend.stats.failed(timeout=isinstance(e, OllamaTimeout))
+            results.put((backend, None, e))
+            return
+        with self._lock:
+            backend.stats.ok(time.monotonic() - t0)
+        results.put((backend, out, None))
+
+    def generate_json(
+        self,
+        prompt: str,
+        validate: Optional[Callable[[dict], bool]] = None,
+        deadline_s: Optional[float] = None,
+        cancel: Optional[CancelToken] = None,
+        **kwargs,
+    ) -> Tuple[dict, str]:
+        deadline_s = self.deadline_s if deadline_s is None else deadline_s
+        deadline = time.monotonic() + deadline_s
+        order = self.ranked()
+        results: "queue.Queue" = queue.Queue()
+        tokens: Dict[str, CancelToken] = {}
+        pending = list(order)
+        running = 0
+        errors = []
+
+        def start_next():
+            nonlocal running
+            b = pending.pop(0)
+            tok = tokens[b.name] = CancelToken()
+            threading.Thread(
+                target=self._run, args=(b, prompt, deadline, tok, validate, results, kwargs), name=f"bruno-llm-{b.name}", daemon=True
+            ).start()
+            running += 1
+
+        unregister = cancel.on_cancel(lambda: [t.cancel() for t in list(tokens.values())]) if cancel is not None else (lambda: None)
+        try:
+            if self.mode == "hedge":
+                while pending:
+                    start_next()
+            else:
+                start_next()
+                with self._lock:
+                    probes = [b for b in pending if b.stats.stale(self.probe_s)]
+                for b in probes:
+                    pending.remove(b)
+                    pending.insert(0, b)
+                    start_next()
+
+            while running:
+                if cancel is not None and cancel.cancelled:
+                    raise OllamaCancelled("cancelled")
+                now = time.monotonic()
+                if now >= deadline:
+                    raise OllamaTimeout(f"no backend answered within {deadline_s:.1f}s")
+
+                wait = deadline - now
+                if pending:
+                    # adaptive: give the leader its usual latency, then hedge with the next one
+                    lead = order[0].stats.latency_s
+                    hedge_at = deadline - deadline_s + (lead * self.hedge_factor if lead else deadline_s / 3)
+                    wait = max(0.0, min(wait, hedge_at - now))
+                try:
+                    backend, out, err = results.get(timeout=max(0.01, wait))
+                except queue.Empty:
+                    if pending and time.monotonic() < deadline:
+                        start_next()
+                    continue
+
+                running -= 1
+                if err is None:
+                    with self._lock:
+                        backend.stats.wins += 1
+                    return out, backend.name
+                errors.append(f"{backend.name}: {err}")
+                if pending:
+                    start_next()
+
+            raise OllamaError("all backends failed: " + "; ".join(errors))
+        finally:
+            unregister()
+            for tok in tokens.values():
+                tok.cancel()
+
+
+_brain: Optional[HedgedBrain] = None
+_brain_lock = threading.Lock()
+
+
+def get_hedged_brain(local_model: str) -> Optional[HedgedBrain]:
+    """Process-wide HedgedBrain per BRUNO_BRAIN_BACKEND, or None in local-only mode."""
+    global _brain
+    mode = os.environ.get("BRUNO_BRAIN_BACKEND", "local").lower()
+    if mode == "local":
+        return None
+    with _brain_lock:
+        if _brain is None:
+            if mode == "online":
+                _brain = HedgedBrain([online_backend()], mode="adaptive")
+            else:
+                _brain = HedgedBrain([ollama_backend(local_model), online_backend()], mode=mode)
+        return _brain
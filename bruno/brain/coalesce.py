@@ -0,0 +1,79 @@
+"""
+Request coalescing for specialists.
+
+Coalescer.run(key, fn) runs fn once per key at a time: callers that arrive while it is
+running wait for the same Future, and callers shortly after it finished get the cached
+result (ttl_s). Keys describe the work, e.g. ("vitals", "camera", who) or
+("vision", frame_fingerprint(frame)), so two identical asks never cost two runs.
+adopt(key, start) does the same for work already scheduled elsewhere (a speculative
+job): its Future is joined and cached like one of ours, without taking a worker.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def frame_fingerprint(frame, size: int = 16, levels: int = 16) -> str:
+    """Coarse hash of a frame: same scene + pose -> same key despite sensor noise."""
+    small = cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+    q = (gray.astype(np.uint16) * levels // 256).astype(np.uint8)
+    return hashlib.sha1(q.tobytes()).hexdigest()[:16]
+
+
+class Coalescer:
+    def __init__(self, executor: ThreadPoolExecutor, ttl_s: float = 5.0, max_entries: int = 64):
+        self.executor = executor
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, Future] = {}
+        self._done: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"runs": 0, "joined": 0, "cached": 0}
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args, ttl_s: Optional[float] = None, **kwargs) -> Future:
+        """Future for fn(*args) under key: cached, joined in-flight, or newly started."""
+        return self.adopt(key, lambda: self.executor.submit(fn, *args, **kwargs), ttl_s=ttl_s)
+
+    def adopt(self, key: Hashable, start: Callable[[], Future], ttl_s: Optional[float] = None) -> Future:
+        """Like submit, but start() schedules the work itself; called only on a miss."""
+        ttl_s = self.ttl_s if ttl_s is None else ttl_s
+        now = time.time()
+        with self._lock:
+            hit = self._done.get(key)
+            if hit is not None and now - hit[0] <= ttl_s:
+                self.stats["cached"] += 1
+                fut = Future()
+                fut.set_result(hit[1])
+                return fut
+
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.stats["joined"] += 1
+                return fut
+
+            self.stats["runs"] += 1
+            fut = start()
+            self._inflight[key] = fut
+
+        fut.add_done_callback(lambda f: self._finish(key, f))
+        return fut
+
+    def run(self, key: Hashable, fn: Callable[..., Any], *args, ttl_s: Optional[float] = None, **kwargs) -> Any:
+        return self.submit(key, fn, *args, ttl_s=ttl_s, **kwargs).result()
+
+    def _finish(self, key: Hashable, fut: Future):
+        with self._lock:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+            if fut.cancelled() or fut.exception() is not None:
+                return  # failures are not cached; the next ask retries
+            self._done[key] = (time.time(), fut.result())
+            if len(self._done) > self.max_entries:
+                oldest = min(self._done, key=lambda k: self._done[k][0])
+                del self._done[oldest]
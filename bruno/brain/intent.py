@@ -0,0 +1,203 @@
+"""
+Local intent classifier for the router.
+
+Hashed word + character n-gram features and one logistic regression per routing flag,
+trained in numpy from the phrase set below the first time it is used (well under a
+second). predict() takes ~0.1 ms, so common commands never wait on the router LLM;
+route() only falls back to the LLM when the classifier is unsure.
+Add phrases to TRAINING_PHRASES to teach it new commands.
+"""
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+FLAGS = ("needs_vision", "needs_health_reasoning", "needs_vitals")
+
+# (phrase, needs_vision, needs_health_reasoning, needs_vitals)
+TRAINING_PHRASES: List[Tuple[str, int, int, int]] = [
+    # skin / visual health checks
+    ("check my skin", 1, 1, 0),
+    ("can you check my skin", 1, 1, 0),
+    ("look at my skin", 1, 1, 0),
+    ("scan my skin", 1, 1, 0),
+    ("do i have acne", 1, 1, 0),
+    ("how does my acne look", 1, 1, 0),
+    ("is my acne getting better", 1, 1, 0),
+    ("look at this rash", 1, 1, 0),
+    ("what is this spot on my face", 1, 1, 0),
+    ("check this mole", 1, 1, 0),
+    ("does my face look red", 1, 1, 0),
+    ("is this bump infected", 1, 1, 0),
+    ("look at my cut", 1, 1, 0),
+    ("check my face", 1, 1, 0),
+    ("how does my skin look today", 1, 1, 0),
+    ("do i have pimples", 1, 1, 0),
+    ("examine my skin", 1, 1, 0),
+    ("can you see a rash on my arm", 1, 1, 0),
+    # plain vision, no health
+    ("what do you see", 1, 0, 0),
+    ("what am i holding", 1, 0, 0),
+    ("what is in front of you", 1, 0, 0),
+    ("look around", 1, 0, 0),
+    ("who is in the room", 1, 0, 0),
+    ("what color is my shirt", 1, 0, 0),
+    ("describe the room", 1, 0, 0),
+    ("can you see me", 1, 0, 0),
+    ("how many people are here", 1, 0, 0),
+    ("what object is this", 1, 0, 0),
+    ("read what is on this paper", 1, 0, 0),
+    # vitals
+    ("check my heart rate", 0, 1, 1),
+    ("what is my heart rate", 0, 1, 1),
+    ("what's my pulse", 0, 1, 1),
+    ("check my pulse", 0, 1, 1),
+    ("check my vitals", 0, 1, 1),
+    ("how are my vitals", 0, 1, 1),
+    ("measure my heart rate", 0, 1, 1),
+    ("how fast is my heart beating", 0, 1, 1),
+    ("is my heartbeat normal", 0, 1, 1),
+    ("take my pulse", 0, 1, 1),
+    ("what is my bpm", 0, 1, 1),
+    ("my heart is racing", 0, 1, 1),
+    ("is my heart rate too high", 0, 1, 1),
+    ("monitor my heart", 0, 1, 1),
+    ("how is my heart doing", 0, 1, 1),
+    # health talk without camera or vitals
+    ("i have a headache", 0, 1, 0),
+    ("i feel dizzy", 0, 1, 0),
+    ("my stomach hurts", 0, 1, 0),
+    ("i fell down", 0, 1, 0),
+    ("i think i twisted my ankle", 0, 1, 0),
+    ("i feel sick", 0, 1, 0),
+    ("i have a fever", 0, 1, 0),
+    ("my back hurts", 0, 1, 0),
+    ("i can't sleep", 0, 1, 0),
+    ("i feel tired all the time", 0, 1, 0),
+    ("what should i do for a cold", 0, 1, 0),
+    ("i am having trouble breathing", 0, 1, 0),
+    ("my chest hurts", 0, 1, 0),
+    ("i burned my hand", 0, 1, 0),
+    ("should i see a doctor", 0, 1, 0),
+    ("i feel anxious", 0, 1, 0),
+    # small talk / commands
+    ("hello bruno", 0, 0, 0),
+    ("hi there", 0, 0, 0),
+    ("good morning", 0, 0, 0),
+    ("how are you", 0, 0, 0),
+    ("what time is it", 0, 0, 0),
+    ("tell me a joke", 0, 0, 0),
+    ("thank you", 0, 0, 0),
+    ("good boy", 0, 0, 0),
+    ("what is your name", 0, 0, 0),
+    ("what can you do", 0, 0, 0),
+    ("stop", 0, 0, 0),
+    ("never mind", 0, 0, 0),
+    ("goodbye", 0, 0, 0),
+    ("sit", 0, 0, 0),
+    ("come here", 0, 0, 0),
+    ("what's the weather like", 0, 0, 0),
+    ("play some music", 0, 0, 0),
+    ("who made you", 0, 0, 0),
+    ("turn on autopilot", 0, 0, 0),
+    ("i'm going to bed", 0, 0, 0),
+]
+
+N_FEATURES = 1 << 12
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_WAKE_WORDS = ("bruno", "hey", "ok", "okay")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation / wake word, collapse spaces (also the router cache key)."""
+    words = _WORD_RE.findall((text or "").lower())
+    while words and words[0] in _WAKE_WORDS:
+        words = words[1:]
+    return " ".join(words)
+
+
+# questions about what happened earlier; only these get the perception history summary
+_PAST_RE = re.compile(
+    r"\b(who (was|came|has been|visited)|anyone|anybody|someone|somebody|earlier|ago|recently|"
+    r"(did|have) you (see|notice)|seen|saw|happened|visitor|while i was|been here|last time)\b"
+)
+
+
+def asks_about_past(text: str) -> bool:
+    """True if text asks about earlier events (who was here, what happened)."""
+    return bool(_PAST_RE.search(normalize_text(text)))
+
+
+def _bucket(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8")) & (N_FEATURES - 1)
+
+
+def featurize(text: str) -> np.ndarray:
+    """L2-normalized hashed bag of words, word bigrams and char 3/4-grams."""
+    norm = normalize_text(text)
+    words = norm.split()
+    tokens = ["w:" + w for w in words]
+    tokens += ["b:" + a + "_" + b for a, b in zip(words, words[1:])]
+    padded = f" {norm} "
+    for n in (3, 4):
+        tokens += ["c:" + padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+    x = np.zeros(N_FEATURES, dtype=np.float32)
+    for t in tokens:
+        x[_bucket(t)] += 1.0
+    norm2 = float(np.linalg.norm(x))
+    return x / norm2 if norm2 > 0 else x
+
+
+class IntentClassifier:
+    """
+    One logistic regression per flag over shared features.
+    predict(text) -> ({flag: bool}, confidence) where confidence is the least certain
+    flag's probability of its chosen side (0.5 .. 1.0).
+    """
+
+    def __init__(self, phrases=TRAINING_PHRASES, l2: float = 1e-3, epochs: int = 400, lr: float = 2.0):
+        self.flags = FLAGS
+        X = np.stack([featurize(p[0]) for p in phrases])
+        Y = np.array([p[1:] for p in phrases], dtype=np.float32)
+        self.W, self.b = self._fit(X, Y, l2, epochs, lr)
+
+    @staticmethod
+    def _fit(X, Y, l2, epochs, lr):
+        n, d = X.shape
+        W = np.zeros((d, Y.shape[1]), dtype=np.float32)
+        b = np.zeros(Y.shape[1], dtype=np.float32)
+        for _ in range(epochs):
+            P = 1.0 / (1.0 + np.exp(-(X @ W + b)))
+            G = P - Y
+            W -= lr * (X.T @ G / n + l2 * W)
+            b -= lr * G.mean(axis=0)
+        return W, b
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        z = featurize(text) @ self.W + self.b
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def predict(self, text: str) -> Tuple[Dict[str, bool], float]:
+        p = self.predict_proba(text)
+        flags = {f: bool(pi >= 0.5) for f, pi in zip(self.flags, p)}
+        conf = float(np.min(np.maximum(p, 1.0 - p)))
+        # an empty / unknown utterance lights up nothing: not evidence of small talk
+        if not normalize_text(text):
+            conf = 0.0
+        return flags, conf
+
+
+_classifier: Optional[IntentClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> IntentClassifier:
+    """Process-wide classifier, trained on first use."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = IntentClassifier()
+        return _classifier
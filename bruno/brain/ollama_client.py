@@ -1,8 +1,124 @@
 import base64
+import json
+import os
+import socket
+import threading
+import time
+from typing import Optional, Iterator, Dict, Any, Callable, List
+
 import requests
+from requests.adapters import HTTPAdapter
 import cv2
 
-OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
+# OLLAMA_HOST is Ollama's own env var; point it at a stand-in server for offline testing
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+if not OLLAMA_HOST.startswith("http"):
+    OLLAMA_HOST = "http://" + OLLAMA_HOST
+OLLAMA_GENERATE_URL = f"{OLLAMA_HOST}/api/generate"
+
+# How long Ollama keeps a model resident after a call ("30m", "-1" = forever, "0" = unload)
+DEFAULT_KEEP_ALIVE = os.environ.get("BRUNO_OLLAMA_KEEP_ALIVE", "30m")
+
+# Print token counts / latency of every labelled call
+LOG_STATS = bool(os.environ.get("BRUNO_LLM_STATS"))
+
+# Ollama >= 0.5 constrains output to a JSON schema; older servers only know format="json"
+SCHEMA_FORMAT = os.environ.get("BRUNO_OLLAMA_SCHEMA", "1") != "0"
+
+
+class OllamaError(RuntimeError):
+    pass
+
+
+class OllamaTimeout(OllamaError):
+    pass
+
+
+class OllamaCancelled(OllamaError):
+    pass
+
+
+class UsageStats:
+    """
+    Per-task token and latency totals ("router", "speaker", ...), so the cost of each
+    decision is visible. record() is called by OllamaClient for calls with task=...
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict[str, float]] = {}
+
+    def record(self, task: str, stats: Dict[str, Any]):
+        with self._lock:
+            t = self._tasks.setdefault(task, {"calls": 0, "prompt_tokens": 0, "output_tokens": 0, "wall_s": 0.0, "first_token_s": 0.0})
+            t["calls"] += 1
+            t["prompt_tokens"] += stats.get("prompt_eval_count") or 0
+            t["output_tokens"] += stats.get("eval_count") or 0
+            t["wall_s"] += stats.get("wall_s") or 0.0
+            t["first_token_s"] += stats.get("first_token_s") or 0.0
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per task: calls and per-call averages."""
+        with self._lock:
+            out = {}
+            for task, t in self._tasks.items():
+                n = max(1, t["calls"])
+                out[task] = {
+                    "calls": int(t["calls"]),
+                    "avg_prompt_tokens": round(t["prompt_tokens"] / n, 1),
+                    "avg_output_tokens": round(t["output_tokens"] / n, 1),
+                    "avg_wall_s": round(t["wall_s"] / n, 3),
+                    "avg_first_token_s": round(t["first_token_s"] / n, 3),
+                }
+            return out
+
+
+USAGE = UsageStats()
+
+
+class CancelToken:
+    """
+    Shared cancel flag for one request (or a group of them).
+    cancel() from any thread aborts an in-flight stream, even while it is blocked on the socket.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
+
+    def on_cancel(self, cb: Callable[[], None]) -> Callable[[], None]:
+        """Register cb; returns an unregister function. Runs cb now if already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(cb)
+                return lambda: self._remove(cb)
+        cb()
+        return lambda: None
+
+    def _remove(self, cb):
+        with self._lock:
+            try:
+                self._callbacks.remove(cb)
+            except ValueError:
+                pass
+
 
 def _frame_to_jpeg_b64(frame) -> str:
     """
@@ -13,18 +129,216 @@ def _frame_to_jpeg_b64(frame) -> str:
         raise RuntimeError("cv2.imencode failed")
     return base64.b64encode(buf.tobytes()).decode("utf-8")
 
-def ollama_chat(model: str, prompt: str, image_b64: str | None = None) -> str:
+
+def _abort_response(r) -> None:
+    """Close a streaming response from another thread, unblocking a pending socket read."""
+    try:
+        conn = getattr(r.raw, "connection", None) or getattr(r.raw, "_connection", None)
+        sock = getattr(conn, "sock", None)
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    try:
+        r.close()
+    except Exception:
+        pass
+
+
+class OllamaClient:
+    """
+    Ollama /api/generate over one pooled keep-alive HTTP session.
+    stream_generate yields response tokens as they arrive; generate joins them.
+    Every call can take a deadline (seconds from now) and a CancelToken.
+    """
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_HOST,
+        keep_alive: Optional[str] = DEFAULT_KEEP_ALIVE,
+        pool_size: int = 4,
+        connect_timeout: float = 3.0,
+        default_deadline_s: float = 120.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.default_deadline_s = default_deadline_s
+        self._local = threading.local()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    @property
+    def last_stats(self) -> Dict[str, Any]:
+        """Stats of this thread's most recent finished call."""
+        return getattr(self._local, "stats", {})
+
+    def stream_generate(
+        self,
+        model: str,
+        prompt: str,
+        image_b64: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        cancel: Optional[CancelToken] = None,
+        options: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None,
+        **extra,
+    ) -> Iterator[str]:
+        """
+        Yield response text chunks. Raises OllamaTimeout past the deadline and
+        OllamaCancelled if the token is cancelled; the HTTP stream is closed either way.
+        task: label for USAGE (token counts + latency per task); printed when
+        BRUNO_LLM_STATS is set.
+        extra: any other /api/generate field (system, format, context, ...).
+        """
+        deadline_s = self.default_deadline_s if deadline_s is None else deadline_s
+        t0 = time.monotonic()
+        deadline = t0 + deadline_s
+
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt, "stream": True}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if image_b64:
+            payload["images"] = [image_b64]
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+
+        if cancel is not None and cancel.cancelled:
+            raise OllamaCancelled("cancelled before request")
+
+        try:
+            r = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                stream=True,
+                timeout=(self.connect_timeout, max(0.05, deadline_s)),
+            )
+        except requests.Timeout as e:
+            raise OllamaTimeout(str(e)) from e
+        except requests.RequestException as e:
+            raise OllamaError(str(e)) from e
+
+        unregister = cancel.on_cancel(lambda: _abort_response(r)) if cancel is not None else (lambda: None)
+        timer = threading.Timer(max(0.0, deadline - time.monotonic()), _abort_response, args=(r,))
+        timer.daemon = True
+        timer.start()
+        first_token_s = None
+        done = False
+        try:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if cancel is not None and cancel.cancelled:
+                    raise OllamaCancelled("cancelled")
+                if time.monotonic() > deadline:
+                    raise OllamaTimeout(f"deadline {deadline_s:.1f}s exceeded")
+                if not line:
+                    continue
+
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise OllamaError(chunk["error"])
+
+                text = chunk.get("response") or ""
+                if text:
+                    if first_token_s is None:
+                        first_token_s = time.monotonic() - t0
+                    yield text
+
+                if chunk.get("done"):
+                    stats = {
+                        "model": model,
+                        "task": task,
+                        "first_token_s": first_token_s,
+                        "wall_s": time.monotonic() - t0,
+                        "prompt_eval_count": chunk.get("prompt_eval_count"),
+                        "eval_count": chunk.get("eval_count"),
+                        "total_duration_ns": chunk.get("total_duration"),
+                        "done_reason": chunk.get("done_reason"),
+                    }
+                    self._local.stats = stats
+                    if task:
+                        USAGE.record(task, stats)
+                        if LOG_STATS:
+                            print(
+                                f"BRUNO: llm {task} {model}: {stats['prompt_eval_count']} prompt + "
+                                f"{stats['eval_count']} output tokens, {stats['wall_s']:.2f}s"
+                            )
+                    done = True
+                    break
+
+            if not done:
+                # an aborted socket can also look like a clean EOF
+                if cancel is not None and cancel.cancelled:
+                    raise OllamaCancelled("cancelled")
+                if time.monotonic() >= deadline - 0.01:
+                    raise OllamaTimeout(f"deadline {deadline_s:.1f}s exceeded")
+                raise OllamaError("stream ended before done")
+        except (requests.RequestException, OSError, AttributeError, ValueError) as e:
+            # an abort from cancel() / the deadline timer surfaces here as a connection/read error
+            if cancel is not None and cancel.cancelled:
+                raise OllamaCancelled("cancelled") from e
+            if isinstance(e, requests.Timeout) or time.monotonic() >= deadline - 0.01:
+                raise OllamaTimeout(f"deadline {deadline_s:.1f}s exceeded") from e
+            raise OllamaError(str(e)) from e
+        finally:
+            timer.cancel()
+            unregister()
+            r.close()
+
+    def generate(self, model: str, prompt: str, **kwargs) -> str:
+        return "".join(self.stream_generate(model, prompt, **kwargs)).strip()
+
+
+_client: Optional[OllamaClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OllamaClient:
+    """Process-wide shared client (one connection pool)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+        return _client
+
+
+def ollama_stream(model: str, prompt: str, image_b64: str | None = None, **kwargs) -> Iterator[str]:
+    """Token iterator from the shared client. kwargs: deadline_s, cancel, options, ..."""
+    return get_client().stream_generate(model, prompt, image_b64=image_b64, **kwargs)
+
+
+def ollama_chat(model: str, prompt: str, image_b64: str | None = None, **kwargs) -> str:
     """
     Call Ollama /api/generate. If image_b64 is provided, attaches it for vision models like LLaVA.
+    Streams internally over the shared pooled session; kwargs: deadline_s, cancel, options, ...
+    """
+    return get_client().generate(model, prompt, image_b64=image_b64, **kwargs)
+
+
+def json_format(schema: Dict[str, Any]):
+    """Value for Ollama's "format" field: the JSON schema, or "json" on older servers."""
+    return schema if SCHEMA_FORMAT else "json"
+
+
+def compact_json(obj) -> str:
+    """JSON for prompts: no indentation or spaces (indent=2 roughly doubles the tokens)."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def warm_prompt(model: str, system: str, **kwargs) -> Dict[str, Any]:
+    """
+    Load model and evaluate the static system prompt once, so it is resident (keep_alive)
+    and its prefix is already in Ollama's prompt cache when the first real request with
+    the same system arrives. Returns the call's stats.
     """
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-    }
-    if image_b64:
-        payload["images"] = [image_b64]
-
-    r = requests.post(OLLAMA_GENERATE_URL, json=payload, timeout=120)
-    r.raise_for_status()
-    return (r.json().get("response") or "").strip()
+    client = get_client()
+    options = dict(kwargs.pop("options", None) or {}, num_predict=1)
+    client.generate(model, "{}", system=system, options=options, task="warmup", **kwargs)
+    return client.last_stats
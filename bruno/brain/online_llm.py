@@ -1,13 +1,129 @@
 import os
 import json
-from openai import OpenAI
+import time
+import threading
+from typing import Optional, Iterator, Dict, Any
+
+import requests
+
+from bruno.brain.ollama_client import CancelToken, OllamaError, OllamaTimeout, OllamaCancelled, _abort_response
+
+# OpenAI-compatible endpoint; point OPENAI_BASE_URL at a stand-in server for offline testing
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+
 
 class OnlineBrain:
-    def __init__(self, model: str = "gpt-4.1-mini"):
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    """
+    OpenAI-compatible chat completions over a pooled HTTP session.
+    stream_generate yields text chunks and honours a deadline and a CancelToken,
+    like OllamaClient, so the two can be raced (bruno.brain.backends).
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4.1-mini",
+        base_url: str = OPENAI_BASE_URL,
+        api_key: Optional[str] = None,
+        connect_timeout: float = 3.0,
+        default_deadline_s: float = 20.0,
+    ):
         self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key if api_key is not None else os.environ.get("OPENAI_API_KEY")
+        self.connect_timeout = connect_timeout
+        self.default_deadline_s = default_deadline_s
+        self.session = requests.Session()
+        self.last_stats: Dict[str, Any] = {}
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        cancel: Optional[CancelToken] = None,
+        json_mode: bool = True,
+    ) -> Iterator[str]:
+        deadline_s = self.default_deadline_s if deadline_s is None else deadline_s
+        t0 = time.monotonic()
+        deadline = t0 + deadline_s
+
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        payload: Dict[str, Any] = {"model": self.model, "messages": messages, "stream": True}
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+        if cancel is not None and cancel.cancelled:
+            raise OllamaCancelled("cancelled before request")
 
-    def decide(self, scene_summary: dict, user_id: str | None = None) -> dict:
+        try:
+            r = self.session.post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=headers,
+                stream=True,
+                timeout=(self.connect_timeout, max(0.05, deadline_s)),
+            )
+        except requests.Timeout as e:
+            raise OllamaTimeout(str(e)) from e
+        except requests.RequestException as e:
+            raise OllamaError(str(e)) from e
+
+        unregister = cancel.on_cancel(lambda: _abort_response(r)) if cancel is not None else (lambda: None)
+        timer = threading.Timer(max(0.0, deadline - time.monotonic()), _abort_response, args=(r,))
+        timer.daemon = True
+        timer.start()
+        first_token_s = None
+        done = False
+        try:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if cancel is not None and cancel.cancelled:
+                    raise OllamaCancelled("cancelled")
+                if time.monotonic() > deadline:
+                    raise OllamaTimeout(f"deadline {deadline_s:.1f}s exceeded")
+                if not line or not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    done = True
+                    break
+
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise OllamaError(str(chunk["error"]))
+                for choice in chunk.get("choices", []):
+                    text = (choice.get("delta") or {}).get("content") or ""
+                    if text:
+                        if first_token_s is None:
+                            first_token_s = time.monotonic() - t0
+                        yield text
+
+            if not done:
+                if cancel is not None and cancel.cancelled:
+                    raise OllamaCancelled("cancelled")
+                if time.monotonic() >= deadline - 0.01:
+                    raise OllamaTimeout(f"deadline {deadline_s:.1f}s exceeded")
+                raise OllamaError("stream ended before [DONE]")
+            self.last_stats = {"model": self.model, "first_token_s": first_token_s, "wall_s": time.monotonic() - t0}
+        except (requests.RequestException, OSError, AttributeError, ValueError) as e:
+            if cancel is not None and cancel.cancelled:
+                raise OllamaCancelled("cancelled") from e
+            if isinstance(e, requests.Timeout) or time.monotonic() >= deadline - 0.01:
+                raise OllamaTimeout(f"deadline {deadline_s:.1f}s exceeded") from e
+            raise OllamaError(str(e)) from e
+        finally:
+            timer.cancel()
+            unregister()
+            r.close()
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        return "".join(self.stream_generate(prompt, **kwargs)).strip()
+
+    def decide(self, scene_summary: dict, user_id: str | None = None, deadline_s: Optional[float] = None) -> dict:
         system = (
             "You are BRUNO, a Baymax-like assistant in a robot dog. "
             "Be concise, calm, and helpful. "
@@ -19,13 +135,5 @@ class OnlineBrain:
             "user_id": user_id
         }
 
-        resp = self.client.responses.create(
-            model=self.model,
-            input=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": json.dumps(user)}
-            ],
-        )
-
-        text = resp.output_text.strip()
+        text = self.generate(json.dumps(user), system=system, deadline_s=deadline_s)
         return json.loads(text)
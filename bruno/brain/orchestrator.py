@@ -1,11 +1,76 @@
-from bruno.brain.router import route
-from bruno.brain.speaker import speak_response
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from typing import Optional, Dict, Any, Hashable
+
+from bruno.brain.router import route, warm_router
+from bruno.brain.speaker import speak_response, warm_speaker, RESPONSE_CACHE
 from bruno.brain.vision_specialist import analyze_scene
-from bruno.health.health_specialist import analyze_vitals
+from bruno.brain.speculation import speculate, spec_stats
+from bruno.brain.coalesce import Coalescer, frame_fingerprint
+from bruno.brain.ollama_client import CancelToken, OllamaCancelled, USAGE
+from bruno.health.health_specialist import analyze_vitals, VitalsHistory
+
+# Brain work runs here so the camera loop never waits on an LLM or specialist
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bruno-brain")
+
+# Specialists (skin model, camera vitals) run here, merged per identical request
+_specialists = Coalescer(ThreadPoolExecutor(max_workers=2, thread_name_prefix="bruno-specialist"), ttl_s=5.0)
+VITALS_REUSE_S = 10.0
+
+# Smoothing state for camera vitals, one per person (LRU, like VitalsSessions)
+_vitals_histories: "OrderedDict[Hashable, VitalsHistory]" = OrderedDict()
+_vitals_histories_lock = threading.Lock()
+VITALS_HISTORY_CAPACITY = 8
+
+
+def _face_identity(event: dict, face_box) -> Hashable:
+    """Who a camera vitals reading is for: the recognized user, else where the face is."""
+    for face in event.get("faces") or ():
+        if face.get("user_id"):
+            return face["user_id"]
+    if event.get("user_id"):
+        return event["user_id"]
+    return tuple(int(v) // 40 for v in face_box)  # coarse, so small head moves match
+
+
+def _vitals_history(identity: Hashable) -> VitalsHistory:
+    with _vitals_histories_lock:
+        hist = _vitals_histories.get(identity)
+        if hist is None:
+            hist = _vitals_histories[identity] = VitalsHistory()
+            while len(_vitals_histories) > VITALS_HISTORY_CAPACITY:
+                _vitals_histories.popitem(last=False)
+        _vitals_histories.move_to_end(identity)
+        return hist
+
+
+def _check(cancel: Optional[CancelToken]):
+    if cancel is not None and cancel.cancelled:
+        raise OllamaCancelled("brain request cancelled")
 
 
-def think_sync(event: dict, frame=None, cap=None, face_box=None, debug=True):
-    routing = route(event)
+def think_sync(event: dict, frame=None, cap=None, face_box=None, vitals=None, speak_stream=None, cancel=None, hints=None, debug=True):
+    """
+    vitals: optional StreamingHeartRate fed by the live loop. When given, heart rate
+    questions are answered from its live estimate instead of capturing from cap.
+    speak_stream: optional callable (e.g. tts.speak); LLM answers are spoken sentence by
+    sentence as they generate and the result has "spoken": True.
+    cancel: optional CancelToken; aborts in-flight LLM calls and raises OllamaCancelled.
+    hints: optional partial signals from the camera loop ({"face_in_view": bool}) used to
+    start specialists speculatively while routing runs (bruno.brain.speculation).
+    """
+    spec = speculate(event, frame=frame, hints=hints)
+    try:
+        return _think(event, spec, frame, cap, face_box, vitals, speak_stream, cancel, debug)
+    finally:
+        spec.discard()
+
+
+def _think(event, spec, frame, cap, face_box, vitals, speak_stream, cancel, debug):
+    routing = route(event, cancel=cancel)
+    _check(cancel)
 
     if debug:
         print("----- ROUTER OUTPUT -----")
@@ -27,25 +92,54 @@ def think_sync(event: dict, frame=None, cap=None, face_box=None, debug=True):
         routing["needs_speaker"] = True
     # --------------------------------------------
 
+    # Independent specialists run side by side; identical asks share one run
+    vision_fut = None
+    vitals_fut = None
+
     # 🧴 Acne / vision scan
     if routing.get("needs_vision") and frame is not None:
-        vision_data = analyze_scene(frame, routing=routing)
+        key = ("vision", frame_fingerprint(frame))
+        if spec.has("vision"):
+            # prepared while routing ran; it classifies on the speculation worker
+            vision_fut = _specialists.adopt(key, lambda: spec.commit("vision"))
+        else:
+            vision_fut = _specialists.submit(key, analyze_scene, frame, routing)
+
+    # ❤️ Heart rate / vitals (camera capture; the live estimator path below is instant)
+    if routing.get("needs_vitals") and vitals is None and cap is not None and face_box is not None:
+        # one camera measurement per person at a time, reused for a few seconds after it finishes
+        identity = _face_identity(event, face_box)
+        vitals_fut = _specialists.submit(
+            ("vitals", "camera", identity), analyze_vitals, cap, face_box,
+            history=_vitals_history(identity), ttl_s=VITALS_REUSE_S,
+        )
+
+    # ❤️ Heart rate / vitals
+    if routing.get("needs_vitals") and vitals is not None:
+        vitals_data = vitals.latest()
+        if vitals_data is None:
+            vitals_data = {
+                "heart_rate": None,
+                "confidence": 0.0,
+                "status": "measuring",
+                "progress": round(vitals.progress(), 2),
+            }
+
+    if vision_fut is not None:
+        vision_data = vision_fut.result()
+        _check(cancel)
 
         if debug:
             print("----- VISION OUTPUT -----")
             print(vision_data)
 
-    # ❤️ Heart rate / vitals
-    if (
-        routing.get("needs_vitals")
-        and cap is not None
-        and face_box is not None
-    ):
-        vitals_data = analyze_vitals(cap, face_box)
+    if vitals_fut is not None:
+        vitals_data = vitals_fut.result()
+        _check(cancel)
 
-        if debug:
-            print("----- VITALS OUTPUT -----")
-            print(vitals_data)
+    if vitals_data is not None and debug:
+        print("----- VITALS OUTPUT -----")
+        print(vitals_data)
 
     needs_speaker = routing.get("needs_speaker", True)
 
@@ -54,13 +148,143 @@ def think_sync(event: dict, frame=None, cap=None, face_box=None, debug=True):
             event,
             vision_data=vision_data,
             vitals_data=vitals_data,
-            routing=routing
+            routing=routing,
+            stream_to=speak_stream,
+            cancel=cancel,
         )
+        _check(cancel)
 
         if debug:
             print("----- SPEAKER OUTPUT -----")
             print(out)
+            print("Response cache:", RESPONSE_CACHE.stats())
+            print("LLM usage:", USAGE.summary())
+            print("Speculation:", spec_stats())
+            print("Specialists:", _specialists.stats)
 
         return out
 
-    return {"say": "", "ask_user": "", "confidence": 0.0}
\ No newline at end of file
+    return {"say": "", "ask_user": "", "confidence": 0.0}
+
+
+def warm_brain() -> Future:
+    """Load router + speaker models and cache their system prompts, on the brain executor."""
+    def _warm():
+        for name, fn in (("router", warm_router), ("speaker", warm_speaker)):
+            try:
+                stats = fn()
+                print(f"BRUNO: {name} LLM warm ({stats.get('prompt_eval_count')} system tokens, {stats.get('wall_s', 0):.1f}s)")
+            except Exception as e:
+                print(f"BRUNO: {name} LLM warmup failed:", e)
+
+    return _executor.submit(_warm)
+
+
+class BrainTask:
+    """
+    Handle for a think_async request. The camera loop calls poll() each frame; it returns
+    None while the brain is thinking and a result dict once, when the request finishes:
+      {"status": "ok", ...think_sync output...}
+      {"status": "timeout" | "cancelled" | "error", "say": ..., "error": ...}
+    """
+
+    def __init__(self, future: Future, cancel: CancelToken, deadline_s: float):
+        self.future = future
+        self.cancel_token = cancel
+        self.started = time.time()
+        self.deadline = self.started + deadline_s
+        self._timed_out = False
+        self._delivered = False
+
+        # enforce the deadline even while a worker is blocked inside an LLM call
+        self._timer = threading.Timer(deadline_s, self._on_deadline)
+        self._timer.daemon = True
+        self._timer.start()
+        future.add_done_callback(lambda _f: self._timer.cancel())
+
+    def _on_deadline(self):
+        if not self.future.done():
+            self._timed_out = True
+            self.cancel_token.cancel()
+
+    def cancel(self):
+        self._timer.cancel()
+        self.cancel_token.cancel()
+        self.future.cancel()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Blocking variant of poll(). Returns the timeout result at the deadline even if the
+        worker is still stuck in a step that cannot be cancelled (skin model, camera vitals).
+        """
+        wait = max(0.0, self.deadline - time.time())
+        if timeout is not None:
+            wait = min(wait, timeout)
+        try:
+            out = self.future.result(timeout=wait)
+        except FutureTimeout as e:
+            if time.time() >= self.deadline:
+                self._on_deadline()
+            return self._failure(e)
+        except Exception as e:
+            return self._failure(e)
+        out = dict(out or {})
+        out.setdefault("status", "ok")
+        return out
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        if self._delivered:
+            return None
+        if not self.future.done():
+            if time.time() < self.deadline:
+                return None
+            # past the deadline: answer now; the worker finishes (and is ignored) on its own
+            self._on_deadline()
+        self._delivered = True
+        if not self.future.done():
+            return self._failure(FutureTimeout(f"no answer after {self.deadline - self.started:.0f}s"))
+        return self.result()
+
+    def _failure(self, e: BaseException) -> Dict[str, Any]:
+        if self._timed_out:
+            return {"status": "timeout", "say": "Sorry, that took me too long. Please ask again.", "error": str(e)}
+        if self.cancel_token.cancelled or self.future.cancelled():
+            return {"status": "cancelled", "say": "", "error": str(e)}
+        print("Brain error:", e)
+        return {"status": "error", "say": "I am having trouble thinking right now.", "error": str(e)}
+
+
+def think_async(
+    event: dict,
+    frame=None,
+    vitals=None,
+    speak_stream=None,
+    hints=None,
+    deadline_s: float = 45.0,
+    debug: bool = True,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> BrainTask:
+    """
+    Non-blocking think_sync: returns a BrainTask immediately and runs routing, specialists
+    and the speaker on the brain executor. The frame is copied, so the caller may keep
+    drawing on its own. Past deadline_s the request is cancelled (LLM streams aborted).
+    """
+    cancel = CancelToken()
+    frame_copy = frame.copy() if frame is not None else None
+    future = (executor or _executor).submit(
+        think_sync,
+        event,
+        frame=frame_copy,
+        vitals=vitals,
+        speak_stream=speak_stream,
+        cancel=cancel,
+        hints=hints,
+        debug=debug,
+    )
+    return BrainTask(future, cancel, deadline_s)
@@ -0,0 +1,171 @@
+"""
+Response cache for the speaker LLM.
+
+Keys are a hash of the canonicalized prompt inputs: dict keys sorted, strings
+normalized, volatile fields (timestamps, ids) dropped and numbers bucketed, so two
+events that differ only by sensor jitter ("confidence": 0.81 vs 0.83) share an answer.
+Entries expire after ttl_s; the least recently used ones are evicted past capacity.
+With a path the cache is reloaded on start and written back (atomically) as it changes.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# fields that change every call without changing what BRUNO should say
+VOLATILE_KEYS = {"ts", "timestamp", "time", "t", "frame_id", "track_id", "segments", "snr", "region_weights", "spoken",
+                 # perception history timings: who / what was around is the key, not for how long
+                 "seen_s", "last_seen_s_ago", "present_for_s"}
+
+# bucket size per numeric field; anything else falls back to DEFAULT_BUCKET
+NUMERIC_BUCKETS = {
+    "confidence": 0.1,
+    "heart_rate": 5,
+    "bpm": 5,
+    "fall_score": 0.1,
+    "risk": 0.1,
+}
+DEFAULT_BUCKET = 0.05
+
+
+def _bucket(key: Optional[str], v: float):
+    step = NUMERIC_BUCKETS.get(key, DEFAULT_BUCKET)
+    return round(round(v / step) * step, 4)
+
+
+def canonicalize(obj: Any, key: Optional[str] = None) -> Any:
+    """JSON-able, order-independent version of obj with numbers bucketed by field name."""
+    if isinstance(obj, dict):
+        items = sorted((str(k), v) for k, v in obj.items())
+        return {k: canonicalize(v, k) for k, v in items if k not in VOLATILE_KEYS}
+    if isinstance(obj, (list, tuple)):
+        return [canonicalize(v, key) for v in obj]
+    if isinstance(obj, bool) or obj is None:
+        return obj
+    if isinstance(obj, (int, float)):
+        return _bucket(key, float(obj))
+    if isinstance(obj, str):
+        return " ".join(obj.lower().split())
+    return canonicalize(str(obj), key)
+
+
+def cache_key(*parts: Any) -> str:
+    blob = json.dumps(canonicalize(list(parts)), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache of speaker outputs.
+    get(key) -> dict or None, put(key, value), stats() -> hit/miss metrics.
+    """
+
+    def __init__(self, capacity: int = 256, ttl_s: float = 600.0, path: Optional[str] = None, save_every_s: float = 5.0):
+        self.capacity = capacity
+        self.ttl_s = ttl_s
+        self.path = path
+        self.save_every_s = save_every_s
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and now - item[0] > self.ttl_s:
+                del self._items[key]
+                self.expired += 1
+                self._dirty = True
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return dict(item[1])
+
+    def put(self, key: str, value: Dict[str, Any], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._items[key] = (now, dict(value))
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+            due = self.path and now - self._last_save >= self.save_every_s
+        if due:
+            self.save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+    # ---------- persistence ----------
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # anything but {"items": [[key, stored_at, value], ...]} counts as an empty cache
+        items = data.get("items") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return
+        rows = [
+            r for r in items
+            if isinstance(r, list) and len(r) == 3 and isinstance(r[0], str) and isinstance(r[1], (int, float))
+            and isinstance(r[2], dict)
+        ]
+        now = time.time()
+        rows.sort(key=lambda r: r[1])
+        for key, stored_at, value in rows[-self.capacity:]:
+            if now - stored_at <= self.ttl_s:
+                self._items[key] = (stored_at, value)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            rows = [[k, t, v] for k, (t, v) in self._items.items()]
+            self._dirty = False
+            self._last_save = time.time()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"items": rows}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("BRUNO: response cache save failed:", e)
@@ -1,8 +1,19 @@
 import json
-from bruno.brain.ollama_client import ollama_chat
+import os
+import threading
+from collections import OrderedDict
+
+from bruno.brain.ollama_client import ollama_chat, json_format, compact_json, warm_prompt
+from bruno.brain.intent import get_classifier, normalize_text
 
 ROUTER_MODEL = "qwen2.5:7b"
 
+# Tiers: routing cache -> local intent classifier -> router LLM (only when unsure)
+ROUTER_MIN_CONF = float(os.environ.get("BRUNO_ROUTER_MIN_CONF", "0.7"))
+ROUTER_CACHE_SIZE = 256
+# four booleans and a number; anything longer is the model rambling
+ROUTER_NUM_PREDICT = 48
+
 ROUTER_SYSTEM = """
 You are a routing AI for a robot dog assistant.
 You must ALWAYS respond in valid JSON only.
@@ -28,8 +39,50 @@ Return ONLY this JSON schema:
 }
 """
 
-def route(event: dict):
-    transcript = event.get("transcript", "").lower()
+_route_cache: "OrderedDict[str, dict]" = OrderedDict()
+_route_cache_lock = threading.Lock()
+
+
+def _cache_get(key: str):
+    with _route_cache_lock:
+        hit = _route_cache.get(key)
+        if hit is not None:
+            _route_cache.move_to_end(key)
+        return dict(hit) if hit is not None else None
+
+
+def _cache_put(key: str, routing: dict):
+    with _route_cache_lock:
+        _route_cache[key] = dict(routing)
+        _route_cache.move_to_end(key)
+        while len(_route_cache) > ROUTER_CACHE_SIZE:
+            _route_cache.popitem(last=False)
+
+
+def _event_text(event: dict) -> str:
+    return event.get("transcript") or event.get("user_text") or ""
+
+
+ROUTER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "needs_vision": {"type": "boolean"},
+        "needs_speaker": {"type": "boolean"},
+        "needs_health_reasoning": {"type": "boolean"},
+        "needs_vitals": {"type": "boolean"},
+        "confidence": {"type": "number"},
+    },
+    "required": ["needs_vision", "needs_speaker", "needs_health_reasoning", "needs_vitals", "confidence"],
+}
+
+
+def warm_router():
+    """Load the router model with its system prompt cached (see ollama_client.warm_prompt)."""
+    return warm_prompt(ROUTER_MODEL, ROUTER_SYSTEM, format=json_format(ROUTER_SCHEMA))
+
+
+def route(event: dict, cancel=None):
+    transcript = _event_text(event).lower()
 
     # 🔥 Hard-coded fast path (prevents LLM hallucination)
     if "check my skin" in transcript:
@@ -38,7 +91,8 @@ def route(event: dict):
             "needs_speaker": True,
             "needs_health_reasoning": True,
             "needs_vitals": False,
-            "confidence": 0.95
+            "confidence": 0.95,
+            "source": "rule",
         }
 
     if (
@@ -51,23 +105,50 @@ def route(event: dict):
             "needs_speaker": True,
             "needs_health_reasoning": True,
             "needs_vitals": True,
-            "confidence": 0.95
+            "confidence": 0.95,
+            "source": "rule",
         }
 
-    # 🧠 Otherwise use LLM routing
-    prompt = f"""{ROUTER_SYSTEM}
+    key = normalize_text(transcript)
+    if key:
+        hit = _cache_get(key)
+        if hit is not None:
+            hit["source"] = "cache"
+            return hit
 
-SENSOR_EVENT_JSON:
-{json.dumps(event, indent=2)}
-"""
-    txt = ollama_chat(ROUTER_MODEL, prompt)
+        flags, conf = get_classifier().predict(key)
+        if conf >= ROUTER_MIN_CONF:
+            routing = {**flags, "needs_speaker": True, "confidence": round(conf, 2), "source": "classifier"}
+            _cache_put(key, routing)
+            return routing
+
+    # 🧠 Otherwise use LLM routing
+    routing = _route_llm(event, cancel=cancel)
+    if key and routing.get("source") == "llm":
+        _cache_put(key, routing)
+    return routing
+
+
+def _route_llm(event: dict, cancel=None):
+    # static system prompt goes in "system" so Ollama can reuse its cached prefix
+    prompt = f"SENSOR_EVENT_JSON:\n{compact_json(event)}"
+    txt = ollama_chat(
+        ROUTER_MODEL,
+        prompt,
+        system=ROUTER_SYSTEM,
+        format=json_format(ROUTER_SCHEMA),
+        options={"num_predict": ROUTER_NUM_PREDICT, "temperature": 0},
+        task="router",
+        cancel=cancel,
+    )
 
     fallback = {
         "needs_vision": False,
         "needs_speaker": True,
         "needs_health_reasoning": False,
         "needs_vitals": False,
-        "confidence": 0.25
+        "confidence": 0.25,
+        "source": "fallback",
     }
 
     try:
@@ -85,7 +166,8 @@ SENSOR_EVENT_JSON:
             if k not in data:
                 return fallback
 
+        data["source"] = "llm"
         return data
 
     except Exception:
-        return fallback
\ No newline at end of file
+        return fallback
@@ -1,9 +1,24 @@
+import atexit
 import json
+import os
 import re
-from bruno.brain.ollama_client import ollama_chat
+from typing import Callable, Optional, List
+from bruno.brain.ollama_client import ollama_chat, ollama_stream, json_format, compact_json, warm_prompt
+from bruno.brain.response_cache import ResponseCache, cache_key
+from bruno.brain.backends import get_hedged_brain
 
 SPEAKER_MODEL = "llama3.1:8b"
 
+# Same (bucketed) event + vision + vitals -> same answer, without a model call.
+# BRUNO_RESPONSE_CACHE_PATH=<file.json> keeps it across restarts; TTL 0 disables it.
+RESPONSE_CACHE = ResponseCache(
+    capacity=256,
+    ttl_s=float(os.environ.get("BRUNO_RESPONSE_CACHE_TTL", "600")),
+    path=os.environ.get("BRUNO_RESPONSE_CACHE_PATH") or None,
+)
+# put() only writes every save_every_s; flush whatever is left on exit.
+atexit.register(RESPONSE_CACHE.save)
+
 SYSTEM = """
 You are BRUNO, a calm and helpful robot assistant.
 Speak clearly and briefly.
@@ -17,6 +32,29 @@ Return ONLY JSON:
 }
 """
 
+SPEAKER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "say": {"type": "string"},
+        "ask_user": {"type": "string"},
+        "confidence": {"type": "number"},
+    },
+    "required": ["say", "ask_user", "confidence"],
+}
+
+# a few spoken sentences; caps runaway generations on slow CPUs
+SPEAKER_NUM_PREDICT = 160
+
+
+def _speaker_kwargs() -> dict:
+    """Ollama fields shared by every speaker call: resident system prompt, JSON output, token cap."""
+    return {
+        "system": SYSTEM,
+        "format": json_format(SPEAKER_SCHEMA),
+        "options": {"num_predict": SPEAKER_NUM_PREDICT},
+        "task": "speaker",
+    }
+
 
 def clean_llm_json(text: str):
     """
@@ -31,11 +69,145 @@ def clean_llm_json(text: str):
     return text
 
 
-def speak_response(event: dict, vision_data=None, vitals_data=None, routing=None):
+class SayFieldParser:
+    """
+    Incremental extractor for the "say" string of a JSON object that arrives in pieces.
+    feed(chunk) returns the newly decoded characters of the say value (escapes handled).
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+    _KEY_RE = re.compile(r'"say"\s*:\s*"')
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = None      # index just after the opening quote, once found
+        self.done = False     # closing quote seen
+        self.say = ""         # everything decoded so far
+
+    def feed(self, chunk: str) -> str:
+        self._buf += chunk
+        if self.done:
+            return ""
+        if self._pos is None:
+            m = self._KEY_RE.search(self._buf)
+            if not m:
+                return ""
+            self._pos = m.end()
+
+        out = []
+        i = self._pos
+        buf = self._buf
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self.done = True
+                i += 1
+                break
+            if c == "\\":
+                if i + 1 >= len(buf):
+                    break  # wait for the rest of the escape
+                e = buf[i + 1]
+                if e == "u":
+                    if i + 6 > len(buf):
+                        break
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(self._ESCAPES.get(e, e))
+                i += 2
+                continue
+            out.append(c)
+            i += 1
+        self._pos = i
+        piece = "".join(out)
+        self.say += piece
+        return piece
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+
+# sentence end: . ! ? (optionally closing quote/bracket) followed by whitespace, so "72.5" stays whole
+_SENTENCE_END = re.compile(r'([.!?]+["\')\]]?)\s+')
+
+
+class SentenceSplitter:
+    """Accumulates streamed text and hands out complete sentences as soon as they end."""
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buf = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buf += text
+        out = []
+        start = 0
+        for m in _SENTENCE_END.finditer(self._buf):
+            sentence = self._buf[start:m.end(1)].strip()
+            # keep very short fragments ("Hi.", "Dr.") attached to the next sentence
+            if len(sentence) < self.min_chars:
+                continue
+            out.append(sentence)
+            start = m.end()
+        self._buf = self._buf[start:]
+        return out
+
+    def flush(self) -> Optional[str]:
+        rest = self._buf.strip()
+        self._buf = ""
+        return rest or None
+
+
+def warm_speaker():
+    """Load the speaker model with its system prompt cached (see ollama_client.warm_prompt)."""
+    return warm_prompt(SPEAKER_MODEL, SYSTEM, format=json_format(SPEAKER_SCHEMA))
+
+
+def _stream_llm_say(prompt: str, stream_to: Callable[[str], None], cancel=None) -> dict:
+    """
+    Stream the speaker LLM, pushing each finished sentence of "say" to stream_to
+    (e.g. bruno.voice.tts.speak) while the rest is still generating.
+    """
+    parser = SayFieldParser()
+    splitter = SentenceSplitter()
+    spoken = False
+
+    for chunk in ollama_stream(SPEAKER_MODEL, prompt, cancel=cancel, **_speaker_kwargs()):
+        piece = parser.feed(chunk)
+        if piece:
+            for sentence in splitter.feed(piece):
+                stream_to(sentence)
+                spoken = True
+    tail = splitter.flush()
+    if tail:
+        stream_to(tail)
+        spoken = True
+
+    try:
+        out = json.loads(clean_llm_json(parser.text))
+    except Exception:
+        out = None
+    if not isinstance(out, dict):
+        # malformed tail but the say field came through
+        out = {"say": parser.say, "ask_user": "", "confidence": 0.5}
+        if not spoken:
+            raise ValueError("speaker output had no say field")
+    out["spoken"] = spoken
+    return out
+
+
+def speak_response(event: dict, vision_data=None, vitals_data=None, routing=None, stream_to=None, cancel=None):
     """
     Handles vitals first.
     Then acne result.
     Falls back to LLM if needed.
+
+    stream_to: optional callable (e.g. tts.speak). When given, the LLM answer is spoken
+    sentence by sentence while it generates and the result carries "spoken": True.
     """
 
     # ----------------------------------
@@ -51,6 +223,14 @@ def speak_response(event: dict, vision_data=None, vitals_data=None, routing=None
             "confidence": confidence
         }
 
+    # Live estimator has no reading yet (face just appeared / moving)
+    if vitals_data and vitals_data.get("status") == "measuring":
+        return {
+            "say": "I am still measuring your pulse. Please face me and hold still for a few seconds, then ask again.",
+            "ask_user": "",
+            "confidence": 0.3
+        }
+
     # ----------------------------------
     # 🧴 DIRECT ACNE CLASSIFIER RESPONSE
     # ----------------------------------
@@ -67,22 +247,40 @@ def speak_response(event: dict, vision_data=None, vitals_data=None, routing=None
     # ----------------------------------
     # 🔁 FALLBACK TO LLM SPEAKER
     # ----------------------------------
-    prompt = f"""{SYSTEM}
-
-SENSOR_EVENT_JSON:
-{json.dumps(event, indent=2)}
+    prompt = (
+        f"SENSOR_EVENT_JSON:\n{compact_json(event)}\n"
+        f"VISION_DATA:\n{compact_json(vision_data or {})}\n"
+        f"VITALS_DATA:\n{compact_json(vitals_data or {})}"
+    )
 
-VISION_DATA:
-{json.dumps(vision_data or {}, indent=2)}
-
-VITALS_DATA:
-{json.dumps(vitals_data or {}, indent=2)}
-"""
+    key = cache_key(SPEAKER_MODEL, SYSTEM, event, vision_data or {}, vitals_data or {})
+    if RESPONSE_CACHE.ttl_s > 0:
+        hit = RESPONSE_CACHE.get(key)
+        if hit is not None:
+            hit["cached"] = True
+            if stream_to is not None and hit.get("say"):
+                stream_to(hit["say"])
+                hit["spoken"] = True
+            return hit
 
     try:
-        txt = ollama_chat(SPEAKER_MODEL, prompt)
-        txt = clean_llm_json(txt)
-        return json.loads(txt)
+        hedged = get_hedged_brain(SPEAKER_MODEL)
+        if hedged is not None:
+            # local vs online race: first valid JSON wins (spoken whole by the caller)
+            out, backend = hedged.generate_json(
+                prompt, validate=lambda o: bool(o.get("say")), cancel=cancel, **_speaker_kwargs()
+            )
+            out["backend"] = backend
+        elif stream_to is not None:
+            out = _stream_llm_say(prompt, stream_to, cancel=cancel)
+        else:
+            txt = ollama_chat(SPEAKER_MODEL, prompt, cancel=cancel, **_speaker_kwargs())
+            txt = clean_llm_json(txt)
+            out = json.loads(txt)
+
+        if RESPONSE_CACHE.ttl_s > 0 and isinstance(out, dict) and out.get("say"):
+            RESPONSE_CACHE.put(key, {k: v for k, v in out.items() if k not in ("spoken", "backend")})
+        return out
 
     except Exception as e:
         print("Speaker error:", e)
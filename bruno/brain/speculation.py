@@ -0,0 +1,144 @@
+"""
+Speculative specialist work while routing is in flight.
+
+Before think_sync waits on route(), speculate() looks at cheap partial signals (the
+local intent classifier's probabilities for the transcript, a face in view) and starts
+the specialists routing is likely to ask for on a separate worker. Only work that is
+cheap to throw away runs ahead of the decision: for a skin question, the face crop and
+loading the skin model (start_gated). The classification itself waits at the gate until
+routing commits: take() opens it and returns the result (commit() returns its Future
+instead, e.g. for Coalescer.adopt), discard() drops the rest (jobs
+that have not started are cancelled, gated ones return without classifying).
+Vitals need no speculation: VitalsSessions buffers every face's ROI samples all the time.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Optional
+
+from bruno.brain.intent import get_classifier, normalize_text
+from bruno.brain.vision_specialist import prepare_scene, skin_result, acne_model
+
+# speculate once the classifier gives a flag at least this probability
+SPEC_MIN_P = float(os.environ.get("BRUNO_SPEC_MIN_P", "0.3"))
+# a gated job gives up waiting for routing after this long (discard() normally ends it first)
+SPEC_HOLD_S = float(os.environ.get("BRUNO_SPEC_HOLD_S", "60"))
+
+_spec_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bruno-spec")
+
+_stats_lock = threading.Lock()
+SPEC_STATS = {"started": 0, "used": 0, "discarded": 0, "saved_s": 0.0}
+
+
+def _count(key: str, n=1):
+    with _stats_lock:
+        SPEC_STATS[key] += n
+
+
+class _Gate:
+    """Holds a gated job between its speculative and its committed part."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._go = False
+        self.prepared_at: Optional[float] = None
+
+    def open(self, go: bool):
+        self._go = go
+        self._event.set()
+
+    def wait(self) -> bool:
+        return self._event.wait(SPEC_HOLD_S) and self._go
+
+
+def _gated(gate: _Gate, prepare: Callable[..., Any], commit: Callable[[Any], Any], *args):
+    prepared = prepare(*args)
+    gate.prepared_at = time.time()
+    if not gate.wait():
+        return None  # routing did not need it
+    return commit(prepared)
+
+
+class Speculation:
+    def __init__(self):
+        self._jobs: Dict[str, Future] = {}
+        self._started: Dict[str, float] = {}
+        self._gates: Dict[str, _Gate] = {}
+
+    def start(self, name: str, fn: Callable[..., Any], *args, **kwargs):
+        self._jobs[name] = _spec_executor.submit(fn, *args, **kwargs)
+        self._started[name] = time.time()
+        _count("started")
+
+    def start_gated(self, name: str, prepare: Callable[..., Any], commit: Callable[[Any], Any], *args):
+        """Run prepare(*args) now; commit(prepared) only once take(name) is called."""
+        gate = self._gates[name] = _Gate()
+        self.start(name, _gated, gate, prepare, commit, *args)
+
+    def has(self, name: str) -> bool:
+        return name in self._jobs
+
+    def take(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Commit: wait for the job and return its result (re-raises its exception)."""
+        if name in self._gates:
+            return self.commit(name).result(timeout=timeout)
+        fut = self._jobs.pop(name)
+        started = self._started.pop(name)
+        t0 = time.time()
+        result = fut.result(timeout=timeout)
+        # time the job ran before anyone needed it, minus any leftover wait
+        _count("used")
+        _count("saved_s", max(0.0, (t0 - started) - (time.time() - t0)))
+        return result
+
+    def commit(self, name: str) -> Future:
+        """Commit a gated job without waiting: lets it classify and returns its Future."""
+        fut = self._jobs.pop(name)
+        started = self._started.pop(name)
+        gate = self._gates.pop(name)
+        t0 = time.time()
+        gate.open(True)
+        # only the speculative part ran ahead: up to now, or until it finished
+        _count("used")
+        _count("saved_s", max(0.0, min(gate.prepared_at or t0, t0) - started))
+        return fut
+
+    def discard(self):
+        for gate in self._gates.values():
+            gate.open(False)
+        self._gates.clear()
+        for fut in self._jobs.values():
+            fut.cancel()
+        _count("discarded", len(self._jobs))
+        self._jobs.clear()
+        self._started.clear()
+
+
+def speculate(event: dict, frame=None, hints: Optional[dict] = None) -> Speculation:
+    """
+    Start likely specialist work for event. hints: {"face_in_view": bool} from the
+    camera loop. Never blocks for more than a classifier prediction (~0.1 ms).
+    """
+    spec = Speculation()
+    hints = hints or {}
+    text = normalize_text(event.get("transcript") or event.get("user_text") or "")
+
+    p_vision = 0.0
+    if text:
+        clf = get_classifier()
+        p_vision = float(clf.predict_proba(text)[clf.flags.index("needs_vision")])
+
+    if frame is not None and p_vision >= SPEC_MIN_P:
+        spec.start_gated("vision", prepare_scene, skin_result, frame)
+    elif hints.get("face_in_view") and not acne_model.loaded:
+        # someone is in front of the camera: have the skin model ready in case they ask
+        spec.start("skin_model", acne_model.warmup, False)
+    return spec
+
+
+def spec_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        out = dict(SPEC_STATS)
+    out["saved_s"] = round(out["saved_s"], 2)
+    return out
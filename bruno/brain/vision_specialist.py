@@ -1,17 +1,143 @@
-import torch
+import os
+import threading
+import time
+from typing import Optional
+
 import cv2
-from PIL import Image
-from transformers import AutoImageProcessor, AutoModelForImageClassification
+import numpy as np
+
+from bruno.perception.acne_onnx import AcneOnnx, default_model_path
+from bruno.utils.model_registry import ModelHandle
 
 MODEL_NAME = "imfarzanansari/skintelligent-acne"
 
-# Load model once at import
-processor = AutoImageProcessor.from_pretrained(MODEL_NAME)
-model = AutoModelForImageClassification.from_pretrained(MODEL_NAME)
-model.eval()
+# Manual label mapping (6 acne stages)
+ACNE_LABELS = { 0: "Clear Skin", 1: "Occasional Spots", 2: "Mild Acne", 3: "Moderate Acne", 4: "Severe Acne", 5: "Very Severe Acne" }
+
+
+class TorchAcne:
+    """Hugging Face PyTorch classifier with the same predict() as AcneOnnx."""
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        import torch
+        from transformers import AutoImageProcessor, AutoModelForImageClassification
+
+        self.processor = AutoImageProcessor.from_pretrained(model_name)
+        self.model = AutoModelForImageClassification.from_pretrained(model_name)
+        self.model.eval()
+
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model.to(self.device)
+
+    def predict(self, image, bgr: bool = True):
+        import torch
+        from PIL import Image
 
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
+        # Convert BGR → RGB
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if bgr else image
+        pil_image = Image.fromarray(rgb)
+
+        inputs = self.processor(images=pil_image, return_tensors="pt").to(self.device)
+
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+
+        probs = torch.softmax(outputs.logits, dim=1)[0].cpu().numpy()
+        class_id = int(np.argmax(probs))
+        return class_id, float(probs[class_id]), probs
+
+
+class AcneModel:
+    """
+    Lazy handle for the acne classifier, shared through the model registry
+    (bruno.utils.model_registry) by everything that classifies skin.
+    Nothing heavy (onnxruntime, or torch + transformers) is imported until the first
+    predict() or warmup(), so booting BRUNO does not pay for it unless someone asks
+    about their skin. Under BRUNO_MODEL_BUDGET_MB it may be evicted when idle and is
+    reloaded on the next predict().
+
+    backend: "onnx" (numpy preprocessing + onnxruntime, see scripts/export_acne_onnx.py),
+    "torch" (Hugging Face model), or "auto" (default, BRUNO_ACNE_BACKEND): onnx when an
+    exported model and onnxruntime are available, else torch. "auto" is resolved on the
+    first load, so importing this module does not import onnxruntime either.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, backend: Optional[str] = None):
+        self.model_name = model_name
+        self.backend = (backend or os.environ.get("BRUNO_ACNE_BACKEND", "auto")).lower()
+        self._handle: Optional[ModelHandle] = None
+        self._handle_lock = threading.Lock()
+        self.load_s = None          # seconds spent importing + loading (last load)
+        self.first_infer_s = None   # latency of the first classification
+        self.error = None
+        self._warm_thread = None
+
+    @property
+    def handle(self) -> ModelHandle:
+        """Registry handle for the resolved backend; picks it on first use."""
+        with self._handle_lock:
+            if self._handle is None:
+                if self.backend == "auto":
+                    self.backend = self._pick_backend()
+                self._handle = ModelHandle(f"acne:{self.backend}", self._load, evictable=True)
+            return self._handle
+
+    @property
+    def loaded(self) -> bool:
+        return self._handle is not None and self._handle.loaded
+
+    @staticmethod
+    def _pick_backend() -> str:
+        if default_model_path() is None:
+            return "torch"
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            return "torch"
+        return "onnx"
+
+    def _load(self):
+        t0 = time.time()
+        clf = AcneOnnx() if self.backend == "onnx" else TorchAcne(self.model_name)
+        self.load_s = time.time() - t0
+        return clf
+
+    def predict(self, image, bgr: bool = True):
+        """Image crop -> (class_id, confidence). Loads the model if needed."""
+        with self.handle as clf:
+            class_id, conf, _ = clf.predict(image, bgr=bgr)
+        return class_id, conf
+
+    def warmup(self, background: bool = True):
+        """Load the model (and run one dummy classification) now, by default on a daemon thread."""
+        if self.loaded or (self._warm_thread is not None and self._warm_thread.is_alive()):
+            return self._warm_thread
+
+        def _run():
+            try:
+                self.predict(np.zeros((224, 224, 3), dtype=np.uint8))
+            except Exception as e:
+                self.error = str(e)
+                print("BRUNO: acne model warmup failed:", e)
+
+        if not background:
+            _run()
+            return None
+        self._warm_thread = threading.Thread(target=_run, name="bruno-acne-warmup", daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "loaded": self.loaded,
+            "load_s": self.load_s,
+            "first_infer_s": self.first_infer_s,
+            "error": self.error,
+        }
+
+
+acne_model = AcneModel()
 
 
 def crop_center_square(frame):
@@ -26,37 +152,36 @@ def crop_center_square(frame):
     return frame[start_y:start_y + size, start_x:start_x + size]
 
 
-def analyze_scene(frame, routing=None):
-    """
-    Runs acne classification only when routing requires vision.
-    Returns structured acne result.
-    """
-
-    if frame is None:
-        return {"acne_stage": None, "confidence": 0.0}
-
-    try:
-        # Crop face region
-        face_crop = crop_center_square(frame)
+def classify_skin(face_crop, handle: AcneModel = acne_model):
+    """BGR crop -> (class_id, confidence). Loads the model on first use."""
+    t0 = time.time()
+    cold = not handle.loaded
+    class_id, confidence = handle.predict(face_crop)
 
-        # Convert BGR → RGB
-        rgb = cv2.cvtColor(face_crop, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(rgb)
+    if handle.first_infer_s is None:
+        handle.first_infer_s = time.time() - t0
+        print(f"BRUNO: first skin analysis took {handle.first_infer_s:.2f}s ({'cold' if cold else 'warm'} model)")
+    return class_id, confidence
 
-        inputs = processor(images=pil_image, return_tensors="pt").to(device)
 
-        with torch.no_grad():
-            outputs = model(**inputs)
+def prepare_scene(frame):
+    """
+    The cheap half of analyze_scene, safe to run before anyone asked: the face crop, with
+    the skin model loaded. Classify it with skin_result(crop).
+    """
+    face_crop = crop_center_square(frame)
+    try:
+        acne_model.handle.get()
+    except Exception as e:
+        print("Vision error (loading skin model):", e)  # skin_result retries and reports
+    return face_crop
 
-        logits = outputs.logits
-        probs = torch.softmax(logits, dim=1)
-        conf, pred = torch.max(probs, dim=1)
 
-        class_id = pred.item()
-        # Manual label mapping (6 acne stages)
-        ACNE_LABELS = { 0: "Clear Skin", 1: "Occasional Spots", 2: "Mild Acne", 3: "Moderate Acne", 4: "Severe Acne", 5: "Very Severe Acne" }
+def skin_result(face_crop):
+    """Face crop -> structured acne result."""
+    try:
+        class_id, confidence = classify_skin(face_crop)
         label = ACNE_LABELS.get(class_id, "Unknown")
-        confidence = float(conf.item())
 
         return {
             "acne_stage": label,
@@ -65,4 +190,23 @@ def analyze_scene(frame, routing=None):
 
     except Exception as e:
         print("Vision error:", e)
-        return {"acne_stage": None, "confidence": 0.0}
\ No newline at end of file
+        return {"acne_stage": None, "confidence": 0.0}
+
+
+def analyze_scene(frame, routing=None):
+    """
+    Runs acne classification only when routing requires vision.
+    Returns structured acne result.
+    """
+
+    if frame is None:
+        return {"acne_stage": None, "confidence": 0.0}
+
+    try:
+        # Crop face region
+        face_crop = crop_center_square(frame)
+    except Exception as e:
+        print("Vision error:", e)
+        return {"acne_stage": None, "confidence": 0.0}
+
+    return skin_result(face_crop)
@@ -35,6 +35,16 @@ class Autopilot:
             return True
         return (time.time() - self.last_prompt_key_ts) >= self.repeat_same_prompt_after_s
 
+    def next_due(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Next time a decision on unchanged inputs could come out differently (cooldown or
+        repeat window ending), or None. BrainLoop re-evaluates then.
+        """
+        now = time.time() if now is None else now
+        times = [self.last_say_ts + self.cooldown_s, self.last_prompt_key_ts + self.repeat_same_prompt_after_s]
+        future = [t for t in times if t > now]
+        return min(future) if future else None
+
     def decide(self, state: PerceptionState, risk: RiskResult) -> AutoOutput:
         # Gather recognized names in frame
         recognized = [p.get("name") for p in state.people if p.get("recognized") and p.get("name")]
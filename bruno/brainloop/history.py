@@ -0,0 +1,316 @@
+from __future__ import annotations
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .state import PerceptionState
+from .rules import FALL_SCORE
+
+# one row per evaluated PerceptionState; a row holds until the next one (BrainLoop only
+# records when an input changed), so durations are next_ts - ts
+FRAME_DTYPE = np.dtype([
+    ("ts", "f8"),
+    ("risk", "f4"),
+    ("fall_score", "f4"),
+    ("pose_detected", "?"),
+    ("n_people", "i2"),
+    ("n_objects", "i2"),
+    ("ent_start", "i8"),   # sequence number of this frame's first entity row
+    ("ent_count", "i2"),
+])
+
+KIND_OBJECT, KIND_PERSON = 0, 1
+
+# one row per detection / person in a frame
+ENTITY_DTYPE = np.dtype([
+    ("frame", "i8"),       # frame sequence number
+    ("kind", "u1"),
+    ("track_id", "i4"),    # -1 when untracked
+    ("label", "i2"),       # interned, -1 none
+    ("name", "i2"),        # interned, -1 unknown
+    ("recognized", "?"),
+    ("box", "i2", (4,)),   # x1, y1, x2, y2 (zeros when unknown)
+])
+
+
+class _Interner:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __call__(self, s: Optional[str]) -> int:
+        if not s:
+            return -1
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.values)
+            self.values.append(s)
+        return i
+
+    def lookup(self, i: int) -> Optional[str]:
+        return self.values[i] if i >= 0 else None
+
+
+class PerceptionHistory:
+    """
+    Fixed-capacity columnar history of perception states: a ring of frame rows and a
+    ring of entity rows (numpy structured arrays, strings interned). Appending is O(entities
+    in the frame); window queries binary-search the start and then touch only the rows
+    inside the window. With spill_dir, every chunk of frames is written to
+    spill_dir/perception-<first_ts>.npz before the ring overwrites it.
+    """
+
+    def __init__(self, capacity: int = 4096, entities_per_frame: int = 8, spill_dir: Optional[str] = None, spill_chunk: Optional[int] = None):
+        self.capacity = capacity
+        self.ent_capacity = capacity * entities_per_frame
+        self.frames = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self.entities = np.zeros(self.ent_capacity, dtype=ENTITY_DTYPE)
+        self.seq = 0       # frames ever appended
+        self.ent_seq = 0   # entity rows ever appended
+        self.labels = _Interner()
+        self.names = _Interner()
+        self.spill_dir = spill_dir
+        self.spill_chunk = spill_chunk or max(1, capacity // 4)
+        self._spilled = 0  # frames up to this sequence number are on disk
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    # ---------- writing ----------
+
+    def append(self, state: PerceptionState, risk: Optional[float] = None, detections: Optional[List[Dict[str, Any]]] = None):
+        """Record state (and its risk score); detections supply object boxes and track ids."""
+        ents = []
+        for d in detections or []:
+            if d.get("label") == "person":
+                continue  # people are recorded from state.people (with names)
+            ents.append((KIND_OBJECT, d.get("track_id"), d.get("label"), None, False, d.get("box")))
+        if not detections:
+            ents.extend((KIND_OBJECT, None, lab, None, False, None) for lab in state.objects)
+        for p in state.people:
+            ents.append((KIND_PERSON, p.get("track_id"), "person", p.get("name"), bool(p.get("recognized")), p.get("box")))
+
+        ent_start = self.ent_seq
+        for kind, tid, label, name, recognized, box in ents:
+            row = self.entities[self.ent_seq % self.ent_capacity]
+            row["frame"] = self.seq
+            row["kind"] = kind
+            row["track_id"] = -1 if tid is None else int(tid)
+            row["label"] = self.labels(label)
+            row["name"] = self.names(name)
+            row["recognized"] = recognized
+            row["box"] = box if box is not None else (0, 0, 0, 0)
+            self.ent_seq += 1
+
+        self.frames[self.seq % self.capacity] = (
+            state.ts,
+            0.0 if risk is None else risk,
+            state.pose.get("fall_score") or 0.0,
+            bool(state.pose.get("detected")),
+            len(state.people),
+            len(state.objects),
+            ent_start,
+            len(ents),
+        )
+        self.seq += 1
+        if self.spill_dir and self.seq - self._spilled >= self.spill_chunk:
+            self._spill(self._spilled, self.seq)
+
+    def _spill(self, start: int, end: int):
+        frames = self.frames[np.arange(start, end) % self.capacity]
+        e0, e1 = int(frames["ent_start"][0]), int(frames["ent_start"][-1] + frames["ent_count"][-1])
+        e0 = max(e0, self.ent_seq - self.ent_capacity)
+        entities = self.entities[np.arange(e0, e1) % self.ent_capacity]
+        path = os.path.join(self.spill_dir, f"perception-{frames['ts'][0]:.3f}.npz")
+        np.savez_compressed(
+            path,
+            frames=frames,
+            entities=entities,
+            labels=json.dumps(self.labels.values),
+            names=json.dumps(self.names.values),
+        )
+        self._spilled = end
+
+    # ---------- windows ----------
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def _ts(self, s: int) -> float:
+        return float(self.frames["ts"][s % self.capacity])
+
+    def _first_seq_since(self, t: float) -> int:
+        lo, hi = max(0, self.seq - self.capacity), self.seq
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def window(self, window_s: float, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (frame rows, per-frame durations, entity rows) covering the last window_s seconds.
+        The state in force when the window opened is included, clipped to the window.
+        """
+        now = time.time() if now is None else now
+        t0 = now - window_s
+        start = max(max(0, self.seq - self.capacity), self._first_seq_since(t0) - 1)
+        seqs = np.arange(start, self.seq)
+        frames = self.frames[seqs % self.capacity]
+        if not len(frames):
+            return frames, np.zeros(0), self.entities[:0]
+
+        ts = frames["ts"]
+        ends = np.append(ts[1:], now)
+        dur = np.clip(ends, t0, now) - np.clip(ts, t0, now)
+
+        e0 = max(int(frames["ent_start"][0]), self.ent_seq - self.ent_capacity)
+        entities = self.entities[np.arange(e0, self.ent_seq) % self.ent_capacity]
+        return frames, dur, entities
+
+    # ---------- aggregations ----------
+
+    def people_seen(self, window_s: float = 600.0, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Named people in the window: total seconds in view and when last seen."""
+        now = time.time() if now is None else now
+        frames, dur, ents = self.window(window_s, now)
+        if not len(frames):
+            return []
+        first = self.seq - len(frames)
+        people = ents[(ents["kind"] == KIND_PERSON) & (ents["name"] >= 0)]
+        idx = people["frame"] - first
+        people, idx = people[idx >= 0], idx[idx >= 0]
+
+        out = []
+        for nid in np.unique(people["name"]):
+            frame_idx = np.unique(idx[people["name"] == nid])
+            last = frame_idx[-1]
+            last_seen = now if last == len(frames) - 1 else float(frames["ts"][last + 1])
+            out.append({
+                "name": self.names.lookup(int(nid)),
+                "seen_s": round(float(dur[frame_idx].sum()), 1),
+                "last_seen_s_ago": round(now - last_seen, 1),
+            })
+        out.sort(key=lambda p: p["last_seen_s_ago"])
+        return out
+
+    def unknown_visits(self, window_s: float = 600.0, now: Optional[float] = None) -> int:
+        """Times an unrecognized person came into view in the window."""
+        frames, _, ents = self.window(window_s, now)
+        if not len(frames):
+            return 0
+        first = self.seq - len(frames)
+        unknown = ents[(ents["kind"] == KIND_PERSON) & ~ents["recognized"]]
+        present = np.zeros(len(frames), dtype=bool)
+        idx = unknown["frame"] - first
+        present[idx[idx >= 0]] = True
+        return int(np.count_nonzero(present[1:] & ~present[:-1]) + present[0])
+
+    def present_for(self, label: Optional[str] = None, name: Optional[str] = None, now: Optional[float] = None) -> float:
+        """Seconds label (or named person) has been continuously in view up to now; 0 if not in view."""
+        now = time.time() if now is None else now
+        if not self.seq:
+            return 0.0
+        key, value = ("name", self.names.ids.get(name, -2)) if name else ("label", self.labels.ids.get(label, -2))
+        s = self.seq - 1
+        oldest = max(0, self.seq - self.capacity)
+        since = None
+        while s >= oldest:
+            f = self.frames[s % self.capacity]
+            e0, n = int(f["ent_start"]), int(f["ent_count"])
+            if e0 < self.ent_seq - self.ent_capacity:
+                break
+            rows = self.entities[np.arange(e0, e0 + n) % self.ent_capacity]
+            if not np.any(rows[key] == value):
+                break
+            since = float(f["ts"])
+            s -= 1
+        return 0.0 if since is None else now - since
+
+    def objects_seen(self, window_s: float = 600.0, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Object labels in the window with total seconds in view and current continuous presence."""
+        now = time.time() if now is None else now
+        frames, dur, ents = self.window(window_s, now)
+        if not len(frames):
+            return []
+        first = self.seq - len(frames)
+        objs = ents[ents["kind"] == KIND_OBJECT]
+        idx = objs["frame"] - first
+        objs, idx = objs[idx >= 0], idx[idx >= 0]
+
+        out = []
+        for lid in np.unique(objs["label"]):
+            if lid < 0:
+                continue
+            frame_idx = np.unique(idx[objs["label"] == lid])
+            label = self.labels.lookup(int(lid))
+            out.append({
+                "label": label,
+                "seen_s": round(float(dur[frame_idx].sum()), 1),
+                "present_for_s": round(self.present_for(label=label, now=now), 1) if frame_idx[-1] == len(frames) - 1 else 0.0,
+            })
+        out.sort(key=lambda o: -o["seen_s"])
+        return out
+
+    def risk_stats(self, window_s: float = 600.0, now: Optional[float] = None) -> Dict[str, Any]:
+        frames, dur, _ = self.window(window_s, now)
+        if not len(frames) or dur.sum() <= 0:
+            return {"max": None, "mean": None, "falls": 0}
+        falling = frames["fall_score"] >= FALL_SCORE
+        return {
+            "max": round(float(frames["risk"].max()), 2),
+            "mean": round(float((frames["risk"] * dur).sum() / dur.sum()), 2),
+            "falls": int(np.count_nonzero(falling[1:] & ~falling[:-1]) + falling[0]),
+        }
+
+    def summary(self, window_s: float = 600.0, now: Optional[float] = None) -> Dict[str, Any]:
+        """Compact recent-history context for the brain."""
+        now = time.time() if now is None else now
+        return {
+            "window_s": window_s,
+            "people": self.people_seen(window_s, now),
+            "unknown_visits": self.unknown_visits(window_s, now),
+            "objects": self.objects_seen(window_s, now),
+            "risk": self.risk_stats(window_s, now),
+        }
+
+    def brief(self, window_s: float = 600.0, now: Optional[float] = None, max_items: int = 5) -> Dict[str, Any]:
+        """Trimmed summary for a prompt: latest people and busiest objects, empty parts left out."""
+        now = time.time() if now is None else now
+        out: Dict[str, Any] = {}
+        people = self.people_seen(window_s, now)[:max_items]
+        if people:
+            out["people"] = [{"name": p["name"], "last_seen_s_ago": p["last_seen_s_ago"]} for p in people]
+        objects = [o["label"] for o in self.objects_seen(window_s, now)[:max_items]]
+        if objects:
+            out["objects"] = objects
+        unknown = self.unknown_visits(window_s, now)
+        if unknown:
+            out["unknown_visits"] = unknown
+        falls = self.risk_stats(window_s, now)["falls"]
+        if falls:
+            out["falls"] = falls
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "frames": len(self),
+            "entities": min(self.ent_seq, self.ent_capacity),
+            "bytes": self.frames.nbytes + self.entities.nbytes,
+            "spilled": self._spilled,
+        }
+
+
+def load_spilled(path: str) -> Dict[str, Any]:
+    """Read one spilled chunk back: {"frames", "entities", "labels", "names"}."""
+    with np.load(path) as z:
+        return {
+            "frames": z["frames"],
+            "entities": z["entities"],
+            "labels": json.loads(str(z["labels"])),
+            "names": json.loads(str(z["names"])),
+        }
@@ -0,0 +1,157 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+import time
+
+from .state import PerceptionState, build_state
+from .risk import RiskResult, score_risk
+from .rules import FALL_SCORE, RiskEngine
+from .history import PerceptionHistory
+from .autopilot import Autopilot, AutoOutput
+
+# slot -> structural signature; only these decide whether anything changed
+Signature = Dict[str, Any]
+
+
+def _objects_sig(detections: List[Dict[str, Any]]) -> Tuple[str, ...]:
+    # sorted: detector output order shuffles frame to frame without anything changing
+    return tuple(sorted({d.get("label") for d in detections or [] if d.get("label")}))
+
+
+def _people_sig(people: List[Dict[str, Any]]) -> Tuple[Tuple[Any, Optional[str], bool], ...]:
+    sig = [(p.get("track_id"), p.get("name"), bool(p.get("recognized"))) for p in people or []]
+    # order-independent; untracked people (track_id None) sort first
+    sig.sort(key=lambda s: (s[0] is not None, str(s[0]), s[1] or "", s[2]))
+    return tuple(sig)
+
+
+def _pose_sig(pose: Dict[str, Any]) -> Tuple[bool, bool, bool]:
+    pose = pose or {}
+    return bool(pose.get("detected")), bool(pose.get("keypoints")), (pose.get("fall_score") or 0.0) >= FALL_SCORE
+
+
+@dataclass
+class StateDiff:
+    """What changed since the previous evaluation (empty sets when nothing did)."""
+    changed: Set[str] = field(default_factory=set)  # objects | people | pose | authorized_user | timer | decide
+    objects_added: Set[str] = field(default_factory=set)
+    objects_removed: Set[str] = field(default_factory=set)
+    people_joined: Set[Any] = field(default_factory=set)      # track ids
+    people_left: Set[Any] = field(default_factory=set)
+    people_renamed: Dict[Any, Tuple[Optional[str], Optional[str]]] = field(default_factory=dict)
+    authorized_user: Optional[Tuple[Optional[str], Optional[str]]] = None  # (before, after)
+    risk_changed: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.changed)
+
+
+@dataclass
+class LoopResult:
+    state: PerceptionState
+    risk: RiskResult
+    diff: StateDiff
+    output: AutoOutput
+
+
+class BrainLoop:
+    """
+    Change-driven build_state -> score_risk -> autopilot.
+
+    update() is cheap to call every frame: it compares structural signatures of the
+    inputs (labels, people track/name, pose presence, authorized user) with the last
+    evaluation and only rebuilds state / risk / autopilot when a slot changed or an
+    autopilot or risk-rule timer (cooldown, repeat window, a duration threshold about
+    to be crossed) came due, or decide went from False back to True (the autopilot
+    has not seen the current state). Returns None otherwise. Every evaluation is
+    appended to history, so each history row holds until the next one.
+    """
+
+    def __init__(
+        self,
+        autopilot: Optional[Autopilot] = None,
+        risk_engine: Optional[RiskEngine] = None,
+        history: Optional[PerceptionHistory] = None,
+    ):
+        self.autopilot = autopilot or Autopilot()
+        self.risk_engine = risk_engine or RiskEngine()
+        self.history = history if history is not None else PerceptionHistory()
+        self.state: Optional[PerceptionState] = None
+        self.risk: Optional[RiskResult] = None
+        self._sig: Signature = {}
+        self._wake_at: Optional[float] = None
+        self._decided = True  # whether the last evaluation ran the autopilot
+        self.evaluations = 0
+        self.skipped = 0
+
+    def _diff(self, sig: Signature, timer: bool, resumed: bool) -> StateDiff:
+        old = self._sig
+        diff = StateDiff()
+        for slot, value in sig.items():
+            if old.get(slot) != value:
+                diff.changed.add(slot)
+        if timer:
+            diff.changed.add("timer")
+        if resumed:
+            diff.changed.add("decide")
+
+        if "objects" in diff.changed:
+            before, after = set(old.get("objects", ())), set(sig["objects"])
+            diff.objects_added = after - before
+            diff.objects_removed = before - after
+        if "people" in diff.changed:
+            before = {tid: nm for tid, nm, _ in old.get("people", ())}
+            after = {tid: nm for tid, nm, _ in sig["people"]}
+            diff.people_joined = set(after) - set(before)
+            diff.people_left = set(before) - set(after)
+            diff.people_renamed = {t: (before[t], after[t]) for t in set(before) & set(after) if before[t] != after[t]}
+        if "authorized_user" in diff.changed:
+            diff.authorized_user = (old.get("authorized_user"), sig["authorized_user"])
+        return diff
+
+    def update(
+        self,
+        detections: List[Dict[str, Any]],
+        people: List[Dict[str, Any]],
+        pose_info: Dict[str, Any],
+        authorized_user: Optional[str],
+        decide: bool = True,
+        now: Optional[float] = None,
+    ) -> Optional[LoopResult]:
+        now = time.time() if now is None else now
+        sig = {
+            "objects": _objects_sig(detections),
+            "people": _people_sig(people),
+            "pose": _pose_sig(pose_info),
+            "authorized_user": authorized_user,
+        }
+        timer = self._wake_at is not None and now >= self._wake_at
+        resumed = decide and not self._decided
+        if self.state is not None and sig == self._sig and not timer and not resumed:
+            self.skipped += 1
+            return None
+
+        diff = self._diff(sig, timer, resumed)
+        self._sig = sig
+        self._decided = decide
+        self.evaluations += 1
+
+        state = build_state(
+            detections=detections,
+            people=people,
+            pose_info=pose_info,
+            authorized_user=authorized_user,
+        )
+        state.ts = now
+        risk = score_risk(state, engine=self.risk_engine, now=now)
+        diff.risk_changed = self.risk is None or (risk.score, risk.reasons) != (self.risk.score, self.risk.reasons)
+        self.state, self.risk = state, risk
+        self.history.append(state, risk=risk.score, detections=detections)
+
+        output = self.autopilot.decide(state, risk) if decide else AutoOutput()
+        due = [t for t in (self.autopilot.next_due(now), self.risk_engine.next_due(now)) if t is not None]
+        self._wake_at = min(due) if due else None
+        return LoopResult(state=state, risk=risk, diff=diff, output=output)
+
+    def stats(self) -> Dict[str, int]:
+        return {"evaluations": self.evaluations, "skipped": self.skipped}
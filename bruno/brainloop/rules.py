@@ -0,0 +1,302 @@
+from __future__ import annotations
+import math
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .state import PerceptionState
+
+# pose fall_score at or above this counts as a fall posture
+FALL_SCORE = 0.6
+
+# ---------- signals: instantaneous values read from one PerceptionState ----------
+
+SIGNALS: Dict[str, Callable[[PerceptionState], float]] = {
+    "unknown_person": lambda s: float(any(not p.get("recognized") for p in s.people)),
+    "recognized_locked": lambda s: float(any(p.get("recognized") for p in s.people) and not s.authorized_user),
+    "pose_low_confidence": lambda s: float(bool(s.pose.get("detected")) and not s.pose.get("keypoints")),
+    "fall_posture": lambda s: float((s.pose.get("fall_score") or 0.0) >= FALL_SCORE),
+    "person_count": lambda s: float(len(s.people)),
+}
+
+# ---------- windowed features, maintained incrementally ----------
+
+
+class _Buckets:
+    """Fixed ring of time buckets with running sums: O(1) amortized per update, O(1) query."""
+
+    def __init__(self, window_s: float, bucket_s: float):
+        self.bucket_s = bucket_s
+        self.n = max(1, int(math.ceil(window_s / bucket_s)))
+        self.value = [0.0] * self.n
+        self.weight = [0.0] * self.n
+        self.sum_value = 0.0
+        self.sum_weight = 0.0
+        self.head: Optional[int] = None  # absolute bucket number of the newest bucket
+
+    def _advance(self, b: int):
+        if self.head is None:
+            self.head = b
+            return
+        steps = min(b - self.head, self.n)
+        for k in range(1, steps + 1):
+            i = (self.head + k) % self.n
+            self.sum_value -= self.value[i]
+            self.sum_weight -= self.weight[i]
+            self.value[i] = self.weight[i] = 0.0
+        self.head = max(self.head, b)
+
+    def add(self, ts: float, value: float, weight: float = 1.0):
+        b = int(ts // self.bucket_s)
+        self._advance(b)
+        i = b % self.n
+        self.value[i] += value
+        self.weight[i] += weight
+        self.sum_value += value
+        self.sum_weight += weight
+
+    def add_span(self, t0: float, t1: float, x: float):
+        """Signal held at x over [t0, t1): each covered bucket gets weight = overlap seconds, value = x * overlap."""
+        b1 = int(t1 // self.bucket_s)
+        self._advance(b1)
+        if t1 <= t0:
+            return
+        for b in range(max(int(t0 // self.bucket_s), self.head - self.n + 1), b1 + 1):
+            w = min(t1, (b + 1) * self.bucket_s) - max(t0, b * self.bucket_s)
+            if w > 0:
+                i = b % self.n
+                self.value[i] += x * w
+                self.weight[i] += w
+                self.sum_value += x * w
+                self.sum_weight += w
+
+    def expire(self, ts: float):
+        self._advance(int(ts // self.bucket_s))
+
+    def next_expiry(self) -> Optional[float]:
+        """When the oldest non-empty bucket leaves the window (None if all are empty)."""
+        if self.head is None or self.sum_weight <= 0:
+            return None
+        for b in range(self.head - self.n + 1, self.head + 1):
+            if self.weight[b % self.n]:
+                return (b + self.n) * self.bucket_s
+        return None
+
+
+class Feature:
+    kind = ""
+
+    def __init__(self, signal: str, window_s: float = 0.0):
+        self.signal = signal
+        self.window_s = window_s
+        self.value = 0.0
+
+    def update(self, ts: float, x: float):
+        raise NotImplementedError
+
+    def next_due(self, now: float, threshold: float) -> Optional[float]:
+        """When value could cross threshold with unchanged input (for timers)."""
+        return None
+
+
+class Now(Feature):
+    """The signal's current value."""
+    kind = "now"
+
+    def update(self, ts, x):
+        self.value = x
+
+
+class Duration(Feature):
+    """Seconds the signal has been continuously truthy (0 when it is not)."""
+    kind = "duration"
+
+    def __init__(self, signal, window_s=0.0):
+        super().__init__(signal, window_s)
+        self.since: Optional[float] = None
+
+    def update(self, ts, x):
+        if x:
+            if self.since is None:
+                self.since = ts
+            self.value = ts - self.since
+        else:
+            self.since = None
+            self.value = 0.0
+
+    def next_due(self, now, threshold):
+        if self.since is not None and self.since + threshold > now:
+            return self.since + threshold
+        return None
+
+
+class Fraction(Feature):
+    """Share of the last window_s seconds during which the signal was truthy (time weighted)."""
+    kind = "fraction"
+
+    def __init__(self, signal, window_s):
+        super().__init__(signal, window_s)
+        self._b = _Buckets(window_s, max(0.25, window_s / 32))
+        self._last: Optional[Tuple[float, float]] = None
+
+    def update(self, ts, x):
+        if self._last is not None:
+            t0, x0 = self._last
+            self._b.add_span(t0, ts, 1.0 if x0 else 0.0)
+        else:
+            self._b.expire(ts)
+        self._last = (ts, x)
+        self.value = self._b.sum_value / self._b.sum_weight if self._b.sum_weight > 0 else float(bool(x))
+
+    def next_due(self, now, threshold):
+        # the share drifts toward the current input as time passes
+        if self._last is not None and self.value != float(bool(self._last[1])):
+            return now + self._b.bucket_s
+        return None
+
+
+class Count(Feature):
+    """Number of times the signal turned truthy in the last window_s seconds."""
+    kind = "count"
+
+    def __init__(self, signal, window_s):
+        super().__init__(signal, window_s)
+        self._b = _Buckets(window_s, max(0.25, window_s / 32))
+        self._prev = 0.0
+
+    def update(self, ts, x):
+        if x and not self._prev:
+            self._b.add(ts, 1.0)
+        else:
+            self._b.expire(ts)
+        self._prev = x
+        self.value = self._b.sum_value
+
+    def next_due(self, now, threshold):
+        return self._b.next_expiry() if self.value >= threshold else None
+
+
+class Mean(Feature):
+    """Mean of the signal over the last window_s seconds (time weighted: each value holds until the next update)."""
+    kind = "mean"
+
+    def __init__(self, signal, window_s):
+        super().__init__(signal, window_s)
+        self._b = _Buckets(window_s, max(0.25, window_s / 32))
+        self._last: Optional[Tuple[float, float]] = None
+
+    def update(self, ts, x):
+        if self._last is not None:
+            t0, x0 = self._last
+            self._b.add_span(t0, ts, x0)
+        else:
+            self._b.expire(ts)
+        self._last = (ts, x)
+        self.value = self._b.sum_value / self._b.sum_weight if self._b.sum_weight > 0 else x
+
+    def next_due(self, now, threshold):
+        # drifts toward the current input as time passes, like Fraction
+        if self._last is not None and self.value != self._last[1]:
+            return now + self._b.bucket_s
+        return self._b.next_expiry()
+
+
+FEATURES = {cls.kind: cls for cls in (Now, Duration, Fraction, Count, Mean)}
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq}
+
+# ---------- rules as data ----------
+# feature: (kind, signal) or (kind, signal, window_s); reason may use {value}
+
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {"name": "unknown_person", "feature": ("now", "unknown_person"), "op": ">=", "value": 1, "score": 0.20,
+     "reason": "unknown person"},
+    {"name": "unknown_person_lingering", "feature": ("duration", "unknown_person"), "op": ">=", "value": 30, "score": 0.15,
+     "reason": "unknown person present for {value:.0f}s"},
+    {"name": "pose_low_confidence", "feature": ("now", "pose_low_confidence"), "op": ">=", "value": 1, "score": 0.05,
+     "reason": "pose low confidence"},
+    {"name": "recognized_locked", "feature": ("now", "recognized_locked"), "op": ">=", "value": 1, "score": 0.10,
+     "reason": "recognized but locked"},
+    {"name": "fall_persisting", "feature": ("duration", "fall_posture"), "op": ">=", "value": 5, "score": 0.50,
+     "reason": "fall posture for {value:.0f}s"},
+    {"name": "repeated_falls", "feature": ("count", "fall_posture", 300), "op": ">=", "value": 3, "score": 0.20,
+     "reason": "{value:.0f} falls in the last 5 minutes"},
+]
+
+
+@dataclass
+class _CompiledRule:
+    name: str
+    feature: int
+    op: Callable[[float, float], bool]
+    threshold: float
+    score: float
+    reason: str
+
+
+class RiskEngine:
+    """
+    Compiles rules once: every distinct (kind, signal, window) becomes one incremental
+    feature, every distinct signal is read once per update, and rules become
+    (feature index, comparison, threshold) tuples. update() costs O(signals + features
+    + rules) regardless of how much history the windows cover.
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, base_score: float = 0.05):
+        self.base_score = base_score
+        self.rules: List[_CompiledRule] = []
+        self.features: List[Feature] = []
+        feature_index: Dict[Tuple, int] = {}
+
+        for r in rules if rules is not None else DEFAULT_RULES:
+            spec = tuple(r["feature"])
+            kind, signal = spec[0], spec[1]
+            if kind not in FEATURES:
+                raise ValueError(f"Unknown feature kind '{kind}' in rule {r['name']}")
+            if signal not in SIGNALS:
+                raise ValueError(f"Unknown signal '{signal}' in rule {r['name']}")
+            if spec not in feature_index:
+                feature_index[spec] = len(self.features)
+                self.features.append(FEATURES[kind](signal, *spec[2:]))
+            self.rules.append(_CompiledRule(
+                name=r["name"],
+                feature=feature_index[spec],
+                op=OPS[r.get("op", ">=")],
+                threshold=float(r["value"]),
+                score=float(r["score"]),
+                reason=r.get("reason", r["name"]),
+            ))
+        self.signals = sorted({f.signal for f in self.features})
+        self._signal_fns = [SIGNALS[s] for s in self.signals]
+        self._feature_signal = [self.signals.index(f.signal) for f in self.features]
+
+    def update(self, state: PerceptionState, now: Optional[float] = None):
+        from .risk import RiskResult
+
+        now = state.ts if now is None else now
+        xs = [fn(state) for fn in self._signal_fns]
+        for f, si in zip(self.features, self._feature_signal):
+            f.update(now, xs[si])
+
+        score = self.base_score
+        reasons: List[str] = []
+        fired: List[Dict[str, Any]] = []
+        for r in self.rules:
+            v = self.features[r.feature].value
+            if r.op(v, r.threshold):
+                score += r.score
+                reasons.append(r.reason.format(value=v))
+                fired.append({"rule": r.name, "value": round(v, 3), "score": r.score})
+
+        # Clamp
+        score = max(0.0, min(1.0, score))
+        return RiskResult(score=score, reasons=reasons, fired=fired)
+
+    def next_due(self, now: float) -> Optional[float]:
+        """Earliest time a rule's outcome could change on unchanged input (duration thresholds, window expiry)."""
+        times = []
+        for r in self.rules:
+            t = self.features[r.feature].next_due(now, r.threshold)
+            if t is not None and t > now:
+                times.append(t)
+        return min(times) if times else None
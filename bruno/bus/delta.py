@@ -0,0 +1,268 @@
+"""
+Delta-encoded PerceptionEvent stream.
+
+DeltaEncoder turns a device's events into stream messages: a keyframe with the full
+event every keyframe_every messages / keyframe_s seconds (or on request), and in between
+deltas carrying only what changed since the previous message:
+
+    {"t": "k", "dev": device_id, "ep": epoch, "seq": 7, "evt": {...full event...}}
+    {"t": "d", "dev": device_id, "ep": epoch, "seq": 8, "ts": "...",
+     "f": {"face_detected": true},                      # changed scalar fields
+     "sum": {"set": {"counts": {...}}, "del": []},       # scene_summary keys
+     "notes": {"set": {...}, "del": [...]},
+     "add": [{...detection...}], "upd": [[track_id, {"box": [...]}]], "del": [track_id],
+     "ord": [track_id, ...],                            # only if the order changed
+     "untracked": [{...}]}                              # detections without track_id, if changed
+
+Empty parts are left out, so a static scene costs a few dozen bytes per event.
+DeltaDecoder rebuilds full PerceptionEvents on the receiving side (tracked detections
+first, then untracked ones), reusing unchanged Detection objects; fields that arrive in
+a message are validated. A message with a seq it has already applied is a duplicate (a
+batch sent again) and is skipped. A missing seq, or a delta that does not fit the state
+it has, is a gap: it drops deltas until the next keyframe and sets needs_keyframe so the
+sender can be told to send one early (force_keyframe()). ep identifies the encoder
+instance, so a restarted sender's keyframe (seq back at 1) is not taken for a duplicate,
+and a delta from another epoch than the last keyframe's is a gap.
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from bruno.bus.messages import Detection, PerceptionEvent
+
+_SCALARS = ("user_id", "face_detected")
+_DET_FIELDS = ("label", "confidence", "box")
+
+
+def _dict_diff(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    set_ = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    del_ = [k for k in old if k not in new]
+    if not set_ and not del_:
+        return None
+    out: Dict[str, Any] = {}
+    if set_:
+        out["set"] = set_
+    if del_:
+        out["del"] = del_
+    return out
+
+
+def _dict_apply(old: Dict[str, Any], diff: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not diff:
+        return old
+    new = dict(old)
+    new.update(diff.get("set", {}))
+    for k in diff.get("del", ()):
+        new.pop(k, None)
+    return new
+
+
+class DeltaEncoder:
+    def __init__(self, keyframe_every: int = 100, keyframe_s: float = 10.0):
+        self.keyframe_every = keyframe_every
+        self.keyframe_s = keyframe_s
+        self.epoch = time.time_ns() // 1_000_000
+        self.seq = 0
+        self._prev: Optional[Dict[str, Any]] = None       # last event sent, as a dict
+        self._prev_tracks: Dict[int, Dict[str, Any]] = {}
+        self._since_key = 0
+        self._key_at = 0.0
+        self._force = True
+        self.stats = {"keyframes": 0, "deltas": 0}
+
+    def force_keyframe(self):
+        """Next message is a keyframe (e.g. the receiver reported a gap)."""
+        self._force = True
+
+    def encode(self, evt: Union[PerceptionEvent, Dict[str, Any]]) -> Dict[str, Any]:
+        """Stream message for evt (a PerceptionEvent or its model_dump(mode="json"))."""
+        d = evt if isinstance(evt, dict) else evt.model_dump(mode="json")
+        tracked = [x for x in d["detections"] if x.get("track_id") is not None]
+        untracked = [x for x in d["detections"] if x.get("track_id") is None]
+        tracks = {x["track_id"]: x for x in tracked}
+        self.seq += 1
+        now = time.time()
+
+        key = (
+            self._force
+            or self._prev is None
+            or self._since_key >= self.keyframe_every
+            or now - self._key_at >= self.keyframe_s
+            or d["device_id"] != self._prev["device_id"]
+            or len(tracks) != len(tracked)  # duplicate track ids cannot be diffed
+        )
+        if key:
+            msg = {"t": "k", "dev": d["device_id"], "ep": self.epoch, "seq": self.seq, "evt": d}
+            self._force = False
+            self._since_key = 0
+            self._key_at = now
+            self.stats["keyframes"] += 1
+        else:
+            msg = self._delta(d, tracks, untracked)
+            self._since_key += 1
+            self.stats["deltas"] += 1
+
+        self._prev = d
+        self._prev_tracks = tracks
+        return msg
+
+    def _delta(self, d: Dict[str, Any], tracks: Dict[int, Dict[str, Any]], untracked: List[Dict[str, Any]]) -> Dict[str, Any]:
+        prev, prev_tracks = self._prev, self._prev_tracks
+        msg: Dict[str, Any] = {"t": "d", "dev": d["device_id"], "ep": self.epoch, "seq": self.seq, "ts": d["ts"]}
+
+        fields = {k: d[k] for k in _SCALARS if d[k] != prev[k]}
+        if fields:
+            msg["f"] = fields
+        for part, name in (("sum", "scene_summary"), ("notes", "notes")):
+            diff = _dict_diff(prev[name], d[name])
+            if diff:
+                msg[part] = diff
+
+        add = [x for tid, x in tracks.items() if tid not in prev_tracks]
+        upd = []
+        for tid, x in tracks.items():
+            old = prev_tracks.get(tid)
+            if old is not None:
+                changed = {k: x[k] for k in _DET_FIELDS if x[k] != old[k]}
+                if changed:
+                    upd.append([tid, changed])
+        gone = [tid for tid in prev_tracks if tid not in tracks]
+        if add:
+            msg["add"] = add
+        if upd:
+            msg["upd"] = upd
+        if gone:
+            msg["del"] = gone
+
+        # order the decoder will have: previous order minus removed, plus added
+        expected = [tid for tid in prev_tracks if tid in tracks] + [x["track_id"] for x in add]
+        if list(tracks) != expected:
+            msg["ord"] = list(tracks)
+        prev_untracked = [x for x in prev["detections"] if x.get("track_id") is None]
+        if untracked != prev_untracked:
+            msg["untracked"] = untracked
+        return msg
+
+
+def _check_fields(msg: Dict[str, Any]):
+    """Type-check the event fields a delta sets (the rest come from validated state)."""
+    if not isinstance(msg["ts"], str):
+        raise ValueError("delta ts must be a string")
+    for k, v in msg.get("f", {}).items():
+        if k == "user_id" and not (v is None or isinstance(v, str)):
+            raise ValueError("delta user_id must be a string or null")
+        if k == "face_detected" and not isinstance(v, bool):
+            raise ValueError("delta face_detected must be a bool")
+        if k not in _SCALARS:
+            raise ValueError(f"unknown delta field {k!r}")
+    for part in ("sum", "notes"):
+        diff = msg.get(part)
+        if diff is not None and not (isinstance(diff, dict) and isinstance(diff.get("set", {}), dict)):
+            raise ValueError(f"delta {part} must be {{'set': {{...}}, 'del': [...]}}")
+
+
+def _check_det_update(changed: Dict[str, Any]):
+    """Type-check an "upd" entry (cheaper than re-validating the whole Detection)."""
+    for k, v in changed.items():
+        if k == "box":
+            ok = type(v) is list and len(v) == 4 and all(type(c) is int for c in v)
+        elif k == "confidence":
+            ok = type(v) is float or type(v) is int
+        else:
+            ok = k == "label" and type(v) is str
+        if not ok:
+            raise ValueError(f"bad detection update {k!r}: {v!r}")
+
+
+class DeltaDecoder:
+    def __init__(self):
+        self.epoch: Optional[int] = None
+        self.seq: Optional[int] = None
+        self.event: Optional[PerceptionEvent] = None
+        self._tracks: Dict[int, Detection] = {}
+        self._untracked: List[Detection] = []
+        self.needs_keyframe = True
+        self.stats = {"keyframes": 0, "deltas": 0, "gaps": 0, "dropped": 0, "duplicates": 0}
+
+    def _gap(self) -> None:
+        if not self.needs_keyframe:
+            self.stats["gaps"] += 1
+            self.needs_keyframe = True
+        self.stats["dropped"] += 1
+
+    def apply(self, msg: Dict[str, Any]) -> Optional[PerceptionEvent]:
+        """Full event for msg, or None for a duplicate or while waiting for a keyframe after a gap."""
+        seq = msg["seq"]
+        if msg["t"] == "k":
+            if msg.get("ep") == self.epoch and self.seq is not None and seq <= self.seq:
+                self.stats["duplicates"] += 1
+                return None
+            evt = PerceptionEvent.model_validate(msg["evt"])
+            self._tracks = {x.track_id: x for x in evt.detections if x.track_id is not None}
+            self._untracked = [x for x in evt.detections if x.track_id is None]
+            self.epoch, self.seq, self.event = msg.get("ep"), seq, evt
+            self.needs_keyframe = False
+            self.stats["keyframes"] += 1
+            return evt
+
+        if msg.get("ep") != self.epoch:
+            self._gap()  # its keyframe never arrived, or it is from a sender that restarted since
+            return None
+        if self.seq is not None and seq <= self.seq:
+            self.stats["duplicates"] += 1
+            return None
+        if self.needs_keyframe or self.seq is None or seq != self.seq + 1:
+            self._gap()
+            return None
+
+        _check_fields(msg)
+        prev = self.event
+        tracks = self._tracks
+        if "add" in msg or "upd" in msg or "del" in msg or "ord" in msg:
+            tracks = dict(tracks)
+            for tid in msg.get("del", ()):
+                tracks.pop(tid, None)
+            try:
+                for tid, changed in msg.get("upd", ()):
+                    _check_det_update(changed)
+                    tracks[tid] = Detection.trusted(**{**tracks[tid].__dict__, **changed})
+                for x in msg.get("add", ()):
+                    det = Detection.model_validate(x)
+                    tracks[det.track_id] = det
+                if "ord" in msg:
+                    tracks = {tid: tracks[tid] for tid in msg["ord"]}
+            except KeyError:
+                self._gap()  # refers to a track we do not have: out of sync
+                return None
+        if "untracked" in msg:
+            self._untracked = [Detection.model_validate(x) for x in msg["untracked"]]
+
+        update: Dict[str, Any] = {"ts": msg["ts"]}
+        update.update(msg.get("f", {}))
+        if "sum" in msg:
+            update["scene_summary"] = _dict_apply(prev.scene_summary, msg["sum"])
+        if "notes" in msg:
+            update["notes"] = _dict_apply(prev.notes, msg["notes"])
+        if tracks is not self._tracks or "untracked" in msg:
+            update["detections"] = list(tracks.values()) + self._untracked
+
+        self._tracks = tracks
+        # every field is either validated state or type-checked above
+        self.event = PerceptionEvent.trusted(**{**prev.__dict__, **update})
+        self.seq = seq
+        self.stats["deltas"] += 1
+        return self.event
+
+
+class StreamDecoders:
+    """One DeltaDecoder per device, for a node receiving several streams."""
+
+    def __init__(self):
+        self.decoders: Dict[str, DeltaDecoder] = {}
+
+    def apply(self, msg: Dict[str, Any]) -> Tuple[Optional[PerceptionEvent], bool]:
+        """(event or None, True if this device needs a keyframe)."""
+        dec = self.decoders.get(msg["dev"])
+        if dec is None:
+            dec = self.decoders[msg["dev"]] = DeltaDecoder()
+        evt = dec.apply(msg)
+        return evt, dec.needs_keyframe
@@ -1,12 +1,27 @@
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
+def _construct(cls, values: Dict[str, Any]):
+    # Instance from already-typed values for every field, without validation
+    # (what model_construct does, minus its per-field default handling).
+    m = cls.__new__(cls)
+    object.__setattr__(m, "__dict__", values)
+    object.__setattr__(m, "__pydantic_fields_set__", set(values))
+    object.__setattr__(m, "__pydantic_extra__", None)
+    object.__setattr__(m, "__pydantic_private__", None)
+    return m
+
 class Detection(BaseModel):
     label: str
     confidence: float = 1.0
     track_id: Optional[int] = None
     box: List[int]  # [x1,y1,x2,y2]
 
+    @classmethod
+    def trusted(cls, label: str, confidence: float, track_id: Optional[int], box: List[int]) -> "Detection":
+        """Build without validation, for internal producers whose fields are already typed."""
+        return _construct(cls, {"label": label, "confidence": confidence, "track_id": track_id, "box": box})
+
 class PerceptionEvent(BaseModel):
     ts: str
     device_id: str
@@ -16,6 +31,28 @@ class PerceptionEvent(BaseModel):
     face_detected: bool = False
     notes: Dict[str, Any] = {}
 
+    @classmethod
+    def trusted(
+        cls,
+        ts: str,
+        device_id: str,
+        scene_summary: Dict[str, Any],
+        detections: Optional[List[Detection]] = None,
+        user_id: Optional[str] = None,
+        face_detected: bool = False,
+        notes: Optional[Dict[str, Any]] = None,
+    ) -> "PerceptionEvent":
+        """Build without validation, for internal producers whose fields are already typed."""
+        return _construct(cls, {
+            "ts": ts,
+            "device_id": device_id,
+            "user_id": user_id,
+            "scene_summary": scene_summary,
+            "detections": detections if detections is not None else [],
+            "face_detected": face_detected,
+            "notes": notes if notes is not None else {},
+        })
+
 class BrainCommand(BaseModel):
     say: str
     actions: List[str] = []
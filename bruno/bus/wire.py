@@ -0,0 +1,105 @@
+"""
+Wire formats for bus messages.
+
+JSON (application/json) is always available. With msgpack installed, batches can also be
+sent as application/x-msgpack: each event becomes a fixed-order array and its detections
+are packed column-wise (labels list, confidences as float64 bytes, track ids and boxes
+as int32 bytes), so a scene with many boxes costs a few byte strings instead of a map
+per box. decode_events is for network input: it rebuilds plain dicts from the columns
+and validates them like a JSON body (one TypeAdapter call), so a malformed batch is a
+ValueError rather than a model with wrong-typed fields. The trusted() constructors are
+for in-process producers only.
+"""
+import struct
+from typing import Any, Dict, Iterable, List, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from pydantic import TypeAdapter
+
+from bruno.bus.messages import BrainCommand, PerceptionEvent
+
+JSON = "application/json"
+MSGPACK = "application/x-msgpack"
+
+_event_list = TypeAdapter(List[PerceptionEvent])
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def wants_msgpack(header: str) -> bool:
+    """True if a Content-Type / Accept header names msgpack."""
+    return MSGPACK in (header or "")
+
+
+def _pack_event(evt: Union[PerceptionEvent, Dict[str, Any]]) -> list:
+    d = evt if isinstance(evt, dict) else evt.__dict__
+    dets = d.get("detections") or []
+    if dets and not isinstance(dets[0], dict):
+        dets = [x.__dict__ for x in dets]
+    n = len(dets)
+    boxes = []
+    for x in dets:
+        boxes.extend(x["box"])
+    return [
+        d["ts"],
+        d["device_id"],
+        d.get("user_id"),
+        d.get("scene_summary") or {},
+        bool(d.get("face_detected")),
+        d.get("notes") or {},
+        [x["label"] for x in dets],
+        struct.pack(f"<{n}d", *[x.get("confidence", 1.0) for x in dets]),
+        struct.pack(f"<{n}i", *[-1 if x.get("track_id") is None else x["track_id"] for x in dets]),
+        struct.pack(f"<{4 * n}i", *boxes),
+    ]
+
+
+def _unpack_event(m: list) -> Dict[str, Any]:
+    ts, device_id, user_id, summary, face, notes, labels, conf, tid, box = m
+    n = len(labels)
+    conf = struct.unpack(f"<{n}d", conf)
+    tid = struct.unpack(f"<{n}i", tid)
+    box = struct.unpack(f"<{4 * n}i", box)
+    dets = [
+        {"label": labels[i], "confidence": conf[i], "track_id": None if tid[i] < 0 else tid[i], "box": box[4 * i: 4 * i + 4]}
+        for i in range(n)
+    ]
+    return {
+        "ts": ts, "device_id": device_id, "user_id": user_id, "scene_summary": summary,
+        "detections": dets, "face_detected": face, "notes": notes,
+    }
+
+
+def encode_events(evts: Iterable[Union[PerceptionEvent, Dict[str, Any]]]) -> bytes:
+    return msgpack.packb([_pack_event(e) for e in evts], use_bin_type=True)
+
+
+def decode_events(data: bytes) -> List[PerceptionEvent]:
+    """Validated events from a msgpack batch; raises ValueError on malformed input."""
+    try:
+        return _event_list.validate_python([_unpack_event(m) for m in msgpack.unpackb(data, raw=False)])
+    except (TypeError, ValueError, struct.error) as e:  # pydantic's ValidationError is a ValueError
+        raise ValueError(f"bad msgpack event batch: {e}") from e
+
+
+def pack(obj: Any) -> bytes:
+    """Plain msgpack for dict/list payloads (e.g. bruno.bus.delta stream messages)."""
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def encode_commands(cmds: Iterable[BrainCommand], **extra) -> bytes:
+    return pack({"commands": [c.model_dump() for c in cmds], **extra})
+
+
+def decode_commands(data: bytes) -> List[Dict[str, Any]]:
+    return unpack(data).get("commands", [])
@@ -1,11 +1,17 @@
 import cv2
 import numpy as np
 import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
 from scipy.signal import butter, filtfilt, detrend
 
-previous_bpm = None
-previous_box = None
-last_valid_bpm = None
+
+@dataclass
+class VitalsHistory:
+    """Smoothing / harmonic-correction state for one person (see bruno.health.sessions)."""
+    previous_bpm: Optional[int] = None
+    previous_box: Optional[Tuple[int, int, int, int]] = None
+    last_valid_bpm: Optional[int] = None
 
 
 def bandpass_filter(signal, fs, low=0.8, high=3.0, order=3):
@@ -32,69 +38,49 @@ def parabolic_interpolation(power, idx):
     return idx + delta
 
 
-def analyze_vitals(cap, face_box, duration=12):
-    global previous_bpm, previous_box, last_valid_bpm
-
-    if face_box is None:
-        return {"heart_rate": last_valid_bpm, "confidence": 0.1}
-
-    # ---------------- Motion Reset ----------------
-    if previous_box is not None:
-        px1, py1, px2, py2 = previous_box
-        x1, y1, x2, y2 = face_box
-        movement = abs(x1 - px1) + abs(y1 - py1)
-
-        if movement > 12:
-            previous_bpm = None
-
-    previous_box = face_box
-    # ---------------------------------------------
-
+def forehead_roi(face_box):
+    """Forehead rectangle (x1, y1, x2, y2) inside a face box."""
     x1, y1, x2, y2 = face_box
+    h = y2 - y1
+    w = x2 - x1
+    return (
+        int(x1 + w * 0.35),
+        int(y1 + h * 0.12),
+        int(x1 + w * 0.65),
+        int(y1 + h * 0.30),
+    )
 
-    values_r, values_g, values_b = [], [], []
-    timestamps = []
-
-    start = time.time()
-
-    while time.time() - start < duration:
-        ret, frame = cap.read()
-        if not ret:
-            continue
-
-        h = y2 - y1
-        w = x2 - x1
-
-        fx1 = int(x1 + w * 0.35)
-        fx2 = int(x1 + w * 0.65)
-        fy1 = int(y1 + h * 0.12)
-        fy2 = int(y1 + h * 0.30)
-
-        roi = frame[fy1:fy2, fx1:fx2]
-        if roi.size == 0:
-            continue
 
-        mean_color = np.mean(roi.reshape(-1, 3), axis=0)
+def roi_mean_bgr(frame, face_box):
+    """Mean B, G, R over the forehead ROI, or None if the ROI is empty."""
+    if frame is None or face_box is None:
+        return None
+    fx1, fy1, fx2, fy2 = forehead_roi(face_box)
+    roi = frame[max(0, fy1):fy2, max(0, fx1):fx2]
+    if roi.size == 0:
+        return None
+    return np.mean(roi.reshape(-1, 3), axis=0)
 
-        values_b.append(mean_color[0])
-        values_g.append(mean_color[1])
-        values_r.append(mean_color[2])
-        timestamps.append(time.time())
 
+def spectral_bpm(timestamps, values_r, values_g, values_b):
+    """
+    POS projection + band-pass + FFT peak over one trace.
+    Returns {"bpm", "confidence", "fps"} (raw, no smoothing) or {"bpm": None, "confidence": c}.
+    """
     if len(values_r) < 60:
-        return {"heart_rate": last_valid_bpm, "confidence": 0.2}
+        return {"bpm": None, "confidence": 0.2}
 
     # ---------- True FPS ----------
-    timestamps = np.array(timestamps)
+    timestamps = np.asarray(timestamps)
     total_time = timestamps[-1] - timestamps[0]
     if total_time <= 0:
-        return {"heart_rate": last_valid_bpm, "confidence": 0.2}
+        return {"bpm": None, "confidence": 0.2}
 
     fps = len(timestamps) / total_time
 
-    r = detrend(np.array(values_r))
-    g = detrend(np.array(values_g))
-    b = detrend(np.array(values_b))
+    r = detrend(np.asarray(values_r, dtype=np.float64))
+    g = detrend(np.asarray(values_g, dtype=np.float64))
+    b = detrend(np.asarray(values_b, dtype=np.float64))
 
     # Normalize
     r = (r - np.mean(r)) / (np.std(r) + 1e-6)
@@ -110,7 +96,7 @@ def analyze_vitals(cap, face_box, duration=12):
     try:
         filtered = bandpass_filter(H, fs=fps)
     except Exception:
-        return {"heart_rate": last_valid_bpm, "confidence": 0.2}
+        return {"bpm": None, "confidence": 0.2}
 
     filtered *= np.hanning(len(filtered))
 
@@ -122,7 +108,7 @@ def analyze_vitals(cap, face_box, duration=12):
     valid = (freqs >= 0.8) & (freqs <= 3.0)
 
     if not np.any(valid):
-        return {"heart_rate": last_valid_bpm, "confidence": 0.3}
+        return {"bpm": None, "confidence": 0.3}
 
     valid_power = power[valid]
     valid_freqs = freqs[valid]
@@ -136,16 +122,6 @@ def analyze_vitals(cap, face_box, duration=12):
         valid_freqs
     )
 
-    bpm = refined_freq * 60
-
-    # ---------- Harmonic Correction ----------
-    if previous_bpm is not None:
-        if bpm < 65 and previous_bpm > 75:
-            bpm *= 2
-
-    # ---------- Clamp Instead of Reject ----------
-    bpm = max(45, min(180, bpm))
-
     # ---------- Confidence Scoring ----------
     sorted_power = np.sort(valid_power)
     if len(sorted_power) >= 2:
@@ -155,6 +131,19 @@ def analyze_vitals(cap, face_box, duration=12):
 
     confidence = min(0.95, max(0.3, dominance_ratio / 2.0))
 
+    return {"bpm": float(refined_freq * 60), "confidence": float(confidence), "fps": float(fps)}
+
+
+def smooth_bpm(bpm, confidence, previous_bpm):
+    """Harmonic correction, clamp and temporal smoothing against the previous estimate."""
+    # ---------- Harmonic Correction ----------
+    if previous_bpm is not None:
+        if bpm < 65 and previous_bpm > 75:
+            bpm *= 2
+
+    # ---------- Clamp Instead of Reject ----------
+    bpm = max(45, min(180, bpm))
+
     # ---------- Temporal Smoothing ----------
     if previous_bpm is not None:
         if abs(bpm - previous_bpm) > 20:
@@ -163,10 +152,61 @@ def analyze_vitals(cap, face_box, duration=12):
         else:
             bpm = 0.7 * previous_bpm + 0.3 * bpm
 
-    previous_bpm = int(bpm)
-    last_valid_bpm = int(bpm)
+    return bpm, confidence
+
+
+def analyze_vitals(cap, face_box, duration=12, history: Optional[VitalsHistory] = None):
+    """
+    Blocking capture: reads the camera for `duration` seconds.
+    The live loop uses bruno.health.sessions.VitalsSessions instead.
+    history: per-person state kept across calls; without it the reading is unsmoothed.
+    """
+    hist = history if history is not None else VitalsHistory()
+
+    if face_box is None:
+        return {"heart_rate": hist.last_valid_bpm, "confidence": 0.1}
+
+    # ---------------- Motion Reset ----------------
+    if hist.previous_box is not None:
+        px1, py1, px2, py2 = hist.previous_box
+        x1, y1, x2, y2 = face_box
+        movement = abs(x1 - px1) + abs(y1 - py1)
+
+        if movement > 12:
+            hist.previous_bpm = None
+
+    hist.previous_box = face_box
+    # ---------------------------------------------
+
+    values_r, values_g, values_b = [], [], []
+    timestamps = []
+
+    start = time.time()
+
+    while time.time() - start < duration:
+        ret, frame = cap.read()
+        if not ret:
+            continue
+
+        mean_color = roi_mean_bgr(frame, face_box)
+        if mean_color is None:
+            continue
+
+        values_b.append(mean_color[0])
+        values_g.append(mean_color[1])
+        values_r.append(mean_color[2])
+        timestamps.append(time.time())
+
+    est = spectral_bpm(timestamps, values_r, values_g, values_b)
+    if est["bpm"] is None:
+        return {"heart_rate": hist.last_valid_bpm, "confidence": est["confidence"]}
+
+    bpm, confidence = smooth_bpm(est["bpm"], est["confidence"], hist.previous_bpm)
+
+    hist.previous_bpm = int(bpm)
+    hist.last_valid_bpm = int(bpm)
 
     return {
         "heart_rate": int(bpm),
         "confidence": round(confidence, 2)
-    }
\ No newline at end of file
+    }
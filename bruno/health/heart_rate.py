@@ -0,0 +1,100 @@
+"""
+Streaming rPPG heart rate.
+
+The main loop pushes the per-region skin mean colors (see bruno.health.roi) and the capture
+timestamp of every frame. Samples go through bruno.health.spectral.SpectralHeartRate
+(uniform resampling, cached band-pass, sliding Welch spectrum, peak tracker), which
+publishes a fresh estimate several times a second.
+Nothing here touches the camera.
+"""
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from bruno.health.spectral import SpectralHeartRate
+from bruno.health.roi import REGION_NAMES
+from bruno.health.rppg import get_projection
+
+
+class StreamingHeartRate:
+    """
+    push(bgr_mean, ts) every frame, latest() whenever someone asks.
+    Thread-safe: push runs on the camera loop, latest may be called from the brain.
+    """
+
+    def __init__(
+        self,
+        fs: float = 30.0,
+        regions=REGION_NAMES,
+        algorithm: str = "pos",
+        seg_s: float = 8.0,
+        hop_s: float = 0.25,
+        max_gap_s: float = 1.0,
+        stale_s: float = 3.0,
+    ):
+        self.max_gap_s = max_gap_s
+        self.stale_s = stale_s
+
+        self.regions = tuple(regions)
+        self.algorithm = algorithm
+        self._engine = SpectralHeartRate(
+            fs=fs,
+            n_regions=len(self.regions),
+            seg_s=seg_s,
+            hop_s=hop_s,
+            projection=get_projection(algorithm, fs),
+        )
+        self._last_ts: Optional[float] = None
+        self._latest: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._engine.reset()
+            self._last_ts = None
+            self._latest = None
+
+    def push(self, bgr_mean, ts: Optional[float] = None) -> None:
+        """
+        Add one sample: (len(regions), 3) mean BGR, or (3,) when tracking a single region.
+        bgr_mean=None (no face / too much motion this frame) is skipped; the resampler
+        bridges short drops and anything longer than max_gap_s restarts the trace.
+        """
+        if bgr_mean is None:
+            return
+        ts = time.time() if ts is None else float(ts)
+
+        with self._lock:
+            if self._last_ts is not None and (ts - self._last_ts > self.max_gap_s or ts <= self._last_ts):
+                # face lost / camera stalled / clock jump -> start a fresh trace
+                self._engine.reset()
+            self._last_ts = ts
+
+            self._engine.add(ts, bgr_mean)
+            est = self._engine.update(ts)
+            if est is None:
+                return
+
+            self._latest = {
+                "heart_rate": int(round(max(45.0, min(180.0, est["bpm"])))),
+                "confidence": round(est["confidence"], 2),
+                "ts": ts,
+                "snr": round(est["snr"], 3),
+                "segments": est["segments"],
+                "region_weights": {
+                    name: round(float(w), 2) for name, w in zip(self.regions, self._engine.region_weights)
+                },
+            }
+
+    def latest(self, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Most recent estimate, or None if there is none or it went stale (face gone)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._latest is None or now - self._latest["ts"] > self.stale_s:
+                return None
+            return dict(self._latest)
+
+    def progress(self) -> float:
+        """0..1 how full the analysis window is (for 'hold still' prompts)."""
+        with self._lock:
+            return self._engine.progress()
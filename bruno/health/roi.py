@@ -0,0 +1,146 @@
+"""
+Skin ROI sampling for rPPG.
+
+One integral image per frame gives the mean color of any number of rectangles in O(1) each,
+so forehead + both cheeks (and, later, several faces) cost a handful of array lookups.
+Between face detections a cheap template tracker keeps the box on the face.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple, Sequence
+
+import cv2
+import numpy as np
+
+# Fractions of the face box (x1, y1, x2, y2). Forehead matches the original single ROI.
+REGIONS = {
+    "forehead": (0.35, 0.12, 0.65, 0.30),
+    "left_cheek": (0.15, 0.50, 0.38, 0.72),
+    "right_cheek": (0.62, 0.50, 0.85, 0.72),
+}
+REGION_NAMES = tuple(REGIONS)
+_REGION_FRAC = np.array([REGIONS[k] for k in REGION_NAMES], dtype=np.float64)  # (R, 4)
+
+
+@dataclass
+class FramePass:
+    """Per-frame work shared by every ROI sampled from that frame."""
+    integral: np.ndarray   # (h+1, w+1, 3) cv2.integral of the BGR frame
+    gray: np.ndarray       # downscaled grayscale for tracking
+    scale: float
+    width: int
+    height: int
+
+
+def prepare_frame(frame_bgr, track_scale: float = 0.5) -> FramePass:
+    h, w = frame_bgr.shape[:2]
+    gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    if track_scale != 1.0:
+        gray = cv2.resize(gray, None, fx=track_scale, fy=track_scale, interpolation=cv2.INTER_AREA)
+    return FramePass(cv2.integral(frame_bgr), gray, track_scale, w, h)
+
+
+def region_rects(boxes: np.ndarray, frame_w: int, frame_h: int) -> np.ndarray:
+    """(F, 4) face boxes -> (F, R, 4) int region rectangles clipped to the frame."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 1, 4)
+    bw = boxes[..., 2] - boxes[..., 0]
+    bh = boxes[..., 3] - boxes[..., 1]
+    rects = np.empty((boxes.shape[0], len(REGION_NAMES), 4), dtype=np.float64)
+    rects[..., 0] = boxes[..., 0] + bw * _REGION_FRAC[:, 0]
+    rects[..., 1] = boxes[..., 1] + bh * _REGION_FRAC[:, 1]
+    rects[..., 2] = boxes[..., 0] + bw * _REGION_FRAC[:, 2]
+    rects[..., 3] = boxes[..., 1] + bh * _REGION_FRAC[:, 3]
+    rects = rects.astype(np.int64)
+    np.clip(rects[..., 0::2], 0, frame_w, out=rects[..., 0::2])
+    np.clip(rects[..., 1::2], 0, frame_h, out=rects[..., 1::2])
+    return rects
+
+
+def rect_means(integral: np.ndarray, rects: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean BGR of each rectangle from an integral image, fully vectorized.
+    rects: (..., 4) int (x1, y1, x2, y2). Returns (means (..., 3), valid (...)).
+    """
+    x1, y1, x2, y2 = rects[..., 0], rects[..., 1], rects[..., 2], rects[..., 3]
+    s = (
+        integral[y2, x2].astype(np.float64)
+        - integral[y1, x2]
+        - integral[y2, x1]
+        + integral[y1, x1]
+    )
+    area = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+    valid = area > 0
+    means = s / np.maximum(area, 1.0)[..., None]
+    return means, valid
+
+
+class FaceBoxTracker:
+    """
+    Keeps a face box on the face between detector updates with normalized template
+    matching on a downscaled gray frame. Reports per-frame motion relative to box size.
+    """
+
+    def __init__(self, search_pad: float = 0.4, min_score: float = 0.45):
+        self.search_pad = search_pad
+        self.min_score = min_score
+        self.box: Optional[np.ndarray] = None
+        self._template: Optional[np.ndarray] = None
+        self._tpl_offset = (0.0, 0.0)
+
+    def reset(self):
+        self.box = None
+        self._template = None
+
+    def _set_template(self, fp: FramePass, box: np.ndarray):
+        # inner part of the box: face texture, little background
+        x1, y1, x2, y2 = box * fp.scale
+        w, h = x2 - x1, y2 - y1
+        tx1, ty1 = int(x1 + 0.2 * w), int(y1 + 0.15 * h)
+        tx2, ty2 = int(x2 - 0.2 * w), int(y2 - 0.15 * h)
+        tpl = fp.gray[max(0, ty1):ty2, max(0, tx1):tx2]
+        self._template = tpl.copy() if tpl.size and min(tpl.shape) >= 8 else None
+        self._tpl_offset = (tx1 / fp.scale - box[0], ty1 / fp.scale - box[1])
+
+    def update(self, fp: FramePass, detected_box: Optional[Sequence[int]] = None) -> Tuple[Optional[np.ndarray], float]:
+        """Returns (box or None if lost, motion as fraction of box width since last frame)."""
+        prev = self.box
+
+        if detected_box is not None:
+            box = np.asarray(detected_box, dtype=np.float64)
+            self._set_template(fp, box)
+        elif prev is not None and self._template is not None:
+            box = self._match(fp, prev)
+        else:
+            box = None
+
+        self.box = box
+        if box is None:
+            self._template = None
+            return None, 0.0
+        if prev is None:
+            return box, 0.0
+
+        bw = max(1.0, box[2] - box[0])
+        motion = float(np.hypot((box[0] + box[2] - prev[0] - prev[2]) / 2, (box[1] + box[3] - prev[1] - prev[3]) / 2) / bw)
+        return box, motion
+
+    def _match(self, fp: FramePass, prev: np.ndarray) -> Optional[np.ndarray]:
+        th, tw = self._template.shape
+        x1, y1, x2, y2 = prev * fp.scale
+        pad_x, pad_y = (x2 - x1) * self.search_pad, (y2 - y1) * self.search_pad
+        ox, oy = self._tpl_offset[0] * fp.scale, self._tpl_offset[1] * fp.scale
+        sx1 = int(max(0, x1 + ox - pad_x))
+        sy1 = int(max(0, y1 + oy - pad_y))
+        sx2 = int(min(fp.gray.shape[1], x1 + ox + tw + pad_x))
+        sy2 = int(min(fp.gray.shape[0], y1 + oy + th + pad_y))
+        search = fp.gray[sy1:sy2, sx1:sx2]
+        if search.shape[0] < th or search.shape[1] < tw:
+            return None
+
+        res = cv2.matchTemplate(search, self._template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, loc = cv2.minMaxLoc(res)
+        if score < self.min_score:
+            return None
+
+        dx = (sx1 + loc[0]) / fp.scale - self._tpl_offset[0] - prev[0]
+        dy = (sy1 + loc[1]) / fp.scale - self._tpl_offset[1] - prev[1]
+        return prev + np.array([dx, dy, dx, dy])
@@ -0,0 +1,80 @@
+"""
+rPPG algorithm bank.
+
+Every algorithm is a projection: (..., n, 3) normalized, band-passed B, G, R segments
+-> (..., n) pulse signals. They plug into SpectralHeartRate / StreamingHeartRate /
+VitalsSessions through the `algorithm` name, so they share resampling, filtering,
+spectra and peak tracking and can be compared like-for-like (scripts/bench_rppg.py).
+"""
+from typing import Callable, Dict
+
+import numpy as np
+
+Projection = Callable[[np.ndarray], np.ndarray]
+
+
+def green_projection(seg: np.ndarray) -> np.ndarray:
+    """GREEN (Verkruysse 2008): the green channel alone."""
+    return seg[..., 1]
+
+
+def chrom_projection(seg: np.ndarray) -> np.ndarray:
+    """CHROM (de Haan & Jeanne 2013): chrominance signals with std-ratio tuning."""
+    b, g, r = seg[..., 0], seg[..., 1], seg[..., 2]
+    xs = 3 * r - 2 * g
+    ys = 1.5 * r + g - 1.5 * b
+    alpha = np.std(xs, axis=-1, keepdims=True) / (np.std(ys, axis=-1, keepdims=True) + 1e-9)
+    return xs - alpha * ys
+
+
+def pos_projection(seg: np.ndarray) -> np.ndarray:
+    """POS (plane-orthogonal-to-skin). seg: (..., n, 3) normalized B, G, R -> (..., n)."""
+    b, g, r = seg[..., 0], seg[..., 1], seg[..., 2]
+    s1 = g - b
+    s2 = g + b - 2 * r
+    alpha = np.std(s1, axis=-1, keepdims=True) / (np.std(s2, axis=-1, keepdims=True) + 1e-9)
+    return s1 + alpha * s2
+
+
+def make_pos_multiwindow(fs: float, win_s: float = 1.6) -> Projection:
+    """
+    POS as in Wang et al. 2017: alpha is tuned per short sub-window (win_s) and the
+    projected sub-windows are overlap-added, so the projection follows slow changes in
+    lighting / skin tone inside one analysis segment. All sub-windows at once via a
+    strided view; the overlap-add is one vectorized add per sub-window offset.
+    """
+    win = max(4, int(round(win_s * fs)))
+
+    def project(seg: np.ndarray) -> np.ndarray:
+        n = seg.shape[-2]
+        if n < win:
+            return pos_projection(seg)
+
+        # (..., n_win, 3, win) -> (..., n_win, win, 3)
+        w = np.lib.stride_tricks.sliding_window_view(seg, win, axis=-2).swapaxes(-1, -2)
+        h = pos_projection(w)                      # (..., n_win, win)
+        h = h - h.mean(axis=-1, keepdims=True)
+        n_win = h.shape[-2]
+
+        out = np.zeros(seg.shape[:-2] + (n,), dtype=np.float64)
+        for k in range(win):
+            out[..., k:k + n_win] += h[..., :, k]
+        return out
+
+    return project
+
+
+# name -> factory(fs) -> projection
+ALGORITHMS: Dict[str, Callable[[float], Projection]] = {
+    "pos": lambda fs: pos_projection,
+    "chrom": lambda fs: chrom_projection,
+    "green": lambda fs: green_projection,
+    "pos_mw": make_pos_multiwindow,
+}
+
+
+def get_projection(name: str, fs: float) -> Projection:
+    try:
+        return ALGORITHMS[name](fs)
+    except KeyError:
+        raise ValueError(f"Unknown rPPG algorithm '{name}'. Choose from: {', '.join(ALGORITHMS)}") from None
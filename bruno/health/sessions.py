@@ -0,0 +1,129 @@
+"""
+Per-person vitals sessions.
+
+Each person in view (keyed by YOLO track id or user id) gets their own ROI tracker,
+streaming estimator (ring buffer, filter state, spectra, peak tracker).
+feed() does the shared per-frame work once (integral image, tracking gray frame) and
+samples every tracked face's regions in a single vectorized lookup.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Hashable, List
+
+import numpy as np
+
+from bruno.health.heart_rate import StreamingHeartRate
+from bruno.health.roi import FaceBoxTracker, prepare_frame, region_rects, rect_means
+
+
+class VitalsSession:
+    """Everything the heart-rate pipeline keeps for one person."""
+
+    def __init__(self, key: Hashable, max_motion: float = 0.08, algorithm: str = "pos"):
+        self.key = key
+        self.max_motion = max_motion
+        self.tracker = FaceBoxTracker()
+        self.estimator = StreamingHeartRate(algorithm=algorithm)
+        self.created = time.time()
+        self.last_seen = self.created
+
+    # same surface as StreamingHeartRate so think_sync can take either
+    def latest(self, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        est = self.estimator.latest(now)
+        if est is not None:
+            est["key"] = self.key
+        return est
+
+    def progress(self) -> float:
+        return self.estimator.progress()
+
+
+class VitalsSessions:
+    """
+    LRU of VitalsSession. Sessions idle for idle_ttl_s, or beyond capacity, are dropped.
+
+    feed(frame, ts, faces):
+      faces = {key: bbox} on frames where the face detector ran (re-anchors trackers;
+              sessions missing from it lose their box),
+      faces = None on the frames in between (every live session is template-tracked).
+    """
+
+    def __init__(self, capacity: int = 4, idle_ttl_s: float = 30.0, algorithm: str = "pos"):
+        self.capacity = capacity
+        self.idle_ttl_s = idle_ttl_s
+        self.algorithm = algorithm
+        self._sessions: "OrderedDict[Hashable, VitalsSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def get(self, key: Hashable, create: bool = True) -> Optional[VitalsSession]:
+        with self._lock:
+            sess = self._sessions.get(key)
+            if sess is None:
+                if not create:
+                    return None
+                sess = VitalsSession(key, algorithm=self.algorithm)
+                self._sessions[key] = sess
+                self._evict_locked(time.time())
+            self._sessions.move_to_end(key)
+            return sess
+
+    def latest(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        sess = self.get(key, create=False)
+        return sess.latest() if sess else None
+
+    def _evict_locked(self, now: float):
+        for k in [k for k, s in self._sessions.items() if now - s.last_seen > self.idle_ttl_s]:
+            del self._sessions[k]
+        while len(self._sessions) > self.capacity:
+            self._sessions.popitem(last=False)
+
+    def feed(self, frame, ts: Optional[float] = None, faces: Optional[Dict[Hashable, Any]] = None) -> None:
+        ts = time.time() if ts is None else float(ts)
+
+        if faces is not None:
+            for key in faces:
+                self.get(key)
+
+        with self._lock:
+            self._evict_locked(ts)
+            sessions = list(self._sessions.values())
+
+        active = [s for s in sessions if (faces is not None and s.key in faces) or (faces is None and s.tracker.box is not None)]
+        if not active:
+            for s in sessions:
+                s.tracker.reset()
+            return
+
+        # ---------- one pass over the image for everybody ----------
+        fp = prepare_frame(frame)
+
+        boxes, tracked = [], []
+        for s in sessions:
+            if s not in active:
+                s.tracker.reset()
+                continue
+            box, motion = s.tracker.update(fp, faces.get(s.key) if faces is not None else None)
+            if box is None or motion > s.max_motion:
+                continue
+            boxes.append(box)
+            tracked.append(s)
+
+        if not tracked:
+            return
+
+        rects = region_rects(np.stack(boxes), fp.width, fp.height)  # (F, R, 4)
+        means, valid = rect_means(fp.integral, rects)               # (F, R, 3), (F, R)
+
+        for i, s in enumerate(tracked):
+            s.last_seen = ts
+            if valid[i].all():
+                s.estimator.push(means[i], ts)
@@ -0,0 +1,235 @@
+"""
+Sliding-window heart-rate spectrum for streaming rPPG.
+
+Pipeline per incoming camera sample (irregular timestamps):
+  linear resample onto a uniform grid -> normalize by a running mean -> causal band-pass
+  (cached SOS coefficients, filter state carried across calls) -> ring buffer
+Every hop_s:
+  project the last seg_s of RGB to a pulse signal -> Hann window -> rFFT of that one segment
+  -> running Welch average over the last n_avg segments -> peak tracker -> BPM + confidence
+
+Several skin regions (forehead, cheeks) run through the same arrays side by side; their
+spectra are combined with weights from each region's own peak-to-band power ratio, so a
+region that is shadowed or slides off the face stops dominating the estimate.
+
+Each update costs one short FFT plus O(new samples) filtering, so it can run several times
+a second on the camera thread.
+"""
+from functools import lru_cache
+from typing import Optional, Dict, Any, Callable
+
+import numpy as np
+from scipy.signal import butter, sosfilt
+
+from bruno.health.health_specialist import parabolic_interpolation
+from bruno.health.rppg import pos_projection
+
+
+@lru_cache(maxsize=16)
+def bandpass_sos(fs: float, low: float = 0.7, high: float = 3.0, order: int = 3) -> np.ndarray:
+    """Butterworth band-pass as second-order sections, designed once per sample rate."""
+    nyq = 0.5 * fs
+    return butter(order, [low / nyq, high / nyq], btype="band", output="sos")
+
+
+@lru_cache(maxsize=16)
+def _hann(n: int) -> np.ndarray:
+    return np.hanning(n)
+
+
+class SpectralHeartRate:
+    """
+    add(t, bgr) for each raw sample, update(t) to get a fresh estimate when one is due.
+    bgr is (3,) for a single region or (n_regions, 3).
+    projection maps (..., n, 3) normalized, band-passed BGR segments to (..., n) pulse signals.
+    """
+
+    def __init__(
+        self,
+        fs: float = 30.0,
+        n_regions: int = 1,
+        seg_s: float = 8.0,
+        hop_s: float = 0.25,
+        n_avg: int = 8,
+        nfft: int = 2048,
+        low_hz: float = 0.7,
+        high_hz: float = 3.0,
+        order: int = 3,
+        mean_tau_s: float = 1.5,
+        warmup_s: float = 1.0,
+        track_sigma_bpm: float = 12.0,
+        projection: Callable[[np.ndarray], np.ndarray] = pos_projection,
+    ):
+        self.fs = float(fs)
+        self.n_regions = n_regions
+        self.seg_len = int(round(seg_s * fs))
+        self.hop_s = hop_s
+        self.n_avg = n_avg
+        self.nfft = max(nfft, self.seg_len)
+        self.order = order
+        self.low_hz = low_hz
+        self.high_hz = high_hz
+        self.warmup_len = int(round(warmup_s * fs))
+        self.track_sigma_bpm = track_sigma_bpm
+        self.projection = projection
+
+        self._sos = bandpass_sos(self.fs, low_hz, high_hz, order)
+        self._mean_alpha = 1.0 - np.exp(-1.0 / (mean_tau_s * fs))
+
+        freqs = np.fft.rfftfreq(self.nfft, d=1.0 / self.fs)
+        self._band = (freqs >= low_hz) & (freqs <= high_hz)
+        self._band_freqs = freqs[self._band]
+
+        self.reset()
+
+    def reset(self):
+        self._prev_t: Optional[float] = None
+        self._prev_bgr: Optional[np.ndarray] = None
+        self._next_grid_t: Optional[float] = None
+        self._mean: Optional[np.ndarray] = None
+        self._zi: Optional[np.ndarray] = None
+
+        self._ring = np.zeros((self.seg_len, self.n_regions, 3), dtype=np.float64)
+        self._ring_head = 0
+        self._n_filtered = 0
+
+        n_bins = int(self._band.sum())
+        self._spectra = np.zeros((self.n_avg, self.n_regions, n_bins), dtype=np.float64)
+        self._spec_sum = np.zeros((self.n_regions, n_bins), dtype=np.float64)
+        self._spec_head = 0
+        self._n_spectra = 0
+
+        self._last_update_t = -np.inf
+        self._track_bpm: Optional[float] = None
+        self.region_weights = np.full(self.n_regions, 1.0 / self.n_regions)
+
+    # ---------------- streaming input ----------------
+
+    @property
+    def ready(self) -> bool:
+        return self._n_filtered >= self.warmup_len + self.seg_len
+
+    def progress(self) -> float:
+        need = self.warmup_len + self.seg_len
+        return float(min(1.0, self._n_filtered / need))
+
+    def add(self, t: float, bgr) -> None:
+        bgr = np.asarray(bgr, dtype=np.float64).reshape(self.n_regions, 3)
+        if self._prev_t is None:
+            self._prev_t, self._prev_bgr = t, bgr
+            self._next_grid_t = t
+            self._mean = bgr.copy()
+            # normalized signal starts at 0, so a zero filter state has no step transient
+            self._zi = np.zeros((self._sos.shape[0], 2, self.n_regions, 3), dtype=np.float64)
+            return
+
+        if t <= self._prev_t:
+            return
+
+        # uniform grid points in (prev_t, t], linearly interpolated
+        n = int(np.floor((t - self._next_grid_t) * self.fs)) + 1
+        if n > 0:
+            grid = self._next_grid_t + np.arange(n) / self.fs
+            w = ((grid - self._prev_t) / (t - self._prev_t))[:, None, None]
+            samples = self._prev_bgr[None] * (1.0 - w) + bgr[None] * w
+            self._next_grid_t = grid[-1] + 1.0 / self.fs
+            self._push_uniform(samples)
+
+        self._prev_t, self._prev_bgr = t, bgr
+
+    def _push_uniform(self, samples: np.ndarray) -> None:
+        # running-mean normalization (C / mean - 1), then causal band-pass with carried state
+        norm = np.empty_like(samples)
+        a = self._mean_alpha
+        mean = self._mean
+        for i in range(len(samples)):
+            mean = mean + a * (samples[i] - mean)
+            norm[i] = samples[i] / (mean + 1e-9) - 1.0
+        self._mean = mean
+
+        filtered, self._zi = sosfilt(self._sos, norm, axis=0, zi=self._zi)
+
+        n = len(filtered)
+        if n >= self.seg_len:
+            self._ring[:] = filtered[-self.seg_len:]
+            self._ring_head = 0
+        else:
+            end = self._ring_head + n
+            if end <= self.seg_len:
+                self._ring[self._ring_head:end] = filtered
+            else:
+                k = self.seg_len - self._ring_head
+                self._ring[self._ring_head:] = filtered[:k]
+                self._ring[:n - k] = filtered[k:]
+            self._ring_head = end % self.seg_len
+        self._n_filtered += n
+
+    # ---------------- spectral update ----------------
+
+    def update(self, t: float) -> Optional[Dict[str, Any]]:
+        """Estimate if a hop has elapsed and the window is full, else None."""
+        if not self.ready or t - self._last_update_t < self.hop_s:
+            return None
+        self._last_update_t = t
+
+        seg = np.roll(self._ring, -self._ring_head, axis=0).transpose(1, 0, 2)  # (R, n, 3)
+        pulse = self.projection(seg)
+        pulse = pulse - pulse.mean(axis=-1, keepdims=True)
+        spec = np.abs(np.fft.rfft(pulse * _hann(pulse.shape[-1]), n=self.nfft, axis=-1)) ** 2
+        spec = spec[:, self._band]
+
+        # running Welch average: replace the oldest segment spectrum
+        self._spec_sum += spec - self._spectra[self._spec_head]
+        self._spectra[self._spec_head] = spec
+        self._spec_head = (self._spec_head + 1) % self.n_avg
+        self._n_spectra = min(self._n_spectra + 1, self.n_avg)
+        avg = self._spec_sum / self._n_spectra
+
+        return self._track(self._combine(avg))
+
+    def _combine(self, avg: np.ndarray) -> np.ndarray:
+        """Quality-weighted sum of per-region spectra (each normalized to unit band power)."""
+        if self.n_regions == 1:
+            return avg[0]
+        total = avg.sum(axis=1, keepdims=True) + 1e-12
+        norm = avg / total
+        # peak-to-band ratio per region: a clean pulse concentrates power in a few bins
+        quality = norm.max(axis=1)
+        w = quality ** 2
+        self.region_weights = w / (w.sum() + 1e-12)
+        return (self.region_weights[:, None] * norm).sum(axis=0)
+
+    def _track(self, power: np.ndarray) -> Optional[Dict[str, Any]]:
+        total = power.sum()
+        if total <= 0:
+            return None
+
+        bpm_axis = self._band_freqs * 60.0
+        if self._track_bpm is None:
+            weighted = power
+        else:
+            # prefer peaks near the tracked rate; the floor lets a persistent new peak take over
+            prior = np.exp(-0.5 * ((bpm_axis - self._track_bpm) / self.track_sigma_bpm) ** 2)
+            weighted = power * (0.25 + 0.75 * prior)
+
+        idx = int(np.argmax(weighted))
+        refined = parabolic_interpolation(power, idx)
+        bpm = float(np.interp(refined, np.arange(len(bpm_axis)), bpm_axis))
+
+        # fraction of band power within +-6 BPM of the peak -> 0..1 quality
+        near = np.abs(bpm_axis - bpm) <= 6.0
+        snr = float(power[near].sum() / total)
+        confidence = float(np.clip((snr - 0.1) / 0.5, 0.0, 0.95))
+
+        if self._track_bpm is None:
+            self._track_bpm = bpm
+        else:
+            self._track_bpm = 0.7 * self._track_bpm + 0.3 * bpm
+
+        return {
+            "bpm": self._track_bpm,
+            "raw_bpm": bpm,
+            "confidence": confidence,
+            "snr": snr,
+            "segments": self._n_spectra,
+        }
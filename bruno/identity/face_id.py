@@ -4,7 +4,8 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List
 
 import numpy as np
-from insightface.app import FaceAnalysis
+
+from bruno.utils.model_registry import insightface_handle
 
 
 @dataclass
@@ -26,13 +27,17 @@ class FaceID:
         self.threshold = threshold
         os.makedirs(self.users_root, exist_ok=True)
 
-        self.app = FaceAnalysis(name="buffalo_l", providers=["CPUExecutionProvider"])
-        self.app.prepare(ctx_id=0, det_size=(640, 640))
+        # CPU-only, as before; shared with other CPU FaceAnalysis users through the model registry
+        self._app = insightface_handle("buffalo_l", det_size=(640, 640), providers=["CPUExecutionProvider"])
 
         # gallery: user_id -> embeddings (N, 512)
         self.gallery: Dict[str, np.ndarray] = {}
         self._load_gallery()
 
+    @property
+    def app(self):
+        return self._app.get()
+
     def _user_identity_dir(self, user_id: str) -> str:
         return os.path.join(self.users_root, user_id, "identity")
 
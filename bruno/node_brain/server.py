@@ -1,9 +1,17 @@
+import json
 import time
-from fastapi import FastAPI
+from typing import List
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import TypeAdapter, ValidationError
 from bruno.bus.messages import PerceptionEvent, BrainCommand
+from bruno.bus import wire
+from bruno.bus.delta import StreamDecoders
 
 app = FastAPI()
 
+_event_list = TypeAdapter(List[PerceptionEvent])
+_streams = StreamDecoders()
+
 def _scene_phrase(evt: PerceptionEvent) -> str:
     counts = (evt.scene_summary or {}).get("counts", {})
     objs = list(counts.keys())[:6]
@@ -104,6 +112,49 @@ def brain_reply(evt: PerceptionEvent) -> BrainCommand:
 def handle_event(evt: PerceptionEvent):
     return brain_reply(evt)
 
+@app.post("/events")
+async def handle_events(request: Request):
+    # batched uplink (bruno.node_vision.uplink): one reply per event, in order.
+    # Body and reply are JSON or msgpack (bruno.bus.wire) per Content-Type / Accept.
+    body = await request.body()
+    if wire.wants_msgpack(request.headers.get("content-type")):
+        if not wire.msgpack_available():
+            raise HTTPException(status_code=415, detail="msgpack not installed on this node")
+        try:
+            evts = wire.decode_events(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        try:
+            evts = _event_list.validate_json(body)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors())
+
+    cmds = [brain_reply(e) for e in evts]
+    if wire.wants_msgpack(request.headers.get("accept")) and wire.msgpack_available():
+        return Response(content=wire.encode_commands(cmds), media_type=wire.MSGPACK)
+    return {"commands": [c.model_dump() for c in cmds]}
+
+@app.post("/stream")
+async def handle_stream(request: Request):
+    # delta-encoded uplink (bruno.bus.delta): keyframes + deltas per device, JSON or msgpack.
+    # Devices that lost sync (gap in seq) are listed in "resync" and should send a keyframe.
+    body = await request.body()
+    msgpack_body = wire.wants_msgpack(request.headers.get("content-type"))
+    if msgpack_body and not wire.msgpack_available():
+        raise HTTPException(status_code=415, detail="msgpack not installed on this node")
+    try:
+        msgs = wire.unpack(body) if msgpack_body else json.loads(body)
+        results = [_streams.apply(m) for m in msgs]
+    except (ValueError, KeyError, TypeError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"bad stream batch: {e}")
+
+    cmds = [brain_reply(evt) for evt, _ in results if evt is not None]
+    resync = sorted({m["dev"] for m, (_, need_key) in zip(msgs, results) if need_key})
+    if wire.wants_msgpack(request.headers.get("accept")) and wire.msgpack_available():
+        return Response(content=wire.encode_commands(cmds, resync=resync), media_type=wire.MSGPACK)
+    return {"commands": [c.model_dump() for c in cmds], "resync": resync}
+
 @app.get("/health")
 def healthcheck():
     return {"ok": True, "ts": time.strftime("%Y-%m-%dT%H-%M-%S")}
@@ -1,32 +1,20 @@
-import torch
-from transformers import AutoImageProcessor, AutoModelForImageClassification
-from PIL import Image
-import numpy as np
+from bruno.brain.vision_specialist import acne_model, ACNE_LABELS
 
 MODEL_NAME = "imfarzanansari/skintelligent-acne"
 
 class AcneClassifier:
+    """
+    Thin wrapper over the shared acne model (bruno.brain.vision_specialist.acne_model),
+    so the node and the brain never hold two copies. ONNX when exported
+    (scripts/export_acne_onnx.py), else PyTorch. predict() takes RGB frames.
+    """
+
     def __init__(self):
-        self.processor = AutoImageProcessor.from_pretrained(MODEL_NAME)
-        self.model = AutoModelForImageClassification.from_pretrained(MODEL_NAME)
-        self.model.eval()
+        self.model = acne_model
+        self.model.handle.get()
 
-        self.labels = [
-            "Clear Skin",
-            "Occasional Spots",
-            "Mild Acne",
-            "Moderate Acne",
-            "Severe Acne",
-            "Very Severe Acne"
-        ]
+        self.labels = [ACNE_LABELS[i] for i in range(len(ACNE_LABELS))]
 
     def predict(self, frame):
-        image = Image.fromarray(frame)
-        inputs = self.processor(images=image, return_tensors="pt")
-
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            predicted_class = torch.argmax(logits, dim=-1).item()
-
-        return self.labels[predicted_class]
\ No newline at end of file
+        predicted_class, _ = self.model.predict(frame, bgr=False)
+        return self.labels[predicted_class]
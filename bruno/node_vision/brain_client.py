@@ -2,6 +2,8 @@ import requests
 from bruno.bus.messages import PerceptionEvent, BrainCommand
 
 def send_event(brain_url: str, evt: PerceptionEvent) -> BrainCommand:
+    # Blocking, one event per request. For a stream of events use
+    # bruno.node_vision.uplink.Uplink (background, batched, spooled to disk when down).
     r = requests.post(f"{brain_url}/event", json=evt.model_dump(), timeout=8)
     r.raise_for_status()
     return BrainCommand(**r.json())
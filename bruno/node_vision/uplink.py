@@ -0,0 +1,337 @@
+"""
+Background event uplink from node_vision to node_brain.
+
+Uplink.send(evt) never blocks: events go into a bounded in-memory queue (oldest dropped
+when full) and one worker thread posts them in batches to POST /events over a single
+keep-alive session. When the brain node is down (connection error, timeout, 5xx),
+failed batches are written to spool_dir as JSON lines and the worker retries with
+exponential backoff; once the node answers again the spool is replayed, oldest first,
+before live events. Delivery is at least once: a batch whose reply was lost may arrive
+twice. A batch the node rejects (any other 4xx) or a spool file that does not parse
+would fail the same way forever: it is counted as dropped and moved aside to
+spool_dir/quarantine-*.jsonl instead of being retried.
+
+Batches go as JSON. wire_format="msgpack" (bruno.bus.wire, if installed) makes them
+smaller but costs the brain node more to decode than pydantic-core's one-pass JSON
+validation (scripts/bench_wire.py), so it only pays on a slow link; the uplink falls
+back to JSON for good if the brain node answers 415.
+
+With stream=True events are delta-encoded (bruno.bus.delta) and posted to /stream:
+keyframes plus per-event changes. The queue and the spool hold full events; they are
+encoded just before each post, and a batch after a failed post, each replayed spool
+file and a batch after a resync request from the brain node start with a keyframe, so
+no batch depends on one that may never have arrived.
+
+    uplink = Uplink("http://brain:8000", spool_dir="data/uplink_spool", on_reply=handle_cmd)
+    uplink.send(PerceptionEvent(...))
+    uplink.stats()  # queue depth, spool size, delivery latency, failures
+"""
+import glob
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+from bruno.bus.messages import PerceptionEvent, BrainCommand
+from bruno.bus import wire
+from bruno.bus.delta import DeltaEncoder
+
+
+class Uplink:
+    def __init__(
+        self,
+        brain_url: str,
+        max_queue: int = 1000,
+        batch_max: int = 32,
+        batch_wait_s: float = 0.05,
+        spool_dir: Optional[str] = None,
+        timeout: Tuple[float, float] = (2.0, 8.0),
+        backoff_s: Tuple[float, float] = (0.5, 30.0),
+        on_reply: Optional[Callable[[BrainCommand], None]] = None,
+        wire_format: str = "json",
+        stream: bool = False,
+    ):
+        self.url = brain_url.rstrip("/") + ("/stream" if stream else "/events")
+        self._delta = DeltaEncoder() if stream else None
+        self.batch_max = batch_max
+        self.batch_wait_s = batch_wait_s
+        self.spool_dir = spool_dir
+        self.timeout = timeout
+        self.backoff_min, self.backoff_max = backoff_s
+        self.on_reply = on_reply
+        self.msgpack = wire_format == "msgpack" and wire.msgpack_available()
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+
+        self._queue: Deque[Tuple[float, Dict[str, Any]]] = deque(maxlen=max_queue)
+        self._cond = threading.Condition()
+        self._stop = False
+        self._closing = threading.Event()  # interrupts a backoff sleep
+        self._session = requests.Session()
+        self._metrics = {
+            "sent": 0, "batches": 0, "failures": 0, "dropped": 0, "spooled": 0, "replayed": 0, "quarantined": 0,
+            "latency_ms_avg": None, "latency_ms_max": 0.0, "connected": False,
+        }
+        for path in self._spool_files():  # left over from a previous run
+            self._metrics["spooled"] += self._count_lines(path)
+        self._thread = threading.Thread(target=self._run, name="bruno-uplink", daemon=True)
+        self._thread.start()
+
+    # ---------- producer side ----------
+
+    def send(self, evt: PerceptionEvent) -> None:
+        """Queue evt for delivery; returns immediately."""
+        msg = evt.model_dump(mode="json")
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self._metrics["dropped"] += 1  # deque drops the oldest
+            self._queue.append((time.time(), msg))
+            self._cond.notify()
+
+    def close(self, flush_s: float = 2.0):
+        """Stop the worker; whatever is still queued after flush_s is spooled (if enabled)."""
+        deadline = time.time() + flush_s
+        while self._queue and time.time() < deadline and self._metrics["connected"]:
+            time.sleep(0.02)
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._closing.set()
+        self._thread.join(timeout=max(self.timeout) + 1.0)
+        with self._cond:
+            leftover = list(self._queue)
+            self._queue.clear()
+        if leftover and self.spool_dir:
+            try:
+                self._spool(leftover)
+            except OSError as e:
+                print(f"Uplink: could not spool {len(leftover)} events on close:", e)
+                with self._cond:
+                    self._metrics["dropped"] += len(leftover)
+        self._session.close()
+
+    # ---------- worker ----------
+
+    def _next_batch(self) -> List[Tuple[float, Dict[str, Any]]]:
+        with self._cond:
+            while not self._queue and not self._stop:
+                self._cond.wait()
+            if self._stop:
+                return []
+        # give a burst a moment to fill the batch
+        if len(self._queue) < self.batch_max:
+            time.sleep(self.batch_wait_s)
+        with self._cond:
+            n = min(self.batch_max, len(self._queue))
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _post(self, batch: List[Tuple[float, Dict[str, Any]]], keyframe: bool = False) -> List[Dict[str, Any]]:
+        evts = [evt for _, evt in batch]
+        if self._delta is not None:
+            with self._cond:
+                if keyframe:
+                    self._delta.force_keyframe()
+                evts = [self._delta.encode(evt) for evt in evts]
+        if self.msgpack:
+            headers = {"Content-Type": wire.MSGPACK, "Accept": wire.MSGPACK}
+            data = wire.pack(evts) if self._delta is not None else wire.encode_events(evts)
+            r = self._session.post(self.url, data=data, headers=headers, timeout=self.timeout)
+            if r.status_code == 415:
+                self.msgpack = False  # brain node without msgpack: JSON from now on
+        if not self.msgpack:
+            r = self._session.post(self.url, json=evts, timeout=self.timeout)
+        r.raise_for_status()
+        now = time.time()
+        with self._cond:
+            m = self._metrics
+            m["sent"] += len(batch)
+            m["batches"] += 1
+            m["connected"] = True
+            for t_enq, _ in batch:
+                ms = (now - t_enq) * 1000.0
+                m["latency_ms_avg"] = ms if m["latency_ms_avg"] is None else 0.9 * m["latency_ms_avg"] + 0.1 * ms
+                m["latency_ms_max"] = max(m["latency_ms_max"], ms)
+        try:
+            reply = wire.unpack(r.content) if wire.wants_msgpack(r.headers.get("Content-Type")) else r.json()
+        except ValueError as e:
+            reply = None
+            print("Uplink: unreadable reply:", e)
+        if not isinstance(reply, dict):
+            return []  # delivered all the same; only the commands are lost
+        if reply.get("resync") and self._delta is not None:
+            with self._cond:
+                self._delta.force_keyframe()
+        return reply.get("commands", [])
+
+    def _write(self, batch: List[Tuple[float, Dict[str, Any]]], prefix: str):
+        """Raises OSError when the spool can't be written (disk full, directory gone...)."""
+        os.makedirs(self.spool_dir, exist_ok=True)  # recreated if it was removed meanwhile
+        path = os.path.join(self.spool_dir, f"{prefix}-{time.time_ns()}.jsonl")
+        with open(path + ".tmp", "w") as f:
+            for t_enq, evt in batch:
+                f.write(json.dumps({"t": t_enq, "event": evt}) + "\n")
+        os.replace(path + ".tmp", path)
+
+    def _spool(self, batch: List[Tuple[float, Dict[str, Any]]]):
+        if not self.spool_dir:
+            return
+        self._write(batch, "spool")
+        with self._cond:
+            self._metrics["spooled"] += len(batch)
+
+    def _spool_files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.spool_dir, "spool-*.jsonl"))) if self.spool_dir else []
+
+    @staticmethod
+    def _count_lines(path: str) -> int:
+        with open(path, errors="replace") as f:
+            return sum(1 for line in f if line.strip())
+
+    @staticmethod
+    def _retryable(e: Exception) -> bool:
+        """Worth retrying later: the node is unreachable or failing, not rejecting the batch."""
+        if isinstance(e, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)):
+            return True
+        resp = getattr(e, "response", None)
+        return isinstance(e, requests.HTTPError) and resp is not None and resp.status_code >= 500
+
+    def _rejected(self, batch: List[Tuple[float, Dict[str, Any]]], reason: Exception):
+        """Drop a batch the brain node will never accept, keeping a copy for inspection."""
+        print(f"Uplink: dropping {len(batch)} events: {reason}")
+        if self.spool_dir:
+            try:
+                self._write(batch, "quarantine")
+            except OSError as e:
+                print("Uplink: could not keep a quarantine copy:", e)
+        with self._cond:
+            self._metrics["dropped"] += len(batch)
+            self._metrics["quarantined"] += len(batch)
+            if self._delta is not None:
+                self._delta.force_keyframe()  # the brain node may hold part of the rejected batch
+
+    def _quarantine_file(self, path: str, reason: Exception):
+        n = self._count_lines(path)
+        print(f"Uplink: quarantining {os.path.basename(path)} ({n} events): {reason}")
+        try:
+            os.replace(path, os.path.join(self.spool_dir, "quarantine-" + os.path.basename(path)[len("spool-"):]))
+        except OSError as e:
+            print("Uplink: could not keep a quarantine copy:", e)
+            os.remove(path)  # must not be replayed again either way
+        with self._cond:
+            self._metrics["spooled"] -= n
+            self._metrics["dropped"] += n
+            self._metrics["quarantined"] += n
+
+    def _replay_spool(self):
+        """Deliver spooled batches oldest first; stops (raising) at the first retryable failure."""
+        for path in self._spool_files():
+            try:
+                with open(path) as f:
+                    batch = [(rec["t"], rec["event"]) for rec in map(json.loads, f) if rec]
+            except (ValueError, KeyError, TypeError) as e:
+                self._quarantine_file(path, e)
+                continue
+            if batch:
+                try:
+                    # each file may follow a gap (or a restart of either side): start with a keyframe
+                    self._post(batch, keyframe=True)  # replies to stale events are not delivered to on_reply
+                except requests.RequestException as e:
+                    if self._retryable(e):
+                        raise
+                    self._quarantine_file(path, e)
+                    continue
+                with self._cond:
+                    self._metrics["replayed"] += len(batch)
+                    self._metrics["spooled"] -= len(batch)
+            os.remove(path)
+
+    def _failed(self, batch, backoff: float) -> float:
+        with self._cond:
+            self._metrics["failures"] += 1
+            self._metrics["connected"] = False
+            if self._delta is not None:
+                self._delta.force_keyframe()  # what was encoded for the failed post may never have arrived
+        if self.spool_dir:
+            # brain is down: move everything waiting to disk so the queue never overflows
+            with self._cond:
+                batch = (batch or []) + list(self._queue)
+                self._queue.clear()
+            if batch:
+                try:
+                    self._spool(batch)
+                except OSError as e:
+                    print(f"Uplink: spooling {len(batch)} events failed, keeping them in memory:", e)
+                    self._requeue(batch)
+        elif batch:
+            self._requeue(batch)
+        self._closing.wait(timeout=backoff * random.uniform(0.8, 1.2))
+        return min(self.backoff_max, backoff * 2)
+
+    def _requeue(self, batch: List[Tuple[float, Dict[str, Any]]]):
+        """No disk: put batch back at the front, still bounded by max_queue (oldest lost first)."""
+        with self._cond:
+            room = self._queue.maxlen - len(self._queue)
+            keep = batch[-room:] if room > 0 else []
+            self._metrics["dropped"] += len(batch) - len(keep)
+            self._queue.extendleft(reversed(keep))
+
+    def _run(self):
+        backoff = self.backoff_min
+        pending = bool(self._spool_files())
+        while not self._stop:
+            try:
+                pending, backoff = self._step(pending, backoff)
+            except Exception as e:  # the worker must outlive any one bad batch or disk error
+                print("Uplink worker error:", e)
+                with self._cond:
+                    self._metrics["failures"] += 1
+                pending = bool(self._spool_files())
+                self._closing.wait(timeout=backoff)
+                backoff = min(self.backoff_max, backoff * 2)
+
+    def _step(self, pending: bool, backoff: float) -> Tuple[bool, float]:
+        """One round of the worker loop: replay the spool or post one live batch."""
+        if pending:
+            try:
+                self._replay_spool()
+                return False, self.backoff_min
+            except requests.RequestException:
+                return True, self._failed(None, backoff)
+
+        batch = self._next_batch()
+        if not batch:
+            return pending, backoff
+        try:
+            commands = self._post(batch)
+        except requests.RequestException as e:
+            if not self._retryable(e):
+                self._rejected(batch, e)
+                return pending, backoff
+            return bool(self.spool_dir), self._failed(batch, backoff)
+        except Exception as e:  # e.g. an event that can't be encoded: it never will be
+            self._rejected(batch, e)
+            return pending, backoff
+
+        if self.on_reply is not None:
+            for cmd in commands:
+                try:
+                    self.on_reply(BrainCommand(**cmd))
+                except Exception as e:
+                    print("Uplink on_reply error:", e)
+        return pending, self.backoff_min
+
+    # ---------- metrics ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out = dict(self._metrics)
+            out["queued"] = len(self._queue)
+        if out["latency_ms_avg"] is not None:
+            out["latency_ms_avg"] = round(out["latency_ms_avg"], 1)
+        out["latency_ms_max"] = round(out["latency_ms_max"], 1)
+        return out
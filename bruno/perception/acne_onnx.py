@@ -0,0 +1,154 @@
+"""
+ONNX Runtime path for the acne (skin) classifier.
+
+scripts/export_acne_onnx.py exports imfarzanansari/skintelligent-acne to
+bruno/models/acne.onnx (and acne_int8.onnx, dynamically quantized) together with the
+Hugging Face image processor settings (acne_preprocess.json). At runtime only numpy,
+OpenCV and onnxruntime are needed: the processor's resize / crop / rescale / normalize
+steps are reimplemented below, so torch, transformers and PIL never load.
+"""
+import json
+import os
+from typing import Optional, Tuple, Dict, Any
+
+import cv2
+import numpy as np
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+ONNX_FP32 = os.path.join(MODELS_DIR, "acne.onnx")
+ONNX_INT8 = os.path.join(MODELS_DIR, "acne_int8.onnx")
+PREPROCESS_JSON = os.path.join(MODELS_DIR, "acne_preprocess.json")
+
+# PIL resample ids used in HF processor configs -> closest OpenCV interpolation
+_RESAMPLE = {0: cv2.INTER_NEAREST, 1: cv2.INTER_LANCZOS4, 2: cv2.INTER_LINEAR, 3: cv2.INTER_CUBIC, 4: cv2.INTER_LINEAR, 5: cv2.INTER_CUBIC}
+
+# HF defaults when the saved config leaves something out (ViT image processor)
+DEFAULT_PREPROCESS = {
+    "do_resize": True,
+    "size": {"height": 224, "width": 224},
+    "resample": 2,
+    "do_center_crop": False,
+    "do_rescale": True,
+    "rescale_factor": 1 / 255,
+    "do_normalize": True,
+    "image_mean": [0.5, 0.5, 0.5],
+    "image_std": [0.5, 0.5, 0.5],
+}
+
+
+def default_model_path() -> Optional[str]:
+    """BRUNO_ACNE_ONNX if set, else the int8 export, else the fp32 export, else None."""
+    env = os.environ.get("BRUNO_ACNE_ONNX")
+    if env:
+        return env if os.path.exists(env) else None
+    for p in (ONNX_INT8, ONNX_FP32):
+        if os.path.exists(p):
+            return p
+    return None
+
+
+def load_preprocess_config(path: str = PREPROCESS_JSON) -> Dict[str, Any]:
+    cfg = dict(DEFAULT_PREPROCESS)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            cfg.update(json.load(f))
+    return cfg
+
+
+def _resize(img: np.ndarray, w: int, h: int, resample: int) -> np.ndarray:
+    ih, iw = img.shape[:2]
+    if (iw, ih) == (w, h):
+        return img
+    # PIL antialiases when shrinking; INTER_AREA is OpenCV's equivalent
+    interp = cv2.INTER_AREA if (w < iw and h < ih) else _RESAMPLE.get(resample, cv2.INTER_LINEAR)
+    return cv2.resize(img, (w, h), interpolation=interp)
+
+
+def _shortest_edge_size(ih: int, iw: int, shortest: int) -> Tuple[int, int]:
+    if ih < iw:
+        return shortest, int(round(shortest * iw / ih))
+    return int(round(shortest * ih / iw)), shortest
+
+
+def _center_crop(img: np.ndarray, ch: int, cw: int) -> np.ndarray:
+    ih, iw = img.shape[:2]
+    top = max(0, (ih - ch) // 2)
+    left = max(0, (iw - cw) // 2)
+    return img[top:top + ch, left:left + cw]
+
+
+def preprocess(image: np.ndarray, cfg: Dict[str, Any], bgr: bool = True) -> np.ndarray:
+    """
+    HxWx3 uint8 image -> (1, 3, H, W) float32 pixel_values, matching the HF image
+    processor described by cfg (size as height/width or shortest_edge, optional
+    crop_pct / center crop, rescale, normalize).
+    """
+    img = cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if bgr else image
+    resample = cfg.get("resample", 2)
+
+    if cfg.get("do_resize", True):
+        size = cfg["size"]
+        if "height" in size and "width" in size:
+            img = _resize(img, size["width"], size["height"], resample)
+        elif "shortest_edge" in size:
+            shortest = size["shortest_edge"]
+            crop_pct = cfg.get("crop_pct")
+            if crop_pct and shortest < 384:
+                # ConvNeXt style: resize to shortest / crop_pct, then crop to shortest
+                h, w = _shortest_edge_size(*img.shape[:2], int(shortest / crop_pct))
+                img = _center_crop(_resize(img, w, h, resample), shortest, shortest)
+            elif crop_pct:
+                img = _resize(img, shortest, shortest, resample)
+            else:
+                h, w = _shortest_edge_size(*img.shape[:2], shortest)
+                img = _resize(img, w, h, resample)
+
+    if cfg.get("do_center_crop"):
+        crop = cfg.get("crop_size") or {}
+        img = _center_crop(img, crop.get("height", 224), crop.get("width", 224))
+
+    x = img.astype(np.float32)
+    if cfg.get("do_rescale", True):
+        x *= np.float32(cfg.get("rescale_factor", 1 / 255))
+    if cfg.get("do_normalize", True):
+        mean = np.asarray(cfg.get("image_mean", [0.5, 0.5, 0.5]), dtype=np.float32)
+        std = np.asarray(cfg.get("image_std", [0.5, 0.5, 0.5]), dtype=np.float32)
+        x = (x - mean) / std
+    return np.ascontiguousarray(x.transpose(2, 0, 1)[None])
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    z = logits - logits.max(axis=-1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+class AcneOnnx:
+    """
+    onnxruntime session + numpy preprocessing.
+    predict(image) -> (class_id, confidence, probs)
+    """
+
+    def __init__(self, model_path: Optional[str] = None, preprocess_path: str = PREPROCESS_JSON, threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        self.model_path = model_path or default_model_path()
+        if not self.model_path:
+            raise FileNotFoundError("No acne ONNX model; run scripts/export_acne_onnx.py")
+        self.cfg = load_preprocess_config(preprocess_path)
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(self.model_path, opts, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def logits(self, image: np.ndarray, bgr: bool = True) -> np.ndarray:
+        x = preprocess(image, self.cfg, bgr=bgr)
+        return self.session.run(None, {self.input_name: x})[0]
+
+    def predict(self, image: np.ndarray, bgr: bool = True) -> Tuple[int, float, np.ndarray]:
+        probs = softmax(self.logits(image, bgr=bgr))[0]
+        class_id = int(np.argmax(probs))
+        return class_id, float(probs[class_id]), probs
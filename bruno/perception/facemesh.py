@@ -1,40 +1,81 @@
 import time
+import threading
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Sequence
 
 import cv2
+import numpy as np
 import mediapipe as mp
 
+# Face Landmarker returns 478 points (468 mesh + 10 iris); symmetry only uses the mesh.
+NUM_LANDMARKS = 468
+
 
 @dataclass
 class FaceMeshResult:
     faces: List[List[Tuple[int, int]]]  # faces -> list of (x,y) points in pixels
+    landmarks: Optional[np.ndarray] = None  # (F, 468, 3) float32, x/y in pixels, z in model units
+
+
+def _landmarks_to_array(face_landmarks, w: int, h: int) -> np.ndarray:
+    """One face's landmark list -> (468, 3) float32 with x/y scaled to pixels."""
+    arr = np.array([(lm.x, lm.y, lm.z) for lm in face_landmarks[:NUM_LANDMARKS]], dtype=np.float32)
+    arr[:, 0] *= w
+    arr[:, 1] *= h
+    return arr
 
 
 class FaceMeshAnalyzer:
     """
     MediaPipe Tasks Face Landmarker wrapper.
     Works on macOS where mediapipe.solutions may not exist.
+
+    mode:
+      "live_stream" - async, analyze_bgr_frame returns the latest finished result (may lag a frame)
+      "video"       - synchronous, results belong to the submitted frame (monotonic timestamps)
+      "image"       - synchronous, every frame is independent (e.g. crops from different places)
     """
 
-    def __init__(self, model_path: str = "bruno/models/face_landmarker.task", num_faces: int = 1):
+    def __init__(
+        self,
+        model_path: str = "bruno/models/face_landmarker.task",
+        num_faces: int = 1,
+        mode: str = "live_stream",
+    ):
         BaseOptions = mp.tasks.BaseOptions
         VisionRunningMode = mp.tasks.vision.RunningMode
         FaceLandmarker = mp.tasks.vision.FaceLandmarker
         FaceLandmarkerOptions = mp.tasks.vision.FaceLandmarkerOptions
 
-        self._latest = None
+        if mode not in ("live_stream", "video", "image"):
+            raise ValueError(f"Unknown FaceMesh mode: {mode}")
 
-        def _callback(result, output_image, timestamp_ms: int):
-            self._latest = result
+        self.mode = mode
+        self.num_faces = num_faces
+        self._latest = None
+        self._latest_lock = threading.Lock()
+        self._last_ts_ms = -1
+
+        kwargs = {}
+        if mode == "live_stream":
+            def _callback(result, output_image, timestamp_ms: int):
+                with self._latest_lock:
+                    self._latest = result
+
+            running_mode = VisionRunningMode.LIVE_STREAM
+            kwargs["result_callback"] = _callback
+        elif mode == "video":
+            running_mode = VisionRunningMode.VIDEO
+        else:
+            running_mode = VisionRunningMode.IMAGE
 
         options = FaceLandmarkerOptions(
             base_options=BaseOptions(model_asset_path=model_path),
-            running_mode=VisionRunningMode.LIVE_STREAM,
+            running_mode=running_mode,
             num_faces=num_faces,
             output_face_blendshapes=False,
             output_facial_transformation_matrixes=False,
-            result_callback=_callback,
+            **kwargs,
         )
 
         self._landmarker = FaceLandmarker.create_from_options(options)
@@ -45,22 +86,83 @@ class FaceMeshAnalyzer:
         except Exception:
             pass
 
-    def analyze_bgr_frame(self, frame_bgr) -> Optional[FaceMeshResult]:
+    def _next_ts_ms(self, ts_ms: Optional[int] = None) -> int:
+        # MediaPipe rejects non-increasing timestamps in video / live_stream mode
+        if ts_ms is None:
+            ts_ms = time.time_ns() // 1_000_000
+        ts_ms = max(int(ts_ms), self._last_ts_ms + 1)
+        self._last_ts_ms = ts_ms
+        return ts_ms
+
+    def _detect_sync(self, frame_bgr, ts_ms: Optional[int] = None):
         rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-        ts_ms = time.time_ns() // 1_000_000
-        self._landmarker.detect_async(mp_image, ts_ms)
-
-        if not self._latest or not getattr(self._latest, "face_landmarks", None):
+        if self.mode == "video":
+            return self._landmarker.detect_for_video(mp_image, self._next_ts_ms(ts_ms))
+        return self._landmarker.detect(mp_image)
+
+    def landmarks_bgr_frame(self, frame_bgr, ts_ms: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Synchronous landmarks for this exact frame: (F, 468, 3) float32 in pixels, or None if no face.
+        Not available in live_stream mode (results there are not tied to the submitted frame).
+        """
+        if self.mode == "live_stream":
+            raise RuntimeError("landmarks_bgr_frame needs mode='video' or mode='image'")
+
+        res = self._detect_sync(frame_bgr, ts_ms)
+        if not res or not getattr(res, "face_landmarks", None):
             return None
 
         h, w = frame_bgr.shape[:2]
-        faces_px: List[List[Tuple[int, int]]] = []
-        for face in self._latest.face_landmarks:
-            pts = [(int(lm.x * w), int(lm.y * h)) for lm in face]
-            faces_px.append(pts)
+        return np.stack([_landmarks_to_array(face, w, h) for face in res.face_landmarks], axis=0)
+
+    def landmarks_bgr_frames(
+        self,
+        frames_bgr: Sequence[np.ndarray],
+        ts_ms: Optional[Sequence[int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch version, one face per frame (the first face MediaPipe reports).
+        Returns (landmarks, valid):
+          landmarks: (N, 468, 3) float32, NaN rows where no face was found
+          valid:     (N,) bool
+        """
+        n = len(frames_bgr)
+        out = np.full((n, NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+        valid = np.zeros(n, dtype=bool)
+
+        for i, frame in enumerate(frames_bgr):
+            lms = self.landmarks_bgr_frame(frame, None if ts_ms is None else ts_ms[i])
+            if lms is None:
+                continue
+            out[i] = lms[0]
+            valid[i] = True
+
+        return out, valid
+
+    def analyze_bgr_frame(self, frame_bgr) -> Optional[FaceMeshResult]:
+        h, w = frame_bgr.shape[:2]
+
+        if self.mode == "live_stream":
+            rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            self._landmarker.detect_async(mp_image, self._next_ts_ms())
+
+            with self._latest_lock:
+                latest = self._latest
+
+            if not latest or not getattr(latest, "face_landmarks", None):
+                return None
+
+            landmarks = np.stack([_landmarks_to_array(face, w, h) for face in latest.face_landmarks], axis=0)
+        else:
+            landmarks = self.landmarks_bgr_frame(frame_bgr)
+            if landmarks is None:
+                return None
 
-        return FaceMeshResult(faces=faces_px)
+        pts_px = landmarks[:, :, :2].astype(np.int32)
+        faces_px: List[List[Tuple[int, int]]] = [list(map(tuple, face.tolist())) for face in pts_px]
+        return FaceMeshResult(faces=faces_px, landmarks=landmarks)
 
     def draw(self, frame_bgr, result: Optional[FaceMeshResult]):
         if not result:
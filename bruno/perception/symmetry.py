@@ -1,4 +1,6 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Union
+
+import numpy as np
 
 # Indices match MediaPipe Face Landmarker landmark order (468 points).
 MOUTH_LEFT = 61
@@ -8,50 +10,131 @@ L_EYE_LOW = 145
 R_EYE_UP = 386
 R_EYE_LOW = 374
 
+# Gathered in one fancy-index instead of six separate lookups
+_IDX = np.array([MOUTH_LEFT, MOUTH_RIGHT, L_EYE_UP, L_EYE_LOW, R_EYE_UP, R_EYE_LOW])
+_MIN_POINTS = int(_IDX.max()) + 1
+
+Landmarks = Union[List[Tuple[int, int]], np.ndarray]
+
+
 def _clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
-def compute_symmetry(pts: List[Tuple[int, int]], frame_h: int) -> Dict[str, Any]:
+
+def compute_symmetry_batch(landmarks: np.ndarray, frame_h: int) -> Dict[str, np.ndarray]:
     """
-    pts: one face's landmarks as [(x,y), ...] in pixels.
-    Returns symmetry score 0..1 and flags.
+    landmarks: (N, P, 2+) array, N faces/frames of P >= 292 points in pixels (x, y[, z]).
+               NaN rows (no face in that frame) come back with ok=False.
+    Returns per-frame arrays (all shape (N,)):
+      ok, symmetry_score, mouth_dy_px, left_eye_open_px, right_eye_open_px,
+      mouth_left_lower, mouth_right_lower, eye_left_more_closed, eye_right_more_closed
     """
-    if len(pts) <= max(MOUTH_LEFT, MOUTH_RIGHT, L_EYE_UP, L_EYE_LOW, R_EYE_UP, R_EYE_LOW):
-        return {"ok": False, "reason": "not_enough_points"}
+    lm = np.asarray(landmarks, dtype=np.float32)
+    if lm.ndim == 2:
+        lm = lm[None]
+    if lm.ndim != 3 or lm.shape[1] < _MIN_POINTS:
+        raise ValueError(f"expected (N, >={_MIN_POINTS}, 2+) landmarks, got {lm.shape}")
+
+    y = lm[:, _IDX, 1]  # (N, 6)
+    ok = np.isfinite(y).all(axis=1)
+    y = np.where(ok[:, None], y, 0.0)
+
+    mouth_dy = y[:, 0] - y[:, 1]  # + means left mouth corner is lower
+    le_open = np.abs(y[:, 3] - y[:, 2])
+    re_open = np.abs(y[:, 5] - y[:, 4])
+    eye_diff = le_open - re_open
+
+    mouth_asym = np.clip(np.abs(mouth_dy) / max(1.0, 0.12 * frame_h), 0.0, 1.0)
+    eye_asym = np.clip(np.abs(eye_diff) / max(1.0, 0.06 * frame_h), 0.0, 1.0)
+    score = np.clip(1.0 - (0.6 * mouth_asym + 0.4 * eye_asym), 0.0, 1.0)
+
+    mouth_flag = np.abs(mouth_dy) > 0.03 * frame_h
+    eye_flag = np.abs(eye_diff) > 0.015 * frame_h
+
+    return {
+        "ok": ok,
+        "symmetry_score": np.where(ok, score, np.nan),
+        "mouth_dy_px": mouth_dy,
+        "left_eye_open_px": le_open,
+        "right_eye_open_px": re_open,
+        "mouth_left_lower": ok & mouth_flag & (mouth_dy > 0),
+        "mouth_right_lower": ok & mouth_flag & (mouth_dy <= 0),
+        "eye_left_more_closed": ok & eye_flag & (le_open < re_open),
+        "eye_right_more_closed": ok & eye_flag & (le_open >= re_open),
+    }
+
+
+_FLAG_KEYS = ("mouth_left_lower", "mouth_right_lower", "eye_left_more_closed", "eye_right_more_closed")
 
-    mouth_l = pts[MOUTH_LEFT]
-    mouth_r = pts[MOUTH_RIGHT]
-    le_up = pts[L_EYE_UP]
-    le_lo = pts[L_EYE_LOW]
-    re_up = pts[R_EYE_UP]
-    re_lo = pts[R_EYE_LOW]
 
-    mouth_dy = mouth_l[1] - mouth_r[1]  # + means left mouth corner is lower
-    mouth_asym = abs(mouth_dy) / max(1.0, 0.12 * frame_h)
+def aggregate_symmetry(batch: Dict[str, np.ndarray], min_frames: int = 5, flag_ratio: float = 0.5) -> Dict[str, Any]:
+    """
+    Robust multi-frame summary of compute_symmetry_batch output.
+    Score is the median over valid frames; a flag is kept only if it fires in >= flag_ratio of them.
+    Same keys as compute_symmetry (ok, symmetry_score, flags, details) so narrator/trends can read it.
+    """
+    ok = batch["ok"]
+    n_valid = int(ok.sum())
+    if n_valid < min_frames:
+        return {"ok": False, "reason": "not_enough_frames", "frames_valid": n_valid, "frames_total": int(len(ok))}
+
+    scores = batch["symmetry_score"][ok]
+    median = float(np.median(scores))
+    p25, p75 = np.percentile(scores, [25, 75])
+    mad = float(np.median(np.abs(scores - median)))
+
+    flag_rates = {k: float(batch[k][ok].mean()) for k in _FLAG_KEYS}
+    flags = [k for k in _FLAG_KEYS if flag_rates[k] >= flag_ratio]
+
+    return {
+        "ok": True,
+        "symmetry_score": _clamp(median),
+        "flags": flags,
+        "details": {
+            "mouth_dy_px": int(np.median(batch["mouth_dy_px"][ok])),
+            "left_eye_open_px": int(np.median(batch["left_eye_open_px"][ok])),
+            "right_eye_open_px": int(np.median(batch["right_eye_open_px"][ok])),
+        },
+        "stats": {
+            "frames_valid": n_valid,
+            "frames_total": int(len(ok)),
+            "score_mad": mad,
+            "score_p25": float(p25),
+            "score_p75": float(p75),
+            "flag_rates": flag_rates,
+        },
+    }
 
-    le_open = abs(le_lo[1] - le_up[1])
-    re_open = abs(re_lo[1] - re_up[1])
-    eye_asym = abs(le_open - re_open) / max(1.0, 0.06 * frame_h)
 
-    mouth_asym = _clamp(mouth_asym)
-    eye_asym = _clamp(eye_asym)
+def compute_symmetry(pts: Landmarks, frame_h: int) -> Dict[str, Any]:
+    """
+    pts: one face's landmarks as [(x,y), ...] in pixels (or a (P, 2+) array).
+    Returns symmetry score 0..1 and flags.
+    """
+    if len(pts) < _MIN_POINTS:
+        return {"ok": False, "reason": "not_enough_points"}
 
-    score = 1.0 - (0.6 * mouth_asym + 0.4 * eye_asym)
-    score = _clamp(score)
+    b = compute_symmetry_batch(np.asarray(pts, dtype=np.float32)[None], frame_h)
+    if not b["ok"][0]:
+        return {"ok": False, "reason": "invalid_points"}
 
     flags = []
-    if abs(mouth_dy) > 0.03 * frame_h:
-        flags.append("mouth_left_lower" if mouth_dy > 0 else "mouth_right_lower")
-    if abs(le_open - re_open) > 0.015 * frame_h:
-        flags.append("eye_left_more_closed" if le_open < re_open else "eye_right_more_closed")
+    if b["mouth_left_lower"][0]:
+        flags.append("mouth_left_lower")
+    elif b["mouth_right_lower"][0]:
+        flags.append("mouth_right_lower")
+    if b["eye_left_more_closed"][0]:
+        flags.append("eye_left_more_closed")
+    elif b["eye_right_more_closed"][0]:
+        flags.append("eye_right_more_closed")
 
     return {
         "ok": True,
-        "symmetry_score": score,
+        "symmetry_score": _clamp(float(b["symmetry_score"][0])),
         "flags": flags,
         "details": {
-            "mouth_dy_px": int(mouth_dy),
-            "left_eye_open_px": int(le_open),
-            "right_eye_open_px": int(re_open),
+            "mouth_dy_px": int(b["mouth_dy_px"][0]),
+            "left_eye_open_px": int(b["left_eye_open_px"][0]),
+            "right_eye_open_px": int(b["right_eye_open_px"][0]),
         },
     }
@@ -0,0 +1,218 @@
+"""
+Multi-frame facial symmetry scan that runs next to the live loop.
+
+The main loop only crops the face box and hands it over (feed); FaceMesh, scoring,
+aggregation and saving happen on a worker thread. Finished scans come back via poll().
+"""
+import queue
+import threading
+import time
+from typing import Optional, Dict, Any, List, Sequence
+
+import numpy as np
+
+from bruno.perception.symmetry import compute_symmetry_batch, aggregate_symmetry
+from bruno.storage.users import save_scan_json
+from bruno.analysis.trends import symmetry_trend
+from bruno.brain.narrator import baymax_summary
+
+
+def _padded_crop_box(bbox: Sequence[int], frame_w: int, frame_h: int, pad: float):
+    x1, y1, x2, y2 = [int(v) for v in bbox]
+    bw, bh = x2 - x1, y2 - y1
+    px, py = int(bw * pad), int(bh * pad)
+    cx1, cy1 = max(0, x1 - px), max(0, y1 - py)
+    cx2, cy2 = min(frame_w, x2 + px), min(frame_h, y2 + py)
+    if cx2 - cx1 < 32 or cy2 - cy1 < 32:
+        return None
+    return cx1, cy1, cx2, cy2
+
+
+class SymmetryScan:
+    """
+    start(user_id, frame_h) -> feed(frame, face_bbox) every frame -> poll() for the result.
+    Collects up to max_frames face crops over window_s seconds, then writes a scan record:
+      {"ts", "user_id", "scan": {ok, symmetry_score, flags, details, stats}, ...}
+    which analysis.trends.load_recent_scans can read back.
+    """
+
+    def __init__(
+        self,
+        users_root: str,
+        window_s: float = 3.0,
+        max_frames: int = 36,
+        min_frames: int = 8,
+        pad: float = 0.35,
+        model_path: str = "bruno/models/face_landmarker.task",
+    ):
+        self.users_root = users_root
+        self.window_s = window_s
+        self.max_frames = max_frames
+        self.min_frames = min_frames
+        self.pad = pad
+        self.model_path = model_path
+
+        self._crops: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=8)
+        self._results: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._job: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+
+    @property
+    def active(self) -> bool:
+        with self._lock:
+            return self._job is not None
+
+    def start(self, user_id: str, frame_h: int, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """Begin a capture window. Returns False if a scan is already running."""
+        with self._lock:
+            if self._job is not None:
+                return False
+            self._job = {
+                "user_id": user_id,
+                "frame_h": int(frame_h),
+                "extra": extra or {},
+                "t0": time.time(),
+                "fed": 0,
+            }
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+        return True
+
+    def feed(self, frame, face_bbox) -> None:
+        """Cheap, non-blocking: crop the face and queue it. Drops the crop if the worker is behind."""
+        with self._lock:
+            job = self._job
+            if job is None or face_bbox is None or job["fed"] >= self.max_frames:
+                return
+            if time.time() - job["t0"] > self.window_s:
+                return
+
+        h, w = frame.shape[:2]
+        box = _padded_crop_box(face_bbox, w, h, self.pad)
+        if box is None:
+            return
+        x1, y1, x2, y2 = box
+        try:
+            self._crops.put_nowait((frame[y1:y2, x1:x2].copy(), (x1, y1)))
+            with self._lock:
+                job["fed"] += 1
+        except queue.Full:
+            pass
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """Finished scan result (payload, path, say) or None."""
+        try:
+            return self._results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._stop = True
+        try:
+            self._crops.put_nowait(None)
+        except queue.Full:
+            pass
+
+    # ---------------- worker ----------------
+
+    def _worker(self):
+        analyzer = None
+        try:
+            # MediaPipe graphs are created and used on this thread only
+            from bruno.perception.facemesh import FaceMeshAnalyzer
+            analyzer = FaceMeshAnalyzer(model_path=self.model_path, num_faces=1, mode="image")
+        except Exception as e:
+            print("BRUNO: FaceMesh unavailable for symmetry scan:", e)
+
+        while not self._stop:
+            with self._lock:
+                job = self._job
+            if job is None:
+                time.sleep(0.05)
+                continue
+
+            landmarks = self._collect(job, analyzer)
+            self._finish(job, landmarks, analyzer is not None)
+
+        if analyzer is not None:
+            analyzer.close()
+
+    def _collect(self, job: Dict[str, Any], analyzer) -> List[np.ndarray]:
+        out: List[np.ndarray] = []
+        deadline = job["t0"] + self.window_s
+        processed = 0
+
+        while processed < self.max_frames:
+            remaining = deadline - time.time()
+            if remaining <= 0 and self._crops.empty():
+                break
+            try:
+                item = self._crops.get(timeout=max(0.01, min(0.2, remaining)))
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            processed += 1
+            if analyzer is None:
+                continue
+
+            crop, (ox, oy) = item
+            try:
+                lms = analyzer.landmarks_bgr_frame(crop)
+            except Exception:
+                lms = None
+            if lms is None:
+                continue
+
+            face = lms[0]
+            face[:, 0] += ox  # back to full-frame pixel coordinates
+            face[:, 1] += oy
+            out.append(face)
+
+        # drop leftovers so they don't leak into the next scan
+        while not self._crops.empty():
+            try:
+                self._crops.get_nowait()
+            except queue.Empty:
+                break
+
+        job["processed"] = processed
+        return out
+
+    def _finish(self, job: Dict[str, Any], landmarks: List[np.ndarray], have_facemesh: bool):
+        user_id = job["user_id"]
+
+        if not have_facemesh:
+            scan = {"ok": False, "reason": "facemesh_unavailable"}
+        elif not landmarks:
+            scan = {"ok": False, "reason": "no_face", "frames_total": job.get("processed", 0)}
+        else:
+            batch = compute_symmetry_batch(np.stack(landmarks, axis=0), job["frame_h"])
+            scan = aggregate_symmetry(batch, min_frames=self.min_frames)
+            scan.setdefault("stats", {})["frames_total"] = job.get("processed", len(landmarks))
+
+        payload = dict(job["extra"])
+        payload.update({
+            "ts": time.strftime("%Y-%m-%dT%H-%M-%S"),
+            "user_id": user_id,
+            "scan": scan,
+            "duration_s": round(time.time() - job["t0"], 2),
+        })
+
+        path = None
+        trend = None
+        try:
+            path = save_scan_json(self.users_root, user_id, payload)
+            if scan.get("ok"):
+                trend = symmetry_trend(self.users_root, user_id)
+        except Exception as e:
+            print("BRUNO: Could not save scan:", e)
+
+        say = baymax_summary({"status": "ok"}, scan, trend)
+
+        with self._lock:
+            self._job = None
+        self._results.put({"payload": payload, "path": path, "trend": trend, "say": say})
@@ -1,13 +1,19 @@
-from ultralytics import YOLO
 import numpy as np
 
+from bruno.utils.model_registry import yolo_handle
+
 
 class YOLOTracker:
     def __init__(self, model_name="yolov8n.pt"):
         print("BRUNO: Loading YOLO model...")
-        self.model = YOLO(model_name)
+        self._model = yolo_handle(model_name, tracking=True)
+        self._model.get()
         print("BRUNO: YOLO ready.")
 
+    @property
+    def model(self):
+        return self._model.get()
+
     def track(self, frame):
         results = self.model.track(frame, persist=True, verbose=False)
 
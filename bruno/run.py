@@ -23,17 +23,25 @@ else:
     from bruno.perception.yolo import YOLOTracker
 
 from bruno.auth.pin import verify_pin, set_pin, pin_exists
-from bruno.storage.users import ensure_user_dirs, save_scan_json
+from bruno.storage.users import ensure_user_dirs
 from bruno.voice.tts import speak
 if not _def and not os.environ.get("BRUNO_DISABLE_WHISPER"):
     from bruno.voice.stt_whisper import listen_and_transcribe
 else:
     def listen_and_transcribe(seconds=4.0):
         return ""
-from bruno.brain.orchestrator import think_sync
-from bruno.brainloop.state import build_state
-from bruno.brainloop.risk import score_risk
+from bruno.brain.orchestrator import think_async, warm_brain
+from bruno.brain.intent import asks_about_past
+from bruno.brain.vision_specialist import acne_model
 from bruno.brainloop.autopilot import Autopilot
+from bruno.brainloop.loop import BrainLoop
+from bruno.brainloop.history import PerceptionHistory
+from bruno.health.sessions import VitalsSessions
+
+if not _def and not os.environ.get("BRUNO_DISABLE_FACEMESH"):
+    from bruno.perception.symmetry_scan import SymmetryScan
+else:
+    SymmetryScan = None
 
 import threading
 
@@ -132,6 +140,38 @@ def best_person_box(detections):
     return max(persons, key=area)["box"]
 
 
+def primary_face_index(face_matches, user_id=None):
+    """Index of the face to act on: the one matched to user_id if present, else the largest."""
+    if not face_matches:
+        return None
+    for i, fm in enumerate(face_matches):
+        if user_id and fm.get("user_id") == user_id:
+            return i
+
+    def area(i):
+        x1, y1, x2, y2 = face_matches[i]["bbox"]
+        return max(0, (x2 - x1)) * max(0, (y2 - y1))
+
+    return max(range(len(face_matches)), key=area)
+
+
+def scan_face_box(face_matches, user_id=None):
+    """Face bbox to scan: the one matched to user_id if present, else the largest face."""
+    i = primary_face_index(face_matches, user_id)
+    return None if i is None else face_matches[i]["bbox"]
+
+
+def vitals_key(face_match, detections, index=0):
+    """Vitals session key: YOLO track of the person around the face, else user id, else slot."""
+    cx, cy = center_of(face_match["bbox"])
+    for d in detections:
+        if d.get("label") == "person" and d.get("track_id") is not None and point_in_box(cx, cy, d["box"]):
+            return ("track", d["track_id"])
+    if face_match.get("user_id"):
+        return ("user", face_match["user_id"])
+    return ("face", index)
+
+
 def main():
     global latest_transcript
     print("🐶 BRUNO booting...")
@@ -142,11 +182,24 @@ def main():
     cap.set(cv2.CAP_PROP_EXPOSURE, -6)         # adjust if image too dark/bright
     # ---------------------------------------------------
 
+    # Skin model loads lazily; warm it in the background once the camera is up
+    if not _def and not os.environ.get("BRUNO_DISABLE_SKIN_WARMUP"):
+        acne_model.warmup()
+    # Router/speaker models resident with their system prompts cached before the first question
+    if not os.environ.get("BRUNO_DISABLE_LLM_WARMUP"):
+        warm_brain()
+
     yolo = YOLOTracker()
     pose = PoseAnalyzer()
     faceid = FaceEmbedID(USERS_ROOT)
     autopilot = Autopilot()
+    # history rows spill to disk before the ring overwrites them when a directory is set
+    brainloop = BrainLoop(autopilot, history=PerceptionHistory(spill_dir=os.environ.get("BRUNO_HISTORY_SPILL_DIR") or None))
     autopilot_enabled = True
+    symmetry_scan = SymmetryScan(USERS_ROOT) if SymmetryScan is not None else None
+    # rPPG algorithm per device: see scripts/bench_rppg.py
+    vitals_sessions = VitalsSessions(algorithm=os.environ.get("BRUNO_RPPG_ALGO", "pos"))
+    last_face_keys = []
 
     if not _def and not os.environ.get("BRUNO_DISABLE_WHISPER"):
         voice_thread = threading.Thread(target=voice_worker, daemon=True)
@@ -154,6 +207,9 @@ def main():
 
     BRAIN_COOLDOWN_SEC = 4.0
     last_brain_speak_time = 0.0
+    BRAIN_DEADLINE_SEC = float(os.environ.get("BRUNO_BRAIN_DEADLINE", "45"))
+    brain_task = None
+    brain_task_text = None
 
     print("BRUNO: Keys:")
     print("  n = new profile (create user + PIN)")
@@ -194,6 +250,7 @@ def main():
         frame = read_frame(cap)
         if frame is None:
             continue
+        frame_ts = time.time()
 
         frame_count += 1
         
@@ -205,33 +262,44 @@ def main():
             print("Heard:", transcript)
             normalized = transcript.lower().strip()
 
-            # ---------------- SKIN TRIGGER ----------------
+            # Brain requests run on the brain executor; the loop keeps drawing and tracking.
+            # A new question supersedes one still being thought about.
+            ask = None
             if "check my skin" in normalized:
-                brain_out = think_sync(
-                    {"transcript": transcript},
-                    frame=frame
-                )
-
-                if brain_out and brain_out.get("say"):
-                    speak(brain_out["say"])
-
-         # ---------------- HEART RATE TRIGGER ----------------
+                ask = {"frame": frame}
             elif "check my heart rate" in normalized:
-                face_box = (
-                    last_face_matches[0]["bbox"]
-                    if last_face_matches else None
+                # answered from the asker's live estimate fed below; no camera takeover
+                i = primary_face_index(last_face_matches, authorized_user)
+                key = last_face_keys[i] if i is not None and i < len(last_face_keys) else ("face", 0)
+                ask = {"frame": frame, "vitals": vitals_sessions.get(key)}
+
+            if ask is not None and brain_task is not None and not brain_task.done() and brain_task_text == normalized:
+                # same question again while it is still being answered: keep the one in flight
+                ask = None
+
+            if ask is not None:
+                if brain_task is not None and not brain_task.done():
+                    brain_task.cancel()
+                brain_task_text = normalized
+                event = {"transcript": transcript}
+                if asks_about_past(transcript):
+                    # who / what was around in the last 10 minutes, only when it is asked about
+                    event["recent"] = brainloop.history.brief(600)
+                brain_task = think_async(
+                    event,
+                    speak_stream=speak,
+                    hints={"face_in_view": bool(last_face_matches)},
+                    deadline_s=BRAIN_DEADLINE_SEC,
+                    **ask,
                 )
 
-                brain_out = think_sync(
-                    {"transcript": transcript},
-                    frame=frame,
-                    cap=cap,
-                   face_box=face_box
-               )
-
-                if brain_out and brain_out.get("say"):
+        if brain_task is not None:
+            brain_out = brain_task.poll()
+            if brain_out is not None:
+                brain_task = None
+                if brain_out.get("status") != "cancelled" and brain_out.get("say") and not brain_out.get("spoken"):
                     speak(brain_out["say"])
-        
+
         # Object detection
         if frame_count % OBJ_EVERY_N == 0:
             try:
@@ -241,12 +309,24 @@ def main():
                 pass
 
         # Background FaceID (display only, multi-face) - update cache
+        face_updated = False
         if frame_count % ID_EVERY_N == 0:
+            face_updated = True
             try:
                 last_face_matches = faceid.match_faces(frame, threshold=0.35)
             except Exception:
                 last_face_matches = []
-# Background Pose
+        # Vitals: per-person forehead + cheek colors into each person's rPPG session.
+        # Boxes re-anchor on fresh FaceID results and are template-tracked in between.
+        if face_updated:
+            last_face_keys = [vitals_key(fm, last_detections, i) for i, fm in enumerate(last_face_matches)]
+            vitals_sessions.feed(
+                frame, frame_ts, {k: fm["bbox"] for k, fm in zip(last_face_keys, last_face_matches)}
+            )
+        elif len(vitals_sessions):
+            vitals_sessions.feed(frame, frame_ts)
+
+        # Background Pose
         if frame_count % POSE_EVERY_N == 0:
             try:
                 ts_ms = int(time.time() * 1000)
@@ -313,7 +393,18 @@ def main():
                 "recognized": bool(nm),
             })
 
+        # Symmetry scan: hand face crops to the scan worker, pick up finished results
+        if symmetry_scan is not None:
+            if symmetry_scan.active:
+                symmetry_scan.feed(frame, scan_face_box(last_face_matches, authorized_user))
+            scan_out = symmetry_scan.poll()
+            if scan_out:
+                print("BRUNO: Saved scan ->", scan_out["path"])
+                speak(scan_out["say"])
+
         frame = draw_boxes(frame, last_detections, name_map=name_map)
+        if symmetry_scan is not None and symmetry_scan.active:
+            cv2.putText(frame, "SCANNING...", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 200, 255), 2)
 
         # Stick figure ONLY inside PERSON bbox
         person_box = best_person_box(last_detections)
@@ -324,19 +415,15 @@ def main():
                 pass
 
 
-        # BrainLoop: build state -> risk -> autopilot
-        if 'last_face_matches' in locals():
-            pass
-        state = build_state(
+        # BrainLoop: build state -> risk -> autopilot, only when an input changed or a timer fired
+        brainloop.update(
             detections=last_detections,
             people=people,
             pose_info=last_pose,
             authorized_user=authorized_user if (authorized_user and time.time() <= auth_until) else None,
-        )
-        risk = score_risk(state)
-        if autopilot_enabled:
             # 🔕 Keep risk logic but disable speech
-            autopilot.decide(state, risk)
+            decide=autopilot_enabled,
+        )
 
         
         # --- Primary identity speech gate (no spam + no instant 'not recognized') ---
@@ -454,17 +541,24 @@ def main():
                 print("BRUNO: Locked. Press u to unlock first.")
                 continue
 
+            if symmetry_scan is None:
+                print("BRUNO: Symmetry scan disabled (FaceMesh off).")
+                continue
+
             ensure_user_dirs(USERS_ROOT, authorized_user)
-            payload = {
-                "ts": time.strftime("%Y-%m-%dT%H-%M-%S"),
-                "user_id": authorized_user,
-                "detections": last_detections,
-                "note": "scan placeholder"
-            }
-            path = save_scan_json(USERS_ROOT, authorized_user, payload)
-            print("BRUNO: Saved scan ->", path)
+            detections = [
+                {"label": d.get("label"), "track_id": d.get("track_id"), "box": [int(v) for v in d["box"]]}
+                for d in last_detections
+            ]
+            if symmetry_scan.start(authorized_user, frame.shape[0], extra={"detections": detections}):
+                print("BRUNO: Scanning... hold still and face the camera.")
+                speak("Scanning. Please hold still.")
+            else:
+                print("BRUNO: A scan is already running.")
 
     pose.close()
+    if symmetry_scan is not None:
+        symmetry_scan.close()
     close_camera(cap)
     cv2.destroyAllWindows()
     print("BRUNO shutdown.")
@@ -0,0 +1,261 @@
+"""
+Process-wide model registry.
+
+Every heavy model (acne classifier, InsightFace, YOLO, Whisper) is loaded through
+registry.get(key, loader), so each one is loaded at most once and all wrappers share
+the same instance. The registry records roughly how much resident memory each load
+added and, when BRUNO_MODEL_BUDGET_MB is set, evicts the least recently used
+*evictable* models (e.g. skin, Whisper) to stay under the budget; the next get()
+reloads them. Models used every frame (YOLO, face ID) are registered as pinned.
+Loads run one at a time (whole process), so the resident-memory delta around a
+loader is that model's and not a concurrent load's.
+
+Wrappers should keep the key + loader (ModelHandle) rather than the model itself,
+otherwise an evicted model stays alive through their reference.
+"""
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Used when resident memory can't be measured (non-Linux) or the load measured ~0
+SIZE_HINTS_MB = {
+    "acne:torch": 350.0,
+    "acne:onnx": 100.0,
+    "insightface:buffalo_l": 330.0,
+    "insightface:buffalo_l:CPUExecutionProvider": 330.0,
+    "yolo:yolov8n.pt": 40.0,
+    "yolo:yolov8n.pt:track": 40.0,
+    "whisper:tiny": 90.0,
+}
+DEFAULT_SIZE_MB = 100.0
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@dataclass
+class _Entry:
+    key: str
+    model: Any
+    size_mb: float
+    evictable: bool
+    unload: Optional[Callable[[Any], None]]
+    load_s: float
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+    in_use: int = 0
+
+
+class ModelRegistry:
+    def __init__(self, budget_mb: Optional[float] = None):
+        env = os.environ.get("BRUNO_MODEL_BUDGET_MB")
+        self.budget_mb = budget_mb if budget_mb is not None else (float(env) if env else None)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # LRU order
+        self._lock = threading.RLock()
+        self._load_lock = threading.RLock()  # one load at a time: RSS deltas stay attributable
+        self.loads = 0
+        self.evictions = 0
+
+    # ---------- lookups ----------
+
+    def get(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        evictable: bool = True,
+        unload: Optional[Callable[[Any], None]] = None,
+        size_hint_mb: Optional[float] = None,
+    ) -> Any:
+        """The shared model for key, calling loader() the first time (or after eviction)."""
+        return self._get(key, loader, evictable, unload, size_hint_mb, hold=False)[1]
+
+    def _get(self, key, loader, evictable=True, unload=None, size_hint_mb=None, hold=False):
+        """(entry, model); with hold, entry.in_use is taken in the same locked step that finds it."""
+        with self._lock:
+            entry = self._touch(key, hold)
+            if entry is not None:
+                return entry, entry.model
+
+        # load outside the registry lock so loaded models stay available meanwhile
+        with self._load_lock:
+            with self._lock:
+                entry = self._touch(key, hold)
+                if entry is not None:
+                    return entry, entry.model
+                hint = size_hint_mb or SIZE_HINTS_MB.get(key, DEFAULT_SIZE_MB)
+                self._evict_for(hint)
+
+            rss0 = _rss_mb()
+            t0 = time.time()
+            model = loader()
+            load_s = time.time() - t0
+            rss1 = _rss_mb()
+            measured = (rss1 - rss0) if rss0 is not None and rss1 is not None else 0.0
+            size = measured if measured > 1.0 else hint
+
+            with self._lock:
+                entry = _Entry(key, model, size, evictable, unload, load_s)
+                entry.uses = 1
+                entry.in_use = int(hold)
+                self._entries[key] = entry
+                self.loads += 1
+                print(f"BRUNO: model {key} loaded in {load_s:.1f}s (~{size:.0f} MB)")
+                self._evict_for(0.0, keep=key)
+            return entry, model
+
+    def _touch(self, key: str, hold: bool = False) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.last_used = time.time()
+            entry.uses += 1
+            entry.in_use += hold
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    @contextmanager
+    def using(self, key: str, loader: Callable[[], Any], **kwargs):
+        """get() and keep the model from being evicted until the block exits."""
+        entry, model = self._get(key, loader, hold=True, **kwargs)
+        try:
+            yield model
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+
+    # ---------- eviction ----------
+
+    def resident_mb(self) -> float:
+        with self._lock:
+            return sum(e.size_mb for e in self._entries.values())
+
+    def _evict_for(self, incoming_mb: float, keep: Optional[str] = None):
+        if self.budget_mb is None:
+            return
+        for key in list(self._entries.keys()):  # least recently used first
+            if self.resident_mb() + incoming_mb <= self.budget_mb:
+                return
+            e = self._entries[key]
+            if key == keep or not e.evictable or e.in_use > 0:
+                continue
+            self._evict_locked(key, reason="budget")
+
+    def evict(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._evict_locked(key, reason="manual")
+            return True
+
+    def _evict_locked(self, key: str, reason: str):
+        e = self._entries.pop(key)
+        self.evictions += 1
+        if e.unload is not None:
+            try:
+                e.unload(e.model)
+            except Exception as ex:
+                print(f"BRUNO: unloading {key} failed:", ex)
+        e.model = None
+        gc.collect()
+        print(f"BRUNO: model {key} evicted ({reason}, ~{e.size_mb:.0f} MB)")
+
+    # ---------- metrics ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "budget_mb": self.budget_mb,
+                "resident_mb": round(self.resident_mb(), 1),
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "models": {
+                    k: {
+                        "size_mb": round(e.size_mb, 1),
+                        "load_s": round(e.load_s, 2),
+                        "uses": e.uses,
+                        "idle_s": round(time.time() - e.last_used, 1),
+                        "evictable": e.evictable,
+                    }
+                    for k, e in self._entries.items()
+                },
+            }
+
+
+registry = ModelRegistry()
+
+
+class ModelHandle:
+    """What a wrapper keeps instead of the model: fetch with .get() (or `with handle as m`) on every use."""
+
+    def __init__(self, key: str, loader: Callable[[], Any], evictable: bool = True, unload=None, reg: Optional[ModelRegistry] = None):
+        self.key = key
+        self.loader = loader
+        self.evictable = evictable
+        self.unload = unload
+        self.registry = reg or registry
+        self._ctx = threading.local()
+
+    def get(self) -> Any:
+        return self.registry.get(self.key, self.loader, evictable=self.evictable, unload=self.unload)
+
+    @property
+    def loaded(self) -> bool:
+        return self.registry.is_loaded(self.key)
+
+    def __enter__(self):
+        cm = self.registry.using(self.key, self.loader, evictable=self.evictable, unload=self.unload)
+        stack = getattr(self._ctx, "stack", None)
+        if stack is None:
+            stack = self._ctx.stack = []
+        stack.append(cm)
+        return cm.__enter__()
+
+    def __exit__(self, *exc):
+        return self._ctx.stack.pop().__exit__(*exc)
+
+
+# ---------- shared loaders ----------
+
+def insightface_handle(name: str = "buffalo_l", det_size=(640, 640), providers: Optional[List[str]] = None) -> ModelHandle:
+    """Shared FaceAnalysis; providers (onnxruntime) are part of the key, so each set loads its own."""
+    def load():
+        from insightface.app import FaceAnalysis
+
+        app = FaceAnalysis(name=name, providers=providers) if providers else FaceAnalysis(name=name)
+        # ctx_id=0 uses GPU if available, otherwise CPU
+        app.prepare(ctx_id=0, det_size=det_size)
+        return app
+
+    key = f"insightface:{name}" + (":" + ",".join(providers) if providers else "")
+    return ModelHandle(key, load, evictable=False)
+
+
+def yolo_handle(weights: str = "yolov8n.pt", tracking: bool = False) -> ModelHandle:
+    """
+    Shared YOLO per weights file. Tracking keeps per-stream tracker state inside the
+    model object, so trackers share a separate instance from plain detectors
+    (BRUNO has one camera stream).
+    """
+    def load():
+        from ultralytics import YOLO
+
+        return YOLO(weights)
+
+    key = f"yolo:{weights}" + (":track" if tracking else "")
+    return ModelHandle(key, load, evictable=False)
@@ -1,12 +1,17 @@
 from typing import Dict, Any, List
 import numpy as np
-from ultralytics import YOLO
+
+from bruno.utils.model_registry import yolo_handle
 
 class YoloDetector:
     def __init__(self, weights: str = "yolov8n.pt", conf: float = 0.35):
-        self.model = YOLO(weights)
+        self._model = yolo_handle(weights)
         self.conf = conf
 
+    @property
+    def model(self):
+        return self._model.get()
+
     def predict(self, bgr_frame) -> Dict[str, Any]:
         # ultralytics expects RGB
         rgb = bgr_frame[:, :, ::-1]
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Tuple
-from ultralytics import YOLO
+
+from bruno.utils.model_registry import ModelHandle, yolo_handle
 
 def _iou(a: List[float], b: List[float]) -> float:
     ax1, ay1, ax2, ay2 = a
@@ -34,7 +35,7 @@ class YoloStack:
     """
 
     def __init__(self, weights: List[str], conf: float = 0.35, iou_merge: float = 0.55):
-        self.models: List[Tuple[str, YOLO]] = [(w, YOLO(w)) for w in weights]
+        self.models: List[Tuple[str, ModelHandle]] = [(w, yolo_handle(w)) for w in weights]
         self.conf = conf
         self.iou_merge = iou_merge
 
@@ -42,8 +43,8 @@ class YoloStack:
         rgb = bgr_frame[:, :, ::-1]
         merged: List[Dict[str, Any]] = []
 
-        for wname, model in self.models:
-            results = model.predict(rgb, conf=self.conf, verbose=False)
+        for wname, handle in self.models:
+            results = handle.get().predict(rgb, conf=self.conf, verbose=False)
             r0 = results[0]
             names = r0.names
 
@@ -1,11 +1,16 @@
 from typing import Dict, Any, List
-from ultralytics import YOLO
+
+from bruno.utils.model_registry import yolo_handle
 
 class YoloTracker:
     def __init__(self, weights: str = "yolov8n.pt", conf: float = 0.35):
-        self.model = YOLO(weights)
+        self._model = yolo_handle(weights, tracking=True)
         self.conf = conf
 
+    @property
+    def model(self):
+        return self._model.get()
+
     def track(self, bgr_frame) -> Dict[str, Any]:
         rgb = bgr_frame[:, :, ::-1]
         results = self.model.track(rgb, conf=self.conf, persist=True, verbose=False)
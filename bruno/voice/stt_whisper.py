@@ -1,18 +1,20 @@
 import numpy as np
 import sounddevice as sd
 from scipy.io.wavfile import write
-from faster_whisper import WhisperModel
 import tempfile
 import os
 
+from bruno.utils.model_registry import registry
+
 _MODEL_NAME = "tiny"
-_model = None
+
+def _load_model():
+    from faster_whisper import WhisperModel
+    return WhisperModel(_MODEL_NAME, device="cpu", compute_type="int8")
 
 def _get_model():
-    global _model
-    if _model is None:
-        _model = WhisperModel(_MODEL_NAME, device="cpu", compute_type="int8")
-    return _model
+    # evictable: under a memory budget it is dropped when idle and reloaded on the next utterance
+    return registry.get(f"whisper:{_MODEL_NAME}", _load_model, evictable=True)
 
 def record_wav(seconds: float = 4.0, samplerate: int = 16000) -> str:
     seconds = float(seconds)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: full PerceptionEvents vs the delta-encoded stream (bruno.bus.delta).
+Run from repo root: python3 scripts/bench_delta.py [--events 600] [--tracks 8] [--batch 32]
+
+Simulates three scenes at camera rate: static (only ts changes), one box moving, and
+busy (every box moves, tracks come and go). For each, prints bytes per event on the
+wire (JSON, and msgpack if installed) and the brain node's cost per event to turn a
+batch back into PerceptionEvents (validate_json for full events; json.loads + the
+stream decoder for deltas). Reconstructed events are checked against the originals.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+# Ensure project root is on path (run from repo root or from scripts/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPT_DIR)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pydantic import TypeAdapter
+
+from bruno.bus import wire
+from bruno.bus.delta import DeltaEncoder, StreamDecoders
+from bruno.bus.messages import Detection, PerceptionEvent
+
+LABELS = ["person", "cup", "chair", "bottle", "laptop", "book", "tv", "couch"]
+
+
+def scene(kind: str, n_events: int, n_tracks: int) -> List[PerceptionEvent]:
+    rng = random.Random(0)
+    boxes = {t: [40 * t, 30, 40 * t + 80, 200] for t in range(n_tracks)}
+    next_tid = n_tracks
+    out = []
+    for i in range(n_events):
+        if kind == "one-moving":
+            b = boxes[0]
+            boxes[0] = [b[0] + 2, b[1], b[2] + 2, b[3]]
+        elif kind == "busy":
+            for t in boxes:
+                boxes[t] = [v + rng.randint(-3, 3) for v in boxes[t]]
+            if rng.random() < 0.05:
+                boxes.pop(rng.choice(list(boxes)))
+                boxes[next_tid] = [10, 10, 90, 90]
+                next_tid += 1
+        dets = [Detection(label=LABELS[t % len(LABELS)], confidence=0.9, track_id=t, box=b) for t, b in boxes.items()]
+        counts = {}
+        for d in dets:
+            counts[d.label] = counts.get(d.label, 0) + 1
+        out.append(PerceptionEvent(
+            ts=f"2026-01-01T12-{i // 1800:02d}-{i // 30 % 60:02d}.{i % 30:02d}",
+            device_id="pi-01",
+            scene_summary={"counts": counts, "n": len(dets)},
+            detections=dets,
+            face_detected=True,
+            notes={"mode": "idle"},
+        ))
+    return out
+
+
+def batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--events", type=int, default=600)
+    ap.add_argument("--tracks", type=int, default=8)
+    ap.add_argument("--batch", type=int, default=32)
+    args = ap.parse_args()
+
+    adapter = TypeAdapter(List[PerceptionEvent])
+    has_mp = wire.msgpack_available()
+    print(f"{'scene':<11}{'mode':<8}{'json B/evt':>11}{'msgpack B/evt':>15}{'parse us/evt':>14}")
+
+    for kind in ("static", "one-moving", "busy"):
+        evts = scene(kind, args.events, args.tracks)
+        n = len(evts)
+
+        full = [adapter.dump_json(b) for b in batches(evts, args.batch)]
+        full_mp = sum(len(wire.encode_events(b)) for b in batches(evts, args.batch)) if has_mp else None
+        t0 = time.perf_counter()
+        for data in full:
+            adapter.validate_json(data)
+        full_us = (time.perf_counter() - t0) / n * 1e6
+
+        enc = DeltaEncoder(keyframe_every=100, keyframe_s=1e9)
+        msgs = [enc.encode(e) for e in evts]
+        stream = [json.dumps(b).encode() for b in batches(msgs, args.batch)]
+        stream_mp = sum(len(wire.pack(b)) for b in batches(msgs, args.batch)) if has_mp else None
+        dec = StreamDecoders()
+        t0 = time.perf_counter()
+        for data in stream:
+            for m in json.loads(data):
+                dec.apply(m)
+        stream_us = (time.perf_counter() - t0) / n * 1e6
+
+        dec = StreamDecoders()
+        rebuilt = [dec.apply(m)[0] for data in stream for m in json.loads(data)]
+        assert [e.model_dump() for e in rebuilt] == [e.model_dump() for e in evts], kind
+
+        mp = lambda v: f"{v / n:>15.0f}" if v is not None else f"{'-':>15}"
+        print(f"{kind:<11}{'full':<8}{sum(map(len, full)) / n:>11.0f}{mp(full_mp)}{full_us:>14.1f}")
+        print(f"{'':<11}{'delta':<8}{sum(map(len, stream)) / n:>11.0f}{mp(stream_mp)}{stream_us:>14.1f}"
+              f"   ({enc.stats['keyframes']} keyframes)")
+
+
+if __name__ == "__main__":
+    main()
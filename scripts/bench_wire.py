@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: JSON vs msgpack wire format for PerceptionEvent batches.
+Run from repo root: python3 scripts/bench_wire.py [--detections 0,4,16,64] [--batch 32] [--repeat 200]
+
+For each detection count, times one batch through each path and prints bytes per event
+and microseconds per event to encode (producer) and decode into models (brain node):
+  json            model_dump + json.dumps   /  json.loads + PerceptionEvent(**d)
+  json-core       model_dump_json           /  TypeAdapter.validate_json (what /events uses)
+  msgpack         bus.wire.encode_events    /  bus.wire.decode_events (unpack + validate_python)
+Decoding msgpack costs more than validate_json: pydantic-core parses and validates JSON
+in one pass, while msgpack rebuilds Python dicts first. msgpack's wins are batch size
+and producer-side encoding.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+# Ensure project root is on path (run from repo root or from scripts/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPT_DIR)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pydantic import TypeAdapter
+
+from bruno.bus import wire
+from bruno.bus.messages import Detection, PerceptionEvent
+
+
+def make_events(n_events: int, n_dets: int) -> List[PerceptionEvent]:
+    labels = ["person", "cup", "chair", "bottle", "laptop", "book"]
+    return [
+        PerceptionEvent(
+            ts=f"2026-01-01T12-00-{i % 60:02d}",
+            device_id="pi-01",
+            scene_summary={"counts": {lab: 1 for lab in labels[: 1 + n_dets % 6]}},
+            detections=[
+                Detection(label=labels[k % 6], confidence=0.5 + (k % 5) / 10, track_id=k, box=[10 * k, 20, 10 * k + 50, 220])
+                for k in range(n_dets)
+            ],
+            face_detected=bool(i % 2),
+            notes={"frame": i},
+        )
+        for i in range(n_events)
+    ]
+
+
+def timeit(fn, repeat: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--detections", default="0,4,16,64")
+    ap.add_argument("--batch", type=int, default=32)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    adapter = TypeAdapter(List[PerceptionEvent])
+    paths = {
+        "json": (
+            lambda evts: json.dumps([e.model_dump() for e in evts]).encode(),
+            lambda data: [PerceptionEvent(**d) for d in json.loads(data)],
+        ),
+        "json-core": (
+            lambda evts: adapter.dump_json(evts),
+            lambda data: adapter.validate_json(data),
+        ),
+    }
+    if wire.msgpack_available():
+        paths["msgpack"] = (wire.encode_events, wire.decode_events)
+    else:
+        print("msgpack not installed: only the JSON paths run (pip install msgpack)")
+
+    print(f"{'dets':>4}  {'format':<14}{'bytes/evt':>10}{'enc us/evt':>12}{'dec us/evt':>12}")
+    for n_dets in (int(x) for x in args.detections.split(",")):
+        evts = make_events(args.batch, n_dets)
+        for name, (enc, dec) in paths.items():
+            data = enc(evts)
+            back = dec(data)
+            assert [e.model_dump() for e in back] == [e.model_dump() for e in evts], name
+            enc_s = timeit(lambda: enc(evts), args.repeat)
+            dec_s = timeit(lambda: dec(data), args.repeat)
+            n = len(evts)
+            print(f"{n_dets:>4}  {name:<14}{len(data) / n:>10.0f}{enc_s / n * 1e6:>12.1f}{dec_s / n * 1e6:>12.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Export the acne classifier to ONNX (+ int8) and check it against the PyTorch path.
+Run from repo root: python3 scripts/export_acne_onnx.py [--images DIR] [--no-int8]
+
+Needs torch, transformers, Pillow, onnx and onnxruntime on the machine that exports
+(a laptop is fine); the Pi only needs onnxruntime to run the files it writes:
+  bruno/models/acne.onnx             fp32 graph
+  bruno/models/acne_int8.onnx        dynamically quantized (int8 weights)
+  bruno/models/acne_preprocess.json  image processor settings for the numpy preprocessing
+
+Parity: every image (files in --images, else synthetic skin-toned crops) goes through
+  torch   HF processor (PIL) + PyTorch model  (reference)
+  fp32 / int8   numpy preprocessing + onnxruntime
+and the script reports top-1 agreement, max |prob diff|, pixel diff of the
+preprocessing, per-image latency and file sizes.
+bruno picks the ONNX path up automatically (see bruno.brain.vision_specialist).
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Ensure project root is on path (run from repo root or from scripts/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPT_DIR)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bruno.brain.vision_specialist import MODEL_NAME
+from bruno.perception.acne_onnx import ONNX_FP32, ONNX_INT8, PREPROCESS_JSON, AcneOnnx, preprocess, load_preprocess_config, softmax
+
+PREPROCESS_KEYS = (
+    "do_resize", "size", "resample", "do_center_crop", "crop_size", "crop_pct",
+    "do_rescale", "rescale_factor", "do_normalize", "image_mean", "image_std",
+)
+
+
+def export(out_path, preprocess_path, opset):
+    import torch
+    from transformers import AutoImageProcessor, AutoModelForImageClassification
+
+    processor = AutoImageProcessor.from_pretrained(MODEL_NAME)
+    model = AutoModelForImageClassification.from_pretrained(MODEL_NAME)
+    model.eval()
+
+    cfg = {k: v for k, v in processor.to_dict().items() if k in PREPROCESS_KEYS}
+    os.makedirs(os.path.dirname(preprocess_path), exist_ok=True)
+    with open(preprocess_path, "w", encoding="utf-8") as f:
+        json.dump(cfg, f, indent=2)
+
+    x = torch.from_numpy(preprocess(np.zeros((256, 256, 3), np.uint8), load_preprocess_config(preprocess_path)))
+
+    class Logits(torch.nn.Module):
+        def __init__(self, m):
+            super().__init__()
+            self.m = m
+
+        def forward(self, pixel_values):
+            return self.m(pixel_values=pixel_values).logits
+
+    torch.onnx.export(
+        Logits(model),
+        (x,),
+        out_path,
+        input_names=["pixel_values"],
+        output_names=["logits"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=opset,
+    )
+    print(f"Exported {out_path} ({os.path.getsize(out_path) / 1e6:.1f} MB)")
+    return processor, model
+
+
+def quantize(src, dst):
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+    print(f"Quantized {dst} ({os.path.getsize(dst) / 1e6:.1f} MB)")
+
+
+def load_images(folder, n, seed):
+    if folder:
+        paths = sorted(p for ext in ("jpg", "jpeg", "png") for p in glob.glob(os.path.join(folder, f"*.{ext}")))
+        imgs = [cv2.imread(p) for p in paths]
+        return [im for im in imgs if im is not None]
+
+    # synthetic skin-toned crops with blotches, so the check runs without a dataset
+    rng = np.random.default_rng(seed)
+    imgs = []
+    for _ in range(n):
+        h, w = rng.integers(200, 480, 2)
+        base = np.array([110, 135, 175]) * rng.uniform(0.6, 1.2)
+        im = np.clip(base + rng.normal(0, 8, (h, w, 3)), 0, 255).astype(np.uint8)
+        for _ in range(rng.integers(0, 40)):
+            c = (int(rng.integers(0, w)), int(rng.integers(0, h)))
+            cv2.circle(im, c, int(rng.integers(2, 9)), (80, 90, 200), -1)
+        imgs.append(cv2.GaussianBlur(im, (3, 3), 0))
+    return imgs
+
+
+def parity(processor, model, images, onnx_paths):
+    import torch
+    from PIL import Image
+
+    cfg = load_preprocess_config()
+    ref_probs, ref_ms, pix_diff = [], [], []
+    for im in images:
+        t = time.perf_counter()
+        inputs = processor(images=Image.fromarray(cv2.cvtColor(im, cv2.COLOR_BGR2RGB)), return_tensors="pt")
+        with torch.no_grad():
+            logits = model(**inputs).logits.numpy()
+        ref_ms.append((time.perf_counter() - t) * 1e3)
+        ref_probs.append(softmax(logits)[0])
+        pix_diff.append(float(np.abs(inputs["pixel_values"].numpy() - preprocess(im, cfg)).mean()))
+    ref_probs = np.stack(ref_probs)
+    ref_top = ref_probs.argmax(axis=1)
+
+    print(f"\nnumpy vs HF preprocessing: mean |pixel diff| {np.mean(pix_diff):.4f} (normalized units)")
+    print(f"{'backend':<8} {'top1 agree':>10} {'max|dp|':>8} {'ms/img':>7} {'MB':>6}")
+    print(f"{'torch':<8} {'ref':>10} {'-':>8} {np.median(ref_ms):7.1f} {'-':>6}")
+
+    for name, path in onnx_paths:
+        clf = AcneOnnx(path)
+        clf.predict(images[0])  # warm
+        probs, ms = [], []
+        for im in images:
+            t = time.perf_counter()
+            _, _, p = clf.predict(im)
+            ms.append((time.perf_counter() - t) * 1e3)
+            probs.append(p)
+        probs = np.stack(probs)
+        agree = float((probs.argmax(axis=1) == ref_top).mean())
+        dp = float(np.abs(probs - ref_probs).max())
+        print(f"{name:<8} {agree:10.1%} {dp:8.3f} {np.median(ms):7.1f} {os.path.getsize(path) / 1e6:6.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--out", default=ONNX_FP32)
+    ap.add_argument("--int8-out", default=ONNX_INT8)
+    ap.add_argument("--no-int8", action="store_true")
+    ap.add_argument("--opset", type=int, default=17)
+    ap.add_argument("--images", default=None, help="folder of face/skin photos for the parity check")
+    ap.add_argument("--n", type=int, default=32, help="synthetic images when --images is not given")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    processor, model = export(args.out, PREPROCESS_JSON, args.opset)
+    onnx_paths = [("fp32", args.out)]
+    if not args.no_int8:
+        quantize(args.out, args.int8_out)
+        onnx_paths.append(("int8", args.int8_out))
+
+    images = load_images(args.images, args.n, args.seed)
+    if not images:
+        print("No images for the parity check.")
+        return
+    parity(processor, model, images, onnx_paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for the Ollama and OpenAI-compatible APIs, for testing the brain
+without models or network.
+Run from repo root: python3 scripts/fake_llm_servers.py [--local-delay 0.05] [--online-delay 0.02] [--selftest]
+
+Serves
+  http://127.0.0.1:<ollama-port>/api/generate          Ollama NDJSON streaming
+  http://127.0.0.1:<openai-port>/v1/chat/completions   OpenAI SSE streaming
+Each reply is a canned speaker JSON streamed token by token with a per-token delay;
+--*-fail makes that server answer HTTP 500, --*-garbage makes it stream invalid JSON.
+
+Then, in another shell:
+  OLLAMA_HOST=http://127.0.0.1:11500 OPENAI_BASE_URL=http://127.0.0.1:11501/v1 \\
+  BRUNO_BRAIN_BACKEND=hedge python3 -m bruno.run
+--selftest instead races bruno.brain.backends.HedgedBrain against both servers in a
+few configurations and prints winners, latencies and backend stats.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ensure project root is on path (run from repo root or from scripts/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPT_DIR)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def reply_tokens(who):
+    return ['{"say": "Hello', f' from the {who}', ' model.", "ask_user": "",', ' "confidence": 0.8}']
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    cfg = {}  # overridden per server class
+
+    def log_message(self, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # the brain aborted a losing / cancelled stream
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _start_stream(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(n)
+        cfg = self.cfg
+        cfg["requests"] = cfg.get("requests", 0) + 1
+        if cfg.get("fail"):
+            body = b'{"error": "stand-in failure"}'
+            self.send_response(500)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        tokens = ["not json at all"] if cfg.get("garbage") else reply_tokens(cfg["name"])
+        try:
+            self.stream(tokens, cfg.get("delay", 0.05))
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            cfg["aborted"] = cfg.get("aborted", 0) + 1
+
+
+class OllamaHandler(_Handler):
+    def stream(self, tokens, delay):
+        self._start_stream("application/x-ndjson")
+        for t in tokens:
+            time.sleep(delay)
+            self._chunk(json.dumps({"response": t, "done": False}).encode() + b"\n")
+        self._chunk(json.dumps({"response": "", "done": True, "eval_count": len(tokens)}).encode() + b"\n")
+
+
+class OpenAIHandler(_Handler):
+    def stream(self, tokens, delay):
+        self._start_stream("text/event-stream")
+        for t in tokens:
+            time.sleep(delay)
+            event = {"choices": [{"index": 0, "delta": {"content": t}}]}
+            self._chunk(b"data: " + json.dumps(event).encode() + b"\n\n")
+        self._chunk(b"data: [DONE]\n\n")
+
+
+def start_server(handler_cls, name, port=0, **cfg):
+    """Start one stand-in on a daemon thread; returns (server, cfg dict you can mutate live)."""
+    state = dict(cfg, name=name)
+    cls = type(handler_cls.__name__, (handler_cls,), {"cfg": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), cls)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def selftest(local_url, online_url, local_cfg, online_cfg):
+    os.environ["OLLAMA_HOST"] = local_url
+    os.environ["OPENAI_BASE_URL"] = online_url + "/v1"
+    from bruno.brain.backends import HedgedBrain, ollama_backend, online_backend
+
+    def run(title, mode, local=None, online=None, n=4, deadline_s=3.0):
+        local_cfg.update({"fail": False, "garbage": False, **(local or {})})
+        online_cfg.update({"fail": False, "garbage": False, **(online or {})})
+        brain = HedgedBrain([ollama_backend("llama3.1:8b"), online_backend("stand-in")], mode=mode, deadline_s=deadline_s)
+        print(f"\n{title} ({mode})")
+        for _ in range(n):
+            t0 = time.monotonic()
+            try:
+                out, who = brain.generate_json("hi", validate=lambda o: bool(o.get("say")), system="Return JSON.")
+                print(f"  {who:<7} {(time.monotonic() - t0) * 1e3:6.0f} ms  {out['say']}")
+            except Exception as e:
+                print(f"  failed  {(time.monotonic() - t0) * 1e3:6.0f} ms  {type(e).__name__}: {e}")
+        time.sleep(0.2)
+        print("  stats:", json.dumps(brain.stats()["backends"]))
+
+    run("online faster", "hedge", local={"delay": 0.3}, online={"delay": 0.02})
+    run("local faster", "hedge", local={"delay": 0.02}, online={"delay": 0.3})
+    run("online down", "hedge", local={"delay": 0.05}, online={"fail": True})
+    run("local returns garbage", "hedge", local={"garbage": True, "delay": 0.01}, online={"delay": 0.05})
+    run("adaptive learns the faster backend", "adaptive", local={"delay": 0.4}, online={"delay": 0.02}, n=6)
+    run("both too slow", "hedge", local={"delay": 2.0}, online={"delay": 2.0}, n=1, deadline_s=1.0)
+    print(f"\naborted streams: local={local_cfg.get('aborted', 0)} online={online_cfg.get('aborted', 0)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--ollama-port", type=int, default=11500)
+    ap.add_argument("--openai-port", type=int, default=11501)
+    ap.add_argument("--local-delay", type=float, default=0.05)
+    ap.add_argument("--online-delay", type=float, default=0.02)
+    ap.add_argument("--local-fail", action="store_true")
+    ap.add_argument("--online-fail", action="store_true")
+    ap.add_argument("--local-garbage", action="store_true")
+    ap.add_argument("--online-garbage", action="store_true")
+    ap.add_argument("--selftest", action="store_true")
+    args = ap.parse_args()
+
+    port = 0 if args.selftest else args.ollama_port
+    local, local_cfg = start_server(OllamaHandler, "local", port, delay=args.local_delay, fail=args.local_fail, garbage=args.local_garbage)
+    port = 0 if args.selftest else args.openai_port
+    online, online_cfg = start_server(OpenAIHandler, "online", port, delay=args.online_delay, fail=args.online_fail, garbage=args.online_garbage)
+    local_url = f"http://127.0.0.1:{local.server_address[1]}"
+    online_url = f"http://127.0.0.1:{online.server_address[1]}"
+
+    if args.selftest:
+        selftest(local_url, online_url, local_cfg, online_cfg)
+        return
+
+    print(f"Ollama stand-in: {local_url}   OpenAI stand-in: {online_url}/v1   (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
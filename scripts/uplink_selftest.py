@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Exercise bruno.node_vision.uplink.Uplink against a local node_brain stand-in.
+Run from repo root: python3 scripts/uplink_selftest.py [--rate 30] [--seconds 6] [--outage 2-4] [--stream]
+
+Serves the real node_brain FastAPI app (bruno/node_brain/server.py) with uvicorn on
+127.0.0.1, streams synthetic PerceptionEvents at --rate per second through an Uplink
+with a temporary spool directory, and stops the server during --outage (seconds from
+start) so events spool to disk and are replayed once it is back. Prints uplink stats
+every second and checks at the end, on the brain side, that every event reached
+brain_reply (each carries its number in notes["seq"]). --stream sends the
+delta-encoded stream (POST /stream) instead of full events; the restarted node starts
+with empty stream decoders, like a fresh process.
+Needs fastapi and uvicorn (pip install fastapi uvicorn).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Ensure project root is on path (run from repo root or from scripts/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPT_DIR)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+class BrainStandIn:
+    """
+    node_brain app on a uvicorn server that can be stopped and restarted on the same port.
+    Records the notes["seq"] of every event the app decoded and handed to brain_reply.
+    """
+
+    def __init__(self, port: int):
+        from bruno.node_brain import server
+        self.module = server
+        self.app = server.app
+        self.port = port
+        self.server = None
+        self.received = []
+        reply = server.brain_reply
+
+        def counting_reply(evt):
+            self.received.append(evt.notes.get("seq"))
+            return reply(evt)
+
+        server.brain_reply = counting_reply
+
+    def start(self):
+        import uvicorn
+        from bruno.bus.delta import StreamDecoders
+
+        self.module._streams = StreamDecoders()  # a restarted node has lost its decoder state
+        cfg = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(cfg)
+        threading.Thread(target=self.server.run, daemon=True).start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def stop(self):
+        self.server.should_exit = True
+        time.sleep(0.3)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--rate", type=float, default=30.0, help="events per second")
+    ap.add_argument("--seconds", type=float, default=6.0)
+    ap.add_argument("--outage", default="2-4", help="start-end seconds with the brain node down ('' for none)")
+    ap.add_argument("--stream", action="store_true", help="keyframes + deltas instead of full events")
+    args = ap.parse_args()
+
+    from bruno.bus.messages import PerceptionEvent, Detection
+    from bruno.node_vision.uplink import Uplink
+
+    outage = tuple(float(x) for x in args.outage.split("-")) if args.outage else None
+    brain = BrainStandIn(args.port)
+    brain.start()
+
+    replies = []
+    spool = tempfile.mkdtemp(prefix="bruno-uplink-")
+    uplink = Uplink(f"http://127.0.0.1:{args.port}", spool_dir=spool, backoff_s=(0.2, 1.0),
+                    on_reply=replies.append, stream=args.stream)
+
+    t0 = time.time()
+    sent = 0
+    down = False
+    next_report = 1.0
+    while time.time() - t0 < args.seconds:
+        t = time.time() - t0
+        if outage and not down and outage[0] <= t < outage[1]:
+            print(f"[{t:4.1f}s] brain node down")
+            brain.stop()
+            down = True
+        elif down and t >= outage[1]:
+            print(f"[{t:4.1f}s] brain node back")
+            brain.start()
+            down = False
+
+        evt = PerceptionEvent(
+            ts=time.strftime("%Y-%m-%dT%H-%M-%S"),
+            device_id="selftest",
+            scene_summary={"counts": {"person": 1, "cup": 1}},
+            detections=[Detection(label="person", track_id=1, box=[10, 10, 200, 400])],
+            notes={"seq": sent},
+        )
+        t_send = time.perf_counter()
+        uplink.send(evt)
+        send_us = (time.perf_counter() - t_send) * 1e6
+        sent += 1
+
+        if t >= next_report:
+            print(f"[{t:4.1f}s] send {send_us:5.0f} us  {uplink.stats()}")
+            next_report += 1.0
+        time.sleep(1.0 / args.rate)
+
+    if down:
+        brain.start()
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if len(set(brain.received)) >= sent:
+            break
+        time.sleep(0.1)
+    uplink.close()
+    st = uplink.stats()
+    decoded = set(brain.received)
+    missing = sent - len(decoded & set(range(sent)))
+    print(f"\nevents: produced={sent} posted={st['sent']} (replayed from disk {st['replayed']}) "
+          f"dropped={st['dropped']} replies={len(replies)}")
+    print(f"brain node: decoded={len(decoded)} missing={missing} duplicates={len(brain.received) - len(decoded)}")
+    print("final stats:", st)
+    print("OK" if not missing and not os.listdir(spool) else "INCOMPLETE")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Ensure project root is on path (run pytest from repo root or from tests/)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,92 @@
+import pytest
+
+from bruno.bus.delta import DeltaDecoder, DeltaEncoder
+from bruno.bus.messages import Detection, PerceptionEvent
+
+
+def _evt(i, x=0):
+    return PerceptionEvent(
+        ts=str(i),
+        device_id="pi-01",
+        scene_summary={"n": 1},
+        detections=[Detection(label="cup", track_id=1, box=[x, 0, x + 10, 10])],
+        notes={"seq": i},
+    )
+
+
+def test_round_trip():
+    enc, dec = DeltaEncoder(), DeltaDecoder()
+    evts = [_evt(i, x=i) for i in range(5)]
+    msgs = [enc.encode(e) for e in evts]
+    assert [m["t"] for m in msgs] == ["k", "d", "d", "d", "d"]
+    assert [dec.apply(m) for m in msgs] == evts
+
+
+def test_resent_messages_are_skipped_as_duplicates():
+    enc, dec = DeltaEncoder(), DeltaDecoder()
+    msgs = [enc.encode(_evt(i)) for i in range(3)]
+    for m in msgs:
+        dec.apply(m)
+    assert [dec.apply(m) for m in msgs] == [None, None, None]
+    assert dec.stats["duplicates"] == 3 and dec.stats["gaps"] == 0
+    assert not dec.needs_keyframe
+    assert dec.apply(enc.encode(_evt(3))).notes == {"seq": 3}
+
+
+def test_gap_waits_for_keyframe():
+    enc, dec = DeltaEncoder(), DeltaDecoder()
+    dec.apply(enc.encode(_evt(0)))
+    enc.encode(_evt(1))  # lost
+    assert dec.apply(enc.encode(_evt(2))) is None
+    assert dec.needs_keyframe and dec.stats["gaps"] == 1
+    enc.force_keyframe()
+    assert dec.apply(enc.encode(_evt(3))).notes == {"seq": 3}
+    assert not dec.needs_keyframe
+
+
+def test_restarted_encoder_is_not_a_duplicate():
+    dec = DeltaDecoder()
+    enc = DeltaEncoder()
+    for i in range(5):
+        dec.apply(enc.encode(_evt(i)))
+    restarted = DeltaEncoder()
+    restarted.epoch = enc.epoch + 1
+    assert dec.apply(restarted.encode(_evt(9))).notes == {"seq": 9}
+
+
+def test_delta_from_another_epoch_is_a_gap():
+    dec = DeltaDecoder()
+    enc = DeltaEncoder()
+    for i in range(5):
+        dec.apply(enc.encode(_evt(i)))
+    restarted = DeltaEncoder()
+    restarted.epoch = enc.epoch + 1
+    restarted.encode(_evt(9))  # keyframe lost
+    assert dec.apply(restarted.encode(_evt(10))) is None  # seq 2: not a "duplicate"
+    assert dec.needs_keyframe and dec.stats["duplicates"] == 0
+
+
+def test_bad_fields_are_rejected():
+    enc, dec = DeltaEncoder(), DeltaDecoder()
+    dec.apply(enc.encode(_evt(0)))
+    msg = enc.encode(_evt(1))
+    msg["f"] = {"face_detected": "yes"}
+    with pytest.raises(ValueError):
+        dec.apply(msg)
+
+
+def test_update_of_unknown_track_is_a_gap():
+    enc, dec = DeltaEncoder(), DeltaDecoder()
+    dec.apply(enc.encode(_evt(0)))
+    msg = enc.encode(_evt(1, x=5))
+    msg["upd"] = [[42, {"box": [0, 0, 1, 1]}]]
+    assert dec.apply(msg) is None and dec.needs_keyframe
+
+
+def test_bad_detection_update_is_rejected():
+    enc, dec = DeltaEncoder(), DeltaDecoder()
+    dec.apply(enc.encode(_evt(0)))
+    msg = enc.encode(_evt(1, x=5))
+    msg["upd"] = [[1, {"box": "0,0,1,1"}]]
+    with pytest.raises(ValueError):
+        dec.apply(msg)
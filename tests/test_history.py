@@ -0,0 +1,97 @@
+import pytest
+
+from bruno.brainloop.history import PerceptionHistory, load_spilled
+from bruno.brainloop.state import PerceptionState
+
+
+def _state(ts, objects=(), people=(), fall_score=0.0):
+    return PerceptionState(
+        ts=ts,
+        objects=list(objects),
+        people=list(people),
+        authorized_user=None,
+        pose={"detected": bool(people), "fall_score": fall_score},
+    )
+
+
+ANNA = {"track_id": 1, "name": "anna", "recognized": True, "box": [0, 0, 10, 10]}
+STRANGER = {"track_id": 2, "name": None, "recognized": False, "box": [20, 0, 30, 10]}
+
+
+def test_people_seen_counts_how_long_each_row_held():
+    h = PerceptionHistory()
+    h.append(_state(0.0, people=[ANNA]))
+    h.append(_state(30.0))
+    h.append(_state(50.0, people=[ANNA]))
+    seen = h.people_seen(window_s=600, now=60.0)
+    assert seen == [{"name": "anna", "seen_s": 40.0, "last_seen_s_ago": 0.0}]
+
+
+def test_window_clips_the_row_in_force_when_it_opened():
+    h = PerceptionHistory()
+    h.append(_state(0.0, objects=["cup"]))
+    h.append(_state(100.0))
+    frames, dur, _ = h.window(50.0, now=120.0)
+    assert list(dur) == pytest.approx([30.0, 20.0])
+    assert h.objects_seen(window_s=50, now=120.0) == [{"label": "cup", "seen_s": 30.0, "present_for_s": 0.0}]
+
+
+def test_present_for_and_unknown_visits():
+    h = PerceptionHistory()
+    h.append(_state(0.0, objects=["cup"], people=[STRANGER]))
+    h.append(_state(10.0, objects=["cup"]))
+    h.append(_state(20.0, objects=["cup"], people=[STRANGER]))
+    assert h.present_for(label="cup", now=25.0) == 25.0
+    assert h.present_for(label="chair", now=25.0) == 0.0
+    assert h.unknown_visits(window_s=600, now=25.0) == 2
+
+
+def test_risk_stats_time_weighted_mean_and_falls():
+    h = PerceptionHistory()
+    h.append(_state(0.0), risk=0.1)
+    h.append(_state(10.0, fall_score=0.9), risk=0.9)
+    h.append(_state(20.0), risk=0.1)
+    stats = h.risk_stats(window_s=600, now=40.0)
+    assert stats == {"max": 0.9, "mean": 0.3, "falls": 1}
+
+
+def test_ring_keeps_only_the_latest_frames():
+    h = PerceptionHistory(capacity=4)
+    for i in range(10):
+        h.append(_state(float(i), objects=["cup"]))
+    assert len(h) == 4
+    frames, _, _ = h.window(100.0, now=10.0)
+    assert list(frames["ts"]) == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_spill_writes_chunks_before_overwrite(tmp_path):
+    h = PerceptionHistory(capacity=4, spill_dir=str(tmp_path), spill_chunk=2)
+    for i in range(4):
+        h.append(_state(float(i), people=[ANNA]))
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 2
+    chunk = load_spilled(str(files[0]))
+    assert list(chunk["frames"]["ts"]) == [0.0, 1.0]
+    assert "anna" in chunk["names"]
+
+
+def test_empty_history():
+    h = PerceptionHistory()
+    assert h.summary(now=0.0) == {
+        "window_s": 600.0,
+        "people": [],
+        "unknown_visits": 0,
+        "objects": [],
+        "risk": {"max": None, "mean": None, "falls": 0},
+    }
+
+
+def test_brief_is_trimmed_and_leaves_out_empty_parts():
+    h = PerceptionHistory()
+    h.append(_state(0.0, objects=["cup", "chair"], people=[ANNA]))
+    h.append(_state(10.0))
+    assert h.brief(window_s=600, now=20.0, max_items=1) == {
+        "people": [{"name": "anna", "last_seen_s_ago": 10.0}],
+        "objects": ["cup"],
+    }
+    assert PerceptionHistory().brief(now=0.0) == {}
@@ -0,0 +1,120 @@
+import pytest
+
+from bruno.brainloop.rules import Count, Duration, Fraction, Mean, RiskEngine, FALL_SCORE
+from bruno.brainloop.state import PerceptionState
+
+
+def _state(ts, fall=False, people=()):
+    return PerceptionState(
+        ts=ts,
+        objects=[],
+        people=list(people),
+        authorized_user=None,
+        pose={"detected": True, "keypoints": True, "fall_score": FALL_SCORE if fall else 0.0},
+    )
+
+
+def test_fraction_is_time_weighted():
+    f = Fraction("x", window_s=20)
+    f.update(0.0, 1.0)
+    f.update(10.0, 0.0)
+    f.update(20.0, 0.0)
+    assert f.value == pytest.approx(0.5, abs=0.02)
+
+
+def test_fraction_spreads_a_long_gap_across_buckets():
+    # truthy over [0, 8), falsy after; at t=15 only [5, 8) of the truthy span is in the window
+    f = Fraction("x", window_s=10)
+    f.update(0.0, 1.0)
+    f.update(8.0, 0.0)
+    f.update(15.0, 0.0)
+    assert f.value == pytest.approx(0.3, abs=0.05)
+
+
+def test_fraction_forgets_after_the_window():
+    f = Fraction("x", window_s=10)
+    f.update(0.0, 1.0)
+    f.update(5.0, 0.0)
+    f.update(30.0, 0.0)
+    assert f.value == 0.0
+
+
+def test_mean_weights_values_by_how_long_they_held():
+    m = Mean("x", window_s=20)
+    m.update(0.0, 10.0)
+    m.update(1.0, 0.0)
+    m.update(10.0, 0.0)
+    assert m.value == pytest.approx(1.0, abs=0.01)  # a per-update mean would say 3.3
+
+
+def test_mean_starts_at_the_first_value():
+    m = Mean("x", window_s=20)
+    m.update(0.0, 4.0)
+    assert m.value == 4.0
+    assert m.next_due(0.0, 5.0) is None
+
+
+def test_count_expires_and_reports_when():
+    c = Count("x", window_s=10)
+    for t, x in ((0.0, 1), (1.0, 0), (2.0, 1), (3.0, 0)):
+        c.update(t, x)
+    assert c.value == 2
+    due = c.next_due(3.0, threshold=2)
+    assert due == pytest.approx(10.0, abs=c._b.bucket_s)
+    c.update(due, 0)
+    assert c.value == 1
+
+
+def test_duration_next_due_is_the_threshold_crossing():
+    d = Duration("x")
+    d.update(0.0, 1)
+    d.update(2.0, 1)
+    assert d.value == 2.0
+    assert d.next_due(2.0, threshold=5) == 5.0
+    d.update(3.0, 0)
+    assert d.value == 0.0 and d.next_due(3.0, threshold=5) is None
+
+
+def test_engine_fires_fall_persisting_at_next_due():
+    engine = RiskEngine()
+    r = engine.update(_state(0.0, fall=True), now=0.0)
+    assert not any(f["rule"] == "fall_persisting" for f in r.fired)
+    due = engine.next_due(0.0)
+    assert due == 5.0
+    r = engine.update(_state(due, fall=True), now=due)
+    assert any(f["rule"] == "fall_persisting" for f in r.fired)
+
+
+def test_engine_repeated_falls_window():
+    engine = RiskEngine()
+    t = 0.0
+    for _ in range(3):
+        engine.update(_state(t, fall=True), now=t)
+        engine.update(_state(t + 1, fall=False), now=t + 1)
+        t += 10
+    r = engine.update(_state(t, fall=False), now=t)
+    assert any(f["rule"] == "repeated_falls" for f in r.fired)
+
+    # the first fall leaves the 300 s window at next_due
+    due = engine.next_due(t)
+    assert due is not None and 300.0 <= due <= 301.0
+    r = engine.update(_state(due, fall=False), now=due)
+    assert not any(f["rule"] == "repeated_falls" for f in r.fired)
+
+
+def test_engine_shares_features_between_rules():
+    rules = [
+        {"name": "a", "feature": ("duration", "fall_posture"), "value": 1, "score": 0.1},
+        {"name": "b", "feature": ("duration", "fall_posture"), "value": 2, "score": 0.1},
+        {"name": "c", "feature": ("mean", "person_count", 60), "value": 1, "score": 0.1},
+    ]
+    engine = RiskEngine(rules, base_score=0.0)
+    assert len(engine.features) == 2
+    assert engine.signals == ["fall_posture", "person_count"]
+
+
+def test_engine_rejects_unknown_feature_or_signal():
+    with pytest.raises(ValueError):
+        RiskEngine([{"name": "x", "feature": ("median", "fall_posture"), "value": 1, "score": 0.1}])
+    with pytest.raises(ValueError):
+        RiskEngine([{"name": "x", "feature": ("now", "nope"), "value": 1, "score": 0.1}])